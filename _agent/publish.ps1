@@ -4,6 +4,8 @@ param(
     [switch]$SkipBlender,
     [switch]$SkipUnity,
     [switch]$SkipModPublish,
+    [switch]$NoCache,
+    [string]$CacheDir = "",
     [string]$BlendPath = "work/Death_Male_A_3s.blend",
     [string]$OutputFbx = "exports/Death_Male_A_3s.fbx",
     [string]$OutputBlend = "",
@@ -93,49 +95,100 @@ if ($OutputBlend) {
     if (-not (Test-Path $blendDir)) { New-Item -ItemType Directory -Path $blendDir -Force | Out-Null }
 }
 
-$frameCount = [Math]::Ceiling($DurationSec * $Fps)
-$endFrame = $StartFrame + [int]$frameCount - 1
+$poseCache = Resolve-RepoPath -RelativePath (".cache\poses\{0}.npz" -f $ClipName)
+
+# Same range as bs_death_pipeline (start + round(duration * fps), both inclusive), so the validator
+# reuses the pose cache the pipeline wrote instead of sampling a one-frame-shorter range again.
+# [Math]::Round rounds half to even, like Python's round().
+$endFrame = $StartFrame + [int][Math]::Round($DurationSec * $Fps)
 
 if (-not $SkipBlender) {
     Write-Host "2. Blender export + validation..." -ForegroundColor Cyan
 
     $pipelineScript = Join-Path $repoRoot "tools\bs_death_pipeline.ps1"
     $validateScript = Join-Path $repoRoot "tools\bs_death_validate.ps1"
+    $cacheScript = Join-Path $repoRoot "tools\bs_build_cache.py"
 
-    $pipelineArgs = @{
-        BlendPath = $resolvedBlend
-        UseCurrentScene = $true
-        OutputFbx = $OutputFbx
-        ClipName = $ClipName
-        RootBone = $RootBone
-        Fps = $Fps
-        DurationSec = $DurationSec
-        MinDurationSec = $MinDurationSec
-        MaxDurationSec = $MaxDurationSec
-        StartFrame = $StartFrame
-        DriftThreshold = $DriftThreshold
+    # Content-addressed cache: same input blend bytes, pipeline scripts and arguments -> reuse the last result.
+    $python = Get-Command python -ErrorAction SilentlyContinue
+    $cacheArgs = @()
+    $cacheHit = $false
+    if ($NoCache) {
+        Write-Host "2a. Build cache disabled (-NoCache)." -ForegroundColor DarkYellow
     }
-    if ($OutputBlend) {
-        $pipelineArgs.OutputBlend = $OutputBlend
+    elseif (-not $python) {
+        Write-Warning "python not found on PATH; build cache disabled."
     }
+    else {
+        $cacheArgs = @("--input", $resolvedBlend, "--output", "output_fbx=$resolvedOutputFbx")
+        if ($OutputBlend) { $cacheArgs += @("--output", "output_blend=$resolvedOutputBlend") }
+        if ($CacheDir) { $cacheArgs += @("--cache-dir", (Resolve-RepoPath -RelativePath $CacheDir)) }
+        $cacheKeyArgs = @(
+            "--", "publish", $ClipName, $RootBone, "$Fps", "$DurationSec", "$StartFrame", "$endFrame",
+            "$DriftThreshold", "$MinDurationSec", "$MaxDurationSec", "save_blend=$([bool]$OutputBlend)"
+        )
 
-    & $pipelineScript @pipelineArgs
-    if ($LASTEXITCODE -ne 0) {
-        throw "Blender pipeline failed (exit code $LASTEXITCODE)."
-    }
-
-    & $validateScript `
-        -BlendPath $resolvedOutputBlend `
-        -Action $ClipName `
-        -RootBone $RootBone `
-        -Fps $Fps `
-        -StartFrame $StartFrame `
-        -EndFrame $endFrame `
-        -MinDurationSec $MinDurationSec `
-        -MaxDurationSec $MaxDurationSec `
-        -DriftThreshold $DriftThreshold
-    if ($LASTEXITCODE -ne 0) {
-        throw "Blender validation failed (exit code $LASTEXITCODE)."
+        $lookupOutput = & $python.Source $cacheScript lookup @cacheArgs @cacheKeyArgs
+        $lookupExit = $LASTEXITCODE
+        $lookupOutput | ForEach-Object { Write-Host $_ }
+        $keyLine = $lookupOutput | Where-Object { $_ -like "KEY=*" } | Select-Object -First 1
+        if ($keyLine) { $cacheArgs += @("--key", $keyLine.Substring(4)) }
+        if ($lookupExit -eq 0) {
+            $cacheHit = $true
+            $cachedExitLine = $lookupOutput | Where-Object { $_ -like "CACHED_EXIT_CODE=*" } | Select-Object -First 1
+            $cachedExit = [int]$cachedExitLine.Substring(17)
+            if ($cachedExit -ne 0) {
+                throw "Blender pipeline failed (cached exit code $cachedExit)."
+            }
+            Write-Host "2a. Inputs unchanged; reused cached FBX and validation result." -ForegroundColor Green
+        }
+    }
+
+    if (-not $cacheHit) {
+        $pipelineArgs = @{
+            BlendPath = $resolvedBlend
+            UseCurrentScene = $true
+            OutputFbx = $OutputFbx
+            ClipName = $ClipName
+            RootBone = $RootBone
+            Fps = $Fps
+            DurationSec = $DurationSec
+            MinDurationSec = $MinDurationSec
+            MaxDurationSec = $MaxDurationSec
+            StartFrame = $StartFrame
+            DriftThreshold = $DriftThreshold
+            PoseCache = $poseCache
+        }
+        if ($OutputBlend) {
+            $pipelineArgs.OutputBlend = $OutputBlend
+        }
+
+        & $pipelineScript @pipelineArgs
+        if ($LASTEXITCODE -ne 0) {
+            throw "Blender pipeline failed (exit code $LASTEXITCODE)."
+        }
+
+        & $validateScript `
+            -BlendPath $resolvedOutputBlend `
+            -Action $ClipName `
+            -RootBone $RootBone `
+            -Fps $Fps `
+            -StartFrame $StartFrame `
+            -EndFrame $endFrame `
+            -MinDurationSec $MinDurationSec `
+            -MaxDurationSec $MaxDurationSec `
+            -DriftThreshold $DriftThreshold `
+            -PoseCache $poseCache
+        if ($LASTEXITCODE -ne 0) {
+            throw "Blender validation failed (exit code $LASTEXITCODE)."
+        }
+
+        if ($cacheArgs.Count -gt 0) {
+            & $python.Source $cacheScript store @cacheArgs --exit-code 0
+            if ($LASTEXITCODE -ne 0) {
+                Write-Warning "Failed to store Blender outputs in build cache (exit code $LASTEXITCODE)."
+            }
+        }
     }
 }
 else {
@@ -0,0 +1,95 @@
+"""Bone-LOD export profiles. Pure Python, shared by bs_death_pipeline.py and bs_death_batch.py.
+
+A profile lists what keeps its animation curves; every other bone is exported unkeyed, frozen at the
+clip's start pose. Entries are tried in this order:
+
+- a bone class from ``classify_bones``: ``body``, ``twist``, ``finger``, ``face``, or ``roles`` for the
+  bones resolved by the rig profile (root, hips, spine chain, limbs, feet, neck, head);
+- a role name such as ``l_foot`` or ``head``;
+- a case-insensitive bone name pattern, e.g. ``*Hand`` or ``LeftToeBase``.
+
+Profile outputs sit beside the clip's FBX with the profile appended: ``Death_A.fbx`` -> ``Death_A_quest.fbx``.
+"""
+
+import fnmatch
+import json
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from bs_platforms import VARIANT_NAME
+from bs_rig_profile import DETAIL_TOKENS, classify_bones
+
+BONE_CLASSES: Tuple[str, ...] = ("body",) + tuple(DETAIL_TOKENS)
+
+BONE_LOD_PROFILES: Dict[str, Tuple[str, ...]] = {
+    # Drops finger, face and twist bones.
+    "quest": ("body",),
+    # Only the bones the validation rules and Humanoid mapping rely on.
+    "quest_min": ("roles",),
+}
+
+
+def parse_profile_names(spec: str) -> List[str]:
+    names: List[str] = []
+    for name in (part.strip() for part in (spec or "").split(",")):
+        if not name:
+            continue
+        if not VARIANT_NAME.match(name):
+            raise RuntimeError(f"Bone LOD profile '{name}' may only use letters, digits, '_' and '-'.")
+        if name in names:
+            raise RuntimeError(f"Bone LOD profile '{name}' is listed twice.")
+        names.append(name)
+    return names
+
+
+def load_profiles(profiles_json: str = "") -> Dict[str, Tuple[str, ...]]:
+    """Built-in profiles, extended or overridden by ``{"name": ["entry", ...]}`` from ``profiles_json``."""
+    profiles = dict(BONE_LOD_PROFILES)
+    if profiles_json:
+        with open(profiles_json, "r", encoding="utf-8") as handle:
+            custom = json.load(handle)
+        if not isinstance(custom, dict):
+            raise RuntimeError(f"Bone LOD profile file must map names to entry lists: {profiles_json}")
+        for name, entries in custom.items():
+            if not isinstance(entries, list) or not all(isinstance(e, str) for e in entries):
+                raise RuntimeError(f"Bone LOD profile '{name}' must be a list of strings.")
+            profiles[name] = tuple(entries)
+    return profiles
+
+
+def kept_bones(
+    bone_names: Sequence[str], roles: Dict[str, Optional[str]], entries: Sequence[str]
+) -> Set[str]:
+    classes = classify_bones(bone_names, roles)
+    role_bones = {name for name in roles.values() if name}
+    kept: Set[str] = set()
+    for entry in entries:
+        if entry == "roles":
+            kept |= role_bones
+        elif entry in BONE_CLASSES:
+            kept |= {name for name, cls in classes.items() if cls == entry}
+        elif entry in roles:
+            if roles[entry]:
+                kept.add(str(roles[entry]))
+        else:
+            pattern = entry.lower()
+            kept |= {name for name in bone_names if fnmatch.fnmatchcase(name.lower(), pattern)}
+    return kept
+
+
+def resolve_profiles(
+    names: Sequence[str],
+    bone_names: Sequence[str],
+    roles: Dict[str, Optional[str]],
+    profiles_json: str = "",
+) -> List[Tuple[str, Set[str]]]:
+    """(profile name, kept bone names) for every requested profile."""
+    profiles = load_profiles(profiles_json)
+    resolved: List[Tuple[str, Set[str]]] = []
+    for name in names:
+        if name not in profiles:
+            raise RuntimeError(f"Unknown bone LOD profile '{name}'. Known: {', '.join(sorted(profiles))}")
+        kept = kept_bones(bone_names, roles, profiles[name])
+        if not kept:
+            raise RuntimeError(f"Bone LOD profile '{name}' keeps no bones on this rig.")
+        resolved.append((name, kept))
+    return resolved
@@ -0,0 +1,283 @@
+"""Content-addressed cache for Blender export/validation results.
+
+Pure Python (no bpy). A key hashes the input file bytes, the pipeline script and wrapper sources,
+the Blender executable and the argument list. Entries hold the produced files plus the exit code and VALIDATION lines, and the
+cache is trimmed least-recently-used first once it grows past a size budget.
+
+    python tools/bs_build_cache.py lookup --input work/A.blend --output fbx=exports/A.fbx -- <key args>
+    python tools/bs_build_cache.py store --key <key> --output fbx=exports/A.fbx --exit-code 0 --log run.log
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+CACHE_FORMAT = 2
+DEFAULT_BLENDER_EXE = r"C:\Program Files\Blender Foundation\Blender 5.0\blender.exe"
+DEFAULT_MAX_CACHE_MB = 2048
+RESULT_FILE = "result.json"
+MISS_EXIT_CODE = 3
+
+
+def log(message: str) -> None:
+    print(f"[bs_build_cache] {message}", flush=True)
+
+
+def default_cache_root() -> str:
+    """Root for all local pipeline caches; override with BS_CACHE_DIR."""
+    return os.environ.get("BS_CACHE_DIR") or os.path.join(REPO_ROOT, ".cache")
+
+
+def default_build_cache_dir() -> str:
+    return os.path.join(default_cache_root(), "build")
+
+
+def pipeline_script_paths() -> List[str]:
+    """Every tools/*.py and *.ps1 file: a change to any pipeline module or wrapper invalidates cached results."""
+    return sorted(
+        os.path.join(SCRIPT_DIR, name) for name in os.listdir(SCRIPT_DIR) if name.endswith((".py", ".ps1"))
+    )
+
+
+def find_blender(explicit: str = "") -> str:
+    """The Blender executable the wrappers would run (explicit, BLENDER_EXE, known path, PATH), or ""."""
+    candidates = [explicit, os.environ.get("BLENDER_EXE", ""), DEFAULT_BLENDER_EXE, shutil.which("blender") or ""]
+    for candidate in candidates:
+        if candidate and os.path.isfile(candidate):
+            return candidate
+    return ""
+
+
+def blender_identity(blender: str) -> str:
+    """Path, size and mtime of the Blender executable; an upgrade in place changes size or mtime.
+
+    Cheaper than ``blender --version``, which starts Blender.
+    """
+    if not blender:
+        return "blender:none"
+    path = os.path.realpath(blender)
+    stat = os.stat(path)
+    return f"blender:{os.path.normcase(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def update_with_file(hasher, path: str) -> None:
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            hasher.update(chunk)
+
+
+def hash_file(path: str) -> str:
+    hasher = hashlib.sha256()
+    update_with_file(hasher, path)
+    return hasher.hexdigest()
+
+
+def compute_key(input_paths: Iterable[str], key_args: Iterable[str], blender: str = "") -> str:
+    hasher = hashlib.sha256()
+    hasher.update(f"bs_build_cache:{CACHE_FORMAT}\n".encode("utf-8"))
+    hasher.update(f"{blender_identity(blender)}\n".encode("utf-8"))
+    for path in pipeline_script_paths():
+        hasher.update(f"script:{os.path.basename(path)}\n".encode("utf-8"))
+        update_with_file(hasher, path)
+    for path in input_paths:
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Cache input not found: {path}")
+        # Inputs are addressed by content only, so moving a file does not invalidate its entries.
+        hasher.update(b"input\n")
+        update_with_file(hasher, path)
+    hasher.update(json.dumps([str(a) for a in key_args]).encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def entry_dir(cache_dir: str, key: str) -> str:
+    return os.path.join(cache_dir, key[:2], key)
+
+
+def iter_entries(cache_dir: str) -> List[str]:
+    entries = []
+    if not os.path.isdir(cache_dir):
+        return entries
+    for prefix in os.listdir(cache_dir):
+        prefix_dir = os.path.join(cache_dir, prefix)
+        if not os.path.isdir(prefix_dir):
+            continue
+        for name in os.listdir(prefix_dir):
+            path = os.path.join(prefix_dir, name)
+            if os.path.isfile(os.path.join(path, RESULT_FILE)):
+                entries.append(path)
+    return entries
+
+
+def dir_size(path: str) -> int:
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+
+def restore(cache_dir: str, key: str, outputs: Dict[str, str]) -> Optional[Dict[str, object]]:
+    """Copy a cached entry's files to ``outputs`` (name -> path). Returns the cached result or None on miss."""
+    path = entry_dir(cache_dir, key)
+    result_path = os.path.join(path, RESULT_FILE)
+    if not os.path.isfile(result_path):
+        return None
+    with open(result_path, "r", encoding="utf-8") as handle:
+        result = json.load(handle)
+
+    files: Dict[str, str] = result.get("files", {})
+    if any(name not in files for name in outputs) and result.get("exit_code") == 0:
+        return None
+    for name, target in outputs.items():
+        if name not in files:
+            continue
+        target_dir = os.path.dirname(os.path.abspath(target))
+        os.makedirs(target_dir, exist_ok=True)
+        shutil.copyfile(os.path.join(path, files[name]), target)
+
+    # The result file's mtime is the LRU clock.
+    os.utime(result_path, None)
+    return result
+
+
+def store(
+    cache_dir: str,
+    key: str,
+    outputs: Dict[str, str],
+    exit_code: int,
+    validation: List[str],
+    max_bytes: int,
+) -> str:
+    final_path = entry_dir(cache_dir, key)
+    staging = os.path.join(cache_dir, f".staging-{uuid.uuid4().hex}")
+    os.makedirs(staging)
+
+    files: Dict[str, str] = {}
+    for name, source in outputs.items():
+        if os.path.isfile(source):
+            stored_name = name + os.path.splitext(source)[1]
+            shutil.copyfile(source, os.path.join(staging, stored_name))
+            files[name] = stored_name
+
+    result = {
+        "key": key,
+        "format": CACHE_FORMAT,
+        "exit_code": exit_code,
+        "validation": validation,
+        "files": files,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    with open(os.path.join(staging, RESULT_FILE), "w", encoding="utf-8") as handle:
+        json.dump(result, handle, indent=2)
+
+    if os.path.isdir(final_path):
+        shutil.rmtree(final_path, ignore_errors=True)
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    os.replace(staging, final_path)
+    evict(cache_dir, max_bytes)
+    return final_path
+
+
+def evict(cache_dir: str, max_bytes: int) -> int:
+    """Delete least-recently-used entries until the cache fits in ``max_bytes``. Returns entries removed."""
+    entries = []
+    for path in iter_entries(cache_dir):
+        entries.append((os.path.getmtime(os.path.join(path, RESULT_FILE)), dir_size(path), path))
+    total = sum(size for _mtime, size, _path in entries)
+    removed = 0
+    for _mtime, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        removed += 1
+    return removed
+
+
+def read_validation_lines(log_path: str, prefix: str = "[bs_death_pipeline] VALIDATION: ") -> List[str]:
+    if not log_path or not os.path.isfile(log_path):
+        return []
+    with open(log_path, "r", encoding="utf-8", errors="replace") as handle:
+        return [line.strip()[len(prefix) :] for line in handle if line.strip().startswith(prefix)]
+
+
+def parse_outputs(values: List[str]) -> Dict[str, str]:
+    outputs: Dict[str, str] = {}
+    for value in values:
+        if "=" not in value:
+            raise RuntimeError(f"--output expects name=path, got '{value}'.")
+        name, path = value.split("=", 1)
+        outputs[name] = os.path.abspath(path)
+    return outputs
+
+
+def parse_args() -> argparse.Namespace:
+    argv = sys.argv[1:]
+    key_args: List[str] = []
+    if "--" in argv:
+        key_args = argv[argv.index("--") + 1 :]
+        argv = argv[: argv.index("--")]
+
+    parser = argparse.ArgumentParser(description="Content-addressed cache for Blender pipeline outputs.")
+    parser.add_argument("command", choices=("key", "lookup", "store", "evict"))
+    parser.add_argument("--cache-dir", default=default_build_cache_dir())
+    parser.add_argument("--input", action="append", default=[], help="Input file hashed into the key.")
+    parser.add_argument("--output", action="append", default=[], help="name=path of a produced file.")
+    parser.add_argument(
+        "--blender", default="", help="Blender executable hashed into the key. Defaults to BLENDER_EXE, then PATH."
+    )
+    parser.add_argument("--key", default="", help="Precomputed key (store); otherwise computed from inputs/args.")
+    parser.add_argument("--exit-code", type=int, default=0)
+    parser.add_argument("--log", default="", help="Pipeline log to harvest VALIDATION lines from (store).")
+    parser.add_argument("--max-cache-mb", type=float, default=DEFAULT_MAX_CACHE_MB)
+    args = parser.parse_args(argv)
+    args.key_args = key_args
+    return args
+
+
+def main() -> int:
+    args = parse_args()
+    cache_dir = os.path.abspath(args.cache_dir)
+    max_bytes = int(args.max_cache_mb * 1024 * 1024)
+
+    if args.command == "evict":
+        log(f"Evicted {evict(cache_dir, max_bytes)} entries from {cache_dir}")
+        return 0
+
+    key = args.key or compute_key([os.path.abspath(p) for p in args.input], args.key_args, find_blender(args.blender))
+    print(f"KEY={key}")
+    if args.command == "key":
+        return 0
+
+    outputs = parse_outputs(args.output)
+    if args.command == "lookup":
+        result = restore(cache_dir, key, outputs)
+        if result is None:
+            log(f"MISS {key}")
+            return MISS_EXIT_CODE
+        log(f"HIT {key} (exit_code={result['exit_code']})")
+        for issue in result.get("validation", []):
+            print(f"[bs_death_pipeline] VALIDATION: {issue}")
+        print(f"CACHED_EXIT_CODE={result['exit_code']}")
+        return 0
+
+    path = store(cache_dir, key, outputs, args.exit_code, read_validation_lines(args.log), max_bytes)
+    log(f"Stored {key} -> {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        exit_code = main()
+    except Exception as exc:  # pylint: disable=broad-except
+        log(f"ERROR: {exc}")
+        exit_code = 1
+    sys.exit(exit_code)
@@ -0,0 +1,452 @@
+"""Fan bs_death_pipeline.py clip jobs out across several headless Blender workers.
+
+Pure Python (no bpy): run it with a regular interpreter, e.g.
+
+    python tools/bs_death_batch.py --jobs work/death_variants.json --input-fbx assets/HumanMale_Complete_Model.fbx --workers 8
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import bs_build_cache
+from bs_bone_lod import parse_profile_names
+from bs_platforms import parse_platform_fps, variant_output_path
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PIPELINE_SCRIPT = os.path.join(SCRIPT_DIR, "bs_death_pipeline.py")
+PIPELINE_PREFIX = "[bs_death_pipeline] "
+OUTPUT_KEYS = ("output_fbx", "output_blend", "validation_report")
+# Outputs that also get one <root>_<platform><ext> sibling per --platform-fps entry.
+PLATFORM_OUTPUT_KEYS = ("output_fbx", "validation_report")
+PATH_KEYS = OUTPUT_KEYS + ("pose_cache", "bone_lod_profiles")
+# How often a running worker's log is checked for job progress.
+POLL_SEC = 0.5
+
+
+def log(message: str) -> None:
+    print(f"[bs_death_batch] {message}", flush=True)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run a bs_death_pipeline job manifest across several background Blender processes."
+    )
+    parser.add_argument("--jobs", required=True, help="JSON job manifest (same format as bs_death_pipeline --jobs).")
+    parser.add_argument("--workers", type=int, default=max(1, min(8, (os.cpu_count() or 2) // 2)))
+    parser.add_argument(
+        "--jobs-per-worker",
+        type=int,
+        default=0,
+        help="Clips per Blender process. 0 spreads the jobs evenly across --workers.",
+    )
+    parser.add_argument(
+        "--job-timeout-sec",
+        type=float,
+        default=600.0,
+        help="Timeout per clip job (and for worker startup); a hung job is killed and the rest of its chunk restarted.",
+    )
+    parser.add_argument("--blender", default="", help="Blender executable. Defaults to BLENDER_EXE, then PATH.")
+    parser.add_argument("--blend-path", default="", help="Optional .blend opened by every worker.")
+    parser.add_argument("--input-fbx", default="", help="Humanoid FBX imported by every worker.")
+    parser.add_argument("--armature-name", default="")
+    parser.add_argument("--use-current-scene", action="store_true")
+    parser.add_argument("--keep-scene", action="store_true")
+    parser.add_argument(
+        "--armature-only",
+        action="store_true",
+        help="Workers import only the armature and load meshes only for stages that need them.",
+    )
+    parser.add_argument("--report", default="", help="Aggregated JSON report path. Defaults next to the manifest.")
+    parser.add_argument("--temp-dir", default="", help="Parent folder for per-worker temp directories.")
+    parser.add_argument("--keep-temp", action="store_true", help="Keep worker temp directories after the run.")
+    parser.add_argument("--cache-dir", default=bs_build_cache.default_build_cache_dir())
+    parser.add_argument("--max-cache-mb", type=float, default=bs_build_cache.DEFAULT_MAX_CACHE_MB)
+    parser.add_argument("--no-cache", action="store_true", help="Always run Blender; do not read or write the build cache.")
+    return parser.parse_args()
+
+
+def resolve_blender(explicit: str) -> str:
+    blender = bs_build_cache.find_blender(explicit)
+    if not blender:
+        raise RuntimeError("Unable to find blender executable. Pass --blender or set BLENDER_EXE.")
+    return blender
+
+
+def load_jobs(manifest_path: str) -> List[Dict[str, object]]:
+    """Flatten defaults into every job and make output paths absolute, mirroring the pipeline's loader."""
+    with open(manifest_path, "r", encoding="utf-8") as handle:
+        manifest = json.load(handle)
+    if isinstance(manifest, list):
+        defaults: Dict[str, object] = {}
+        entries = manifest
+    else:
+        defaults = manifest.get("defaults", {})
+        entries = manifest.get("jobs", [])
+    if not entries:
+        raise RuntimeError(f"Job manifest has no jobs: {manifest_path}")
+
+    base_dir = os.path.dirname(manifest_path)
+    jobs: List[Dict[str, object]] = []
+    for index, entry in enumerate(entries):
+        job = {key.replace("-", "_"): value for key, value in defaults.items()}
+        job.update({key.replace("-", "_"): value for key, value in entry.items()})
+        for key in PATH_KEYS:
+            if job.get(key):
+                job[key] = os.path.abspath(os.path.join(base_dir, str(job[key])))
+        if not job.get("output_fbx"):
+            raise RuntimeError(f"Job {index}: output_fbx is required.")
+        job.setdefault("clip_name", "Death_Generic_A")
+        jobs.append(job)
+
+    # Worker files are moved into place per job, so two jobs sharing a path would silently overwrite each other.
+    writers: Dict[str, str] = {}
+    for job in jobs:
+        for path in job_outputs(job).values():
+            owner = writers.setdefault(os.path.normcase(path), str(job["clip_name"]))
+            if owner != job["clip_name"]:
+                raise RuntimeError(f"Jobs {owner} and {job['clip_name']} both write {path}")
+    return jobs
+
+
+def chunk_jobs(jobs: List[Dict[str, object]], workers: int, jobs_per_worker: int) -> List[List[Dict[str, object]]]:
+    size = jobs_per_worker if jobs_per_worker > 0 else int(math.ceil(len(jobs) / float(max(1, workers))))
+    return [jobs[i : i + size] for i in range(0, len(jobs), size)]
+
+
+def worker_command(args: argparse.Namespace, blender: str, manifest_path: str) -> List[str]:
+    command = [blender, "-b"]
+    if args.blend_path:
+        command.append(os.path.abspath(args.blend_path))
+    command += ["--python", PIPELINE_SCRIPT, "--", "--jobs", manifest_path]
+    if args.use_current_scene:
+        command.append("--use-current-scene")
+    if args.input_fbx:
+        command += ["--input-fbx", os.path.abspath(args.input_fbx)]
+    if args.armature_name:
+        command += ["--armature-name", args.armature_name]
+    if args.keep_scene:
+        command.append("--keep-scene")
+    if args.armature_only:
+        command.append("--armature-only")
+    return command
+
+
+def job_event(line: str) -> Optional[Tuple[str, str]]:
+    """``(clip_name, event)`` for a pipeline ``JOB <clip>: <event>`` log line, else None."""
+    line = line.strip()
+    if not line.startswith(PIPELINE_PREFIX + "JOB "):
+        return None
+    message = line[len(PIPELINE_PREFIX) + 4 :]
+    if ": " not in message:
+        return None
+    clip_name, event = message.split(": ", 1)
+    return clip_name, event
+
+
+def parse_worker_log(log_path: str) -> Dict[str, Dict[str, object]]:
+    """Attribute VALIDATION/ERROR lines to the job that was running when they were printed."""
+    results: Dict[str, Dict[str, object]] = {}
+    current: Optional[Dict[str, object]] = None
+    if not os.path.isfile(log_path):
+        return results
+    with open(log_path, "r", encoding="utf-8", errors="replace") as handle:
+        for raw_line in handle:
+            line = raw_line.strip()
+            if not line.startswith(PIPELINE_PREFIX):
+                continue
+            message = line[len(PIPELINE_PREFIX) :]
+            job = job_event(line)
+            if job:
+                clip_name, event = job
+                current = results.setdefault(clip_name, {"exit_code": None, "validation": [], "errors": []})
+                if event.startswith("exit="):
+                    current["exit_code"] = int(event[5:])
+                    current = None
+            elif current is not None and message.startswith("VALIDATION: "):
+                current["validation"].append(message[len("VALIDATION: ") :])
+            elif current is not None and message.startswith("ERROR: "):
+                current["errors"].append(message[len("ERROR: ") :])
+    return results
+
+
+def cache_inputs(args: argparse.Namespace) -> List[str]:
+    return [os.path.abspath(p) for p in (args.blend_path, args.input_fbx) if p]
+
+
+def job_cache_key(job: Dict[str, object], args: argparse.Namespace, blender: str) -> str:
+    # Output locations do not change the produced bytes; only whether a .blend is saved does.
+    settings = {k: v for k, v in job.items() if k not in PATH_KEYS}
+    settings["save_blend"] = bool(job.get("output_blend"))
+    session = {
+        "armature_name": args.armature_name,
+        "use_current_scene": args.use_current_scene,
+        "keep_scene": args.keep_scene,
+    }
+    key_args = ["bs_death_pipeline", json.dumps(settings, sort_keys=True), json.dumps(session, sort_keys=True)]
+    # Custom bone-LOD profiles are keyed by content, like the input FBX.
+    inputs = cache_inputs(args) + ([str(job["bone_lod_profiles"])] if job.get("bone_lod_profiles") else [])
+    return bs_build_cache.compute_key(inputs, key_args, blender)
+
+
+def job_outputs(job: Dict[str, object]) -> Dict[str, str]:
+    outputs = {key: str(job[key]) for key in OUTPUT_KEYS if job.get(key)}
+    for platform, _fps in parse_platform_fps(str(job.get("platform_fps") or "")):
+        for key in PLATFORM_OUTPUT_KEYS:
+            if job.get(key):
+                outputs[f"{key}_{platform}"] = variant_output_path(str(job[key]), platform)
+    # Every FBX, platform variants included, gets one more file per bone-LOD profile.
+    for profile in parse_profile_names(str(job.get("bone_lod") or "")):
+        for key, path in list(outputs.items()):
+            if key.startswith("output_fbx"):
+                outputs[f"{key}_{profile}"] = variant_output_path(path, profile)
+    return outputs
+
+
+def job_status(exit_code: Optional[int]) -> str:
+    if exit_code == 0:
+        return "ok"
+    if exit_code == 2:
+        return "validation_failed"
+    return "error"
+
+
+def run_monitored(command: List[str], log_path: str, job_timeout: float) -> Tuple[Optional[int], Optional[str]]:
+    """Run a worker, killing it once no job has started or finished for ``job_timeout`` seconds.
+
+    Returns the exit code (None if killed or not started) and the clip that was running when it was killed.
+    """
+    with open(log_path, "w", encoding="utf-8", errors="replace") as log_handle:
+        try:
+            # Blender ignores PYTHON* variables by default; the pipeline's log() flushes itself, this covers the rest.
+            env = {**os.environ, "PYTHONUNBUFFERED": "1"}
+            process = subprocess.Popen(command, stdout=log_handle, stderr=subprocess.STDOUT, env=env)
+        except OSError as exc:
+            log_handle.write(f"{PIPELINE_PREFIX}ERROR: failed to start worker: {exc}\n")
+            return None, None
+        with open(log_path, "r", encoding="utf-8", errors="replace") as reader:
+            running: Optional[str] = None
+            pending = ""
+            deadline = time.monotonic() + job_timeout
+            while process.poll() is None:
+                pending += reader.read()
+                *lines, pending = pending.split("\n")
+                for line in lines:
+                    job = job_event(line)
+                    if job:
+                        running = None if job[1].startswith("exit=") else job[0]
+                        deadline = time.monotonic() + job_timeout
+                if time.monotonic() > deadline:
+                    process.kill()
+                    process.wait()
+                    return None, running or ""
+                time.sleep(POLL_SEC)
+    return process.returncode, None
+
+
+def run_worker(
+    index: int,
+    jobs: List[Dict[str, object]],
+    args: argparse.Namespace,
+    blender: str,
+    temp_root: str,
+) -> List[Dict[str, object]]:
+    worker_dir = os.path.join(temp_root, f"worker_{index:02d}")
+    os.makedirs(worker_dir, exist_ok=True)
+
+    # Workers write into their own directory; outputs are moved into place only for finished jobs.
+    worker_jobs = []
+    for job in jobs:
+        worker_job = dict(job)
+        for key in OUTPUT_KEYS:
+            if job.get(key):
+                worker_job[key] = os.path.join(worker_dir, f"{job['clip_name']}{os.path.splitext(str(job[key]))[1]}")
+        worker_jobs.append(worker_job)
+
+    log(f"Worker {index}: {len(jobs)} jobs -> {worker_dir}")
+    results: List[Dict[str, object]] = []
+    remaining = list(zip(jobs, worker_jobs))
+    attempt = 0
+    while remaining:
+        suffix = f"_{attempt}" if attempt else ""
+        manifest_path = os.path.join(worker_dir, f"jobs{suffix}.json")
+        with open(manifest_path, "w", encoding="utf-8") as handle:
+            json.dump({"jobs": [worker_job for _job, worker_job in remaining]}, handle, indent=2)
+        log_path = os.path.join(worker_dir, f"worker{suffix}.log")
+
+        started = time.monotonic()
+        # A hung job stops only its own worker process; the jobs after it get a fresh one.
+        worker_exit, hung = run_monitored(worker_command(args, blender, manifest_path), log_path, args.job_timeout_sec)
+        elapsed = time.monotonic() - started
+        timed_out = hung is not None
+        log(f"Worker {index}: exit={worker_exit} timed_out={timed_out} elapsed={elapsed:.1f}s")
+
+        parsed = parse_worker_log(log_path)
+        unfinished = []
+        for job, worker_job in remaining:
+            clip_name = str(job["clip_name"])
+            entry = parsed.get(clip_name, {"exit_code": None, "validation": [], "errors": []})
+            exit_code = entry["exit_code"]
+            if exit_code is None and hung and clip_name not in parsed:
+                # Never started: it queued behind the hung job.
+                unfinished.append((job, worker_job))
+                continue
+            if exit_code is not None:
+                status = job_status(exit_code)
+            elif clip_name == hung or (timed_out and not hung):
+                status = "timeout"
+            else:
+                status = "worker_failed"
+
+            outputs: Dict[str, str] = {}
+            targets = job_outputs(job)
+            for key, source in job_outputs(worker_job).items():
+                if os.path.isfile(source) and exit_code is not None:
+                    target = targets[key]
+                    target_dir = os.path.dirname(target)
+                    if target_dir:
+                        os.makedirs(target_dir, exist_ok=True)
+                    shutil.move(str(source), target)
+                    outputs[key] = target
+
+            results.append(
+                {
+                    "clip_name": job["clip_name"],
+                    "status": status,
+                    "exit_code": exit_code,
+                    "worker": index,
+                    "worker_exit_code": worker_exit,
+                    "worker_log": log_path,
+                    "worker_elapsed_sec": round(elapsed, 3),
+                    "validation": entry["validation"],
+                    "errors": entry["errors"],
+                    "outputs": outputs,
+                }
+            )
+
+        if unfinished:
+            log(f"Worker {index}: job {hung} exceeded {args.job_timeout_sec:g}s; restarting for {len(unfinished)} jobs.")
+        remaining = unfinished
+        attempt += 1
+    return results
+
+
+def run_workers(
+    args: argparse.Namespace, blender: str, jobs: List[Dict[str, object]], keys: Dict[str, str]
+) -> List[Dict[str, object]]:
+    chunks = chunk_jobs(jobs, args.workers, args.jobs_per_worker)
+    workers = max(1, min(args.workers, len(chunks)))
+    temp_root = tempfile.mkdtemp(prefix="bs_death_batch_", dir=args.temp_dir or None)
+    log(f"{len(jobs)} jobs in {len(chunks)} chunks on {workers} workers (temp: {temp_root})")
+
+    results: List[Dict[str, object]] = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_worker, i, chunk, args, blender, temp_root) for i, chunk in enumerate(chunks)]
+        for future in futures:
+            results.extend(future.result())
+
+    for result in results:
+        result["cached"] = False
+        key = keys.get(str(result["clip_name"]))
+        if key and result["status"] in ("ok", "validation_failed"):
+            bs_build_cache.store(
+                args.cache_dir,
+                key,
+                dict(result["outputs"]),
+                int(result["exit_code"]),
+                list(result["validation"]),
+                int(args.max_cache_mb * 1024 * 1024),
+            )
+            result["cache_key"] = key
+
+    failed_hard = any(r["status"] not in ("ok", "validation_failed") for r in results)
+    if not args.keep_temp and not failed_hard:
+        shutil.rmtree(temp_root, ignore_errors=True)
+    return results
+
+
+def main() -> int:
+    args = parse_args()
+    manifest_path = os.path.abspath(args.jobs)
+    jobs = load_jobs(manifest_path)
+    names = [str(job["clip_name"]) for job in jobs]
+    duplicates = sorted({n for n in names if names.count(n) > 1})
+    if duplicates:
+        raise RuntimeError(f"Job manifest repeats clip names: {duplicates}")
+    if not args.use_current_scene and not args.input_fbx:
+        raise RuntimeError("--input-fbx is required unless --use-current-scene is set.")
+    # The executable is part of every cache key, so it is resolved before any lookup.
+    blender = resolve_blender(args.blender)
+
+    results: List[Dict[str, object]] = []
+    keys: Dict[str, str] = {}
+    pending: List[Dict[str, object]] = []
+    use_cache = not args.no_cache
+    for job in jobs:
+        if not use_cache:
+            pending.append(job)
+            continue
+        key = job_cache_key(job, args, blender)
+        keys[str(job["clip_name"])] = key
+        cached = bs_build_cache.restore(args.cache_dir, key, job_outputs(job))
+        if cached is None:
+            pending.append(job)
+            continue
+        exit_code = int(cached["exit_code"])
+        results.append(
+            {
+                "clip_name": job["clip_name"],
+                "status": job_status(exit_code),
+                "exit_code": exit_code,
+                "cached": True,
+                "cache_key": key,
+                "validation": cached.get("validation", []),
+                "errors": [],
+                "outputs": {name: path for name, path in job_outputs(job).items() if name in cached.get("files", {})},
+            }
+        )
+    if results:
+        log(f"{len(results)} jobs restored from cache; {len(pending)} to build.")
+
+    started = time.monotonic()
+    if pending:
+        results.extend(run_workers(args, blender, pending, keys))
+
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[str(result["status"])] = counts.get(str(result["status"]), 0) + 1
+
+    report_path = args.report or os.path.join(os.path.dirname(manifest_path), "batch_report.json")
+    report = {
+        "manifest": manifest_path,
+        "elapsed_sec": round(time.monotonic() - started, 3),
+        "summary": counts,
+        "jobs": results,
+    }
+    report_dir = os.path.dirname(os.path.abspath(report_path))
+    os.makedirs(report_dir, exist_ok=True)
+    with open(report_path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    log(f"Summary: {counts}")
+    log(f"Report: {os.path.abspath(report_path)}")
+
+    if any(r["status"] not in ("ok", "validation_failed") for r in results):
+        return 1
+    return 2 if counts.get("validation_failed") else 0
+
+
+if __name__ == "__main__":
+    try:
+        exit_code = main()
+    except Exception as exc:  # pylint: disable=broad-except
+        log(f"ERROR: {exc}")
+        exit_code = 1
+    sys.exit(exit_code)
@@ -1,8 +1,7 @@
 param(
     [string]$InputFbx = "",
 
-    [Parameter(Mandatory = $true)]
-    [string]$OutputFbx,
+    [string]$OutputFbx = "",
     [string]$OutputBlend = "",
 
     [string]$ClipName = "Death_Generic_A",
@@ -14,11 +13,33 @@ param(
     [int]$StartFrame = 1,
     [string]$RootBone = "",
     [double]$DriftThreshold = 0.03,
+    [double]$MaxAngularVelocity = 1440.0,
+    [double]$MaxAngularAccel = 90000.0,
+    [double]$FootSlideThreshold = 0.05,
+    [double]$FootContactHeight = 0.05,
     [switch]$AutoBlock,
     [switch]$ForceExport,
     [switch]$KeepScene,
     [switch]$UseCurrentScene,
-    [string]$BlendPath = ""
+    [string]$BlendPath = "",
+    [string]$Jobs = "",
+    [string]$RigCacheDir = "",
+    [switch]$NoRigCache,
+    [switch]$ArmatureOnly,
+    [string]$PoseCache = "",
+    [string]$ValidationReport = "",
+    [switch]$AnimationOnly,
+    [string]$LibraryFbx = "",
+    [string]$LibraryActions = "",
+    [string]$PlatformFps = "",
+    [string]$BoneLod = "",
+    [string]$BoneLodProfiles = "",
+    [switch]$StripStatic,
+    [switch]$ReduceKeys,
+    [double]$ReduceLocationTolerance = 0.001,
+    [double]$ReduceRotationTolerance = 0.5,
+    [double]$ReduceScaleTolerance = 0.001,
+    [switch]$MeasureFbxSavings
 )
 
 $ErrorActionPreference = "Stop"
@@ -27,7 +48,9 @@ $scriptDir = Split-Path -Parent $MyInvocation.MyCommand.Path
 $blenderWrapper = Join-Path $scriptDir "blender.ps1"
 $pipelineScript = Join-Path $scriptDir "bs_death_pipeline.py"
 
-$resolvedOutput = [System.IO.Path]::GetFullPath((Join-Path (Get-Location).Path $OutputFbx))
+if (-not $OutputFbx -and -not $Jobs -and -not ($LibraryFbx -and $LibraryActions)) {
+    throw "OutputFbx is required unless -Jobs or -LibraryFbx with -LibraryActions is set."
+}
 
 $args = @()
 if ($BlendPath) {
@@ -40,14 +63,17 @@ if ($BlendPath) {
 $args += @(
     "--python", $pipelineScript,
     "--",
-    "--output-fbx", $resolvedOutput,
     "--clip-name", $ClipName,
     "--fps", "$Fps",
     "--duration-sec", "$DurationSec",
     "--min-duration-sec", "$MinDurationSec",
     "--max-duration-sec", "$MaxDurationSec",
     "--start-frame", "$StartFrame",
-    "--drift-threshold", "$DriftThreshold"
+    "--drift-threshold", "$DriftThreshold",
+    "--max-angular-velocity", "$MaxAngularVelocity",
+    "--max-angular-accel", "$MaxAngularAccel",
+    "--foot-slide-threshold", "$FootSlideThreshold",
+    "--foot-contact-height", "$FootContactHeight"
 )
 
 if ($UseCurrentScene) {
@@ -60,6 +86,14 @@ if ($UseCurrentScene) {
     $args += @("--input-fbx", $resolvedInput)
 }
 
+if ($OutputFbx) {
+    $resolvedOutput = [System.IO.Path]::GetFullPath((Join-Path (Get-Location).Path $OutputFbx))
+    $args += @("--output-fbx", $resolvedOutput)
+}
+if ($Jobs) {
+    $resolvedJobs = (Resolve-Path $Jobs).Path
+    $args += @("--jobs", $resolvedJobs)
+}
 if ($OutputBlend) {
     $resolvedBlend = [System.IO.Path]::GetFullPath((Join-Path (Get-Location).Path $OutputBlend))
     $args += @("--output-blend", $resolvedBlend)
@@ -69,6 +103,43 @@ if ($RootBone) { $args += @("--root-bone", $RootBone) }
 if ($AutoBlock) { $args += "--auto-block" }
 if ($ForceExport) { $args += "--force-export" }
 if ($KeepScene) { $args += "--keep-scene" }
+if ($RigCacheDir) {
+    $resolvedRigCache = [System.IO.Path]::GetFullPath((Join-Path (Get-Location).Path $RigCacheDir))
+    $args += @("--rig-cache-dir", $resolvedRigCache)
+}
+if ($NoRigCache) { $args += "--no-rig-cache" }
+if ($ArmatureOnly) { $args += "--armature-only" }
+if ($AnimationOnly) { $args += "--animation-only" }
+if ($LibraryFbx) {
+    $resolvedLibrary = [System.IO.Path]::GetFullPath((Join-Path (Get-Location).Path $LibraryFbx))
+    $args += @("--library-fbx", $resolvedLibrary)
+}
+if ($LibraryActions) { $args += @("--library-actions", $LibraryActions) }
+if ($PlatformFps) { $args += @("--platform-fps", $PlatformFps) }
+if ($BoneLod) { $args += @("--bone-lod", $BoneLod) }
+if ($BoneLodProfiles) {
+    $resolvedProfiles = [System.IO.Path]::GetFullPath((Join-Path (Get-Location).Path $BoneLodProfiles))
+    $args += @("--bone-lod-profiles", $resolvedProfiles)
+}
+if ($StripStatic) { $args += "--strip-static" }
+if ($ReduceKeys) {
+    $args += @(
+        "--reduce-keys",
+        "--reduce-location-tolerance", "$ReduceLocationTolerance",
+        "--reduce-rotation-tolerance", "$ReduceRotationTolerance",
+        "--reduce-scale-tolerance", "$ReduceScaleTolerance"
+    )
+}
+if ($MeasureFbxSavings) { $args += "--measure-fbx-savings" }
+if ($PoseCache) {
+    $resolvedPoseCache = [System.IO.Path]::GetFullPath((Join-Path (Get-Location).Path $PoseCache))
+    $args += @("--pose-cache", $resolvedPoseCache)
+}
+
+if ($ValidationReport) {
+    $resolvedValidationReport = [System.IO.Path]::GetFullPath((Join-Path (Get-Location).Path $ValidationReport))
+    $args += @("--validation-report", $resolvedValidationReport)
+}
 
 & $blenderWrapper -BlenderArgs $args
 exit $LASTEXITCODE
@@ -1,15 +1,29 @@
 import argparse
+import hashlib
+import json
 import math
 import os
+import re
 import sys
-from typing import Dict, Iterable, List, Optional, Tuple
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 import bpy
 from mathutils import Euler
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bs_build_cache import default_cache_root, hash_file  # noqa: E402
+from bs_fcurves import PoseKeyBuffer, iter_action_fcurves, resample_action, set_keyframe_defaults  # noqa: E402
+from bs_bone_lod import parse_profile_names, resolve_profiles  # noqa: E402
+from bs_key_reduction import KeyTolerances, fbx_bone_keys, fbx_key_reduction, missing_exporter_hooks  # noqa: E402
+from bs_platforms import parse_platform_fps, variant_output_path  # noqa: E402
+from bs_rig_profile import load_rig_profile, profile_pose_bone  # noqa: E402
+from bs_validation_rules import ValidationContext, rules_from_args, run_rules  # noqa: E402
+
 
 def log(message: str) -> None:
-    print(f"[bs_death_pipeline] {message}")
+    # Flushed so drivers following the log (bs_death_batch) see JOB lines as they happen.
+    print(f"[bs_death_pipeline] {message}", flush=True)
 
 
 def parse_args() -> argparse.Namespace:
@@ -21,7 +35,11 @@ def parse_args() -> argparse.Namespace:
         description="Import a B&S humanoid rig, author/validate death clip, export FBX for Unity Humanoid."
     )
     parser.add_argument("--input-fbx", default="", help="Input humanoid FBX file path.")
-    parser.add_argument("--output-fbx", required=True, help="Output FBX animation path.")
+    parser.add_argument(
+        "--output-fbx",
+        default="",
+        help="Output FBX animation path. Required unless --jobs is set.",
+    )
     parser.add_argument(
         "--output-blend",
         default="",
@@ -60,6 +78,30 @@ def parse_args() -> argparse.Namespace:
         default=0.03,
         help="Maximum allowed root XY drift in Blender units.",
     )
+    parser.add_argument(
+        "--max-angular-velocity",
+        type=float,
+        default=1440.0,
+        help="Maximum per-bone angular velocity in degrees per second.",
+    )
+    parser.add_argument(
+        "--max-angular-accel",
+        type=float,
+        default=90000.0,
+        help="Maximum per-bone angular acceleration in degrees per second squared.",
+    )
+    parser.add_argument(
+        "--foot-slide-threshold",
+        type=float,
+        default=0.05,
+        help="Maximum XY travel of a foot while planted, in Blender units.",
+    )
+    parser.add_argument(
+        "--foot-contact-height",
+        type=float,
+        default=0.05,
+        help="A foot counts as planted within this height of its lowest point in the clip.",
+    )
     parser.add_argument(
         "--auto-block",
         action="store_true",
@@ -80,9 +122,199 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Use currently opened blend scene instead of importing an FBX.",
     )
+    parser.add_argument(
+        "--rig-cache-dir",
+        default=os.path.join(default_cache_root(), "rigs"),
+        help="Folder for .blend copies of imported FBX rigs, keyed by FBX content and importer options.",
+    )
+    parser.add_argument(
+        "--no-rig-cache",
+        action="store_true",
+        help="Always parse the input FBX instead of appending the rig from the rig cache.",
+    )
+    parser.add_argument(
+        "--armature-only",
+        action="store_true",
+        help="Import only the armature; meshes, materials and images are loaded later only for stages that need them.",
+    )
+    parser.add_argument(
+        "--rig-profile-dir",
+        default=os.path.join(default_cache_root(), "rig_profiles"),
+        help="Folder for persisted bone-role profiles keyed by the rig's bone names. Empty disables persistence.",
+    )
+    parser.add_argument(
+        "--pose-cache",
+        default="",
+        help="Optional .npz of the sampled clip pose, written after authoring and reused by validate/preview/inspect.",
+    )
+    parser.add_argument(
+        "--animation-only",
+        action="store_true",
+        help="Export the armature and its animation without meshes (clip FBX for an existing Unity avatar).",
+    )
+    parser.add_argument(
+        "--platform-fps",
+        default="",
+        help="Extra per-platform exports resampled from the authored action, e.g. 'nomad=30'. "
+        "Each writes <output>_<platform>.fbx and is validated with the same rules.",
+    )
+    parser.add_argument(
+        "--bone-lod",
+        default="",
+        help="Extra bone-LOD exports, e.g. 'quest,quest_min'. Each writes <output>_<profile>.fbx with only "
+        "the profile's bones keyed.",
+    )
+    parser.add_argument(
+        "--bone-lod-profiles",
+        default="",
+        help="JSON file of custom bone-LOD profiles: {\"name\": [\"body\", \"l_foot\", \"*Hand\"]}.",
+    )
+    parser.add_argument(
+        "--strip-static",
+        action="store_true",
+        help="Leave channels that stay constant over the clip out of the baked FBX (all bones are still exported).",
+    )
+    parser.add_argument(
+        "--reduce-keys",
+        action="store_true",
+        help="Drop baked FBX keys that interpolation between the kept keys reproduces within tolerance.",
+    )
+    parser.add_argument(
+        "--reduce-location-tolerance",
+        type=float,
+        default=0.001,
+        help="Maximum location error of reduced keys in Blender units.",
+    )
+    parser.add_argument(
+        "--reduce-rotation-tolerance",
+        type=float,
+        default=0.5,
+        help="Maximum rotation error of reduced keys in degrees (measured as an angle between orientations).",
+    )
+    parser.add_argument(
+        "--reduce-scale-tolerance",
+        type=float,
+        default=0.001,
+        help="Maximum per-axis scale error of reduced keys.",
+    )
+    parser.add_argument(
+        "--measure-fbx-savings",
+        action="store_true",
+        help="Also write a throwaway unreduced FBX to log the size saved by reduction, stripping or bone LOD.",
+    )
+    parser.add_argument(
+        "--validation-report",
+        default="",
+        help="Optional JSON path for the structured per-rule validation report.",
+    )
+    parser.add_argument(
+        "--library-fbx",
+        default="",
+        help="Also export a clip library: one FBX with a separate take per action.",
+    )
+    parser.add_argument(
+        "--library-actions",
+        default="",
+        help="Comma-separated actions for --library-fbx. Defaults to the clips that passed in this run.",
+    )
+    parser.add_argument(
+        "--jobs",
+        default="",
+        help="JSON job manifest; runs every clip job in one Blender session on a single imported rig.",
+    )
     return parser.parse_args(argv)
 
 
+# Per-clip settings a job manifest may override. Import/scene settings stay session-wide.
+JOB_KEYS = (
+    "clip_name",
+    "output_fbx",
+    "output_blend",
+    "fps",
+    "duration_sec",
+    "min_duration_sec",
+    "max_duration_sec",
+    "start_frame",
+    "root_bone",
+    "drift_threshold",
+    "max_angular_velocity",
+    "max_angular_accel",
+    "foot_slide_threshold",
+    "foot_contact_height",
+    "auto_block",
+    "force_export",
+    "animation_only",
+    "platform_fps",
+    "bone_lod",
+    "bone_lod_profiles",
+    "strip_static",
+    "reduce_keys",
+    "reduce_location_tolerance",
+    "reduce_rotation_tolerance",
+    "reduce_scale_tolerance",
+    "pose_cache",
+    "validation_report",
+)
+
+JOB_PATH_KEYS = ("output_fbx", "output_blend", "pose_cache", "validation_report", "bone_lod_profiles")
+
+# Files a job writes; every job must name its own.
+JOB_OUTPUT_KEYS = ("output_fbx", "output_blend", "validation_report")
+
+
+def load_job_manifest(manifest_path: str, args: argparse.Namespace) -> List[argparse.Namespace]:
+    """Expand a job manifest into one namespace per clip, layered over the CLI arguments.
+
+    The manifest is either a list of job objects or ``{"defaults": {...}, "jobs": [...]}``.
+    Keys use the CLI option names (``clip_name`` or ``clip-name``). Relative output paths
+    resolve against the manifest directory. Output files must come from the jobs, never the CLI.
+    """
+    session_outputs = [f"--{key.replace('_', '-')}" for key in JOB_OUTPUT_KEYS if getattr(args, key)]
+    if session_outputs:
+        raise RuntimeError(
+            f"{', '.join(session_outputs)} cannot be combined with --jobs; set the output per job in the manifest."
+        )
+    manifest_path = os.path.abspath(manifest_path)
+    with open(manifest_path, "r", encoding="utf-8") as handle:
+        manifest = json.load(handle)
+
+    if isinstance(manifest, list):
+        defaults: Dict[str, object] = {}
+        entries = manifest
+    else:
+        defaults = manifest.get("defaults", {})
+        entries = manifest.get("jobs", [])
+    if not entries:
+        raise RuntimeError(f"Job manifest has no jobs: {manifest_path}")
+
+    base_dir = os.path.dirname(manifest_path)
+    jobs: List[argparse.Namespace] = []
+    for index, entry in enumerate(entries):
+        merged = dict(vars(args))
+        for source in (defaults, entry):
+            for raw_key, value in source.items():
+                key = raw_key.replace("-", "_")
+                if key not in JOB_KEYS:
+                    raise RuntimeError(f"Job {index}: unsupported key '{raw_key}'. Allowed: {list(JOB_KEYS)}")
+                if key in JOB_PATH_KEYS and value:
+                    value = os.path.join(base_dir, str(value))
+                merged[key] = value
+        if not merged["output_fbx"] and not args.library_fbx:
+            raise RuntimeError(f"Job {index} ({merged['clip_name']}): output_fbx is required.")
+        jobs.append(argparse.Namespace(**merged))
+
+    names = [job.clip_name for job in jobs]
+    duplicates = sorted({n for n in names if names.count(n) > 1})
+    if duplicates:
+        raise RuntimeError(f"Job manifest repeats clip names: {duplicates}")
+    for key in JOB_OUTPUT_KEYS:
+        paths = [os.path.normcase(getattr(job, key)) for job in jobs if getattr(job, key)]
+        shared = sorted({p for p in paths if paths.count(p) > 1})
+        if shared:
+            raise RuntimeError(f"Job manifest writes the same {key} from several jobs: {shared}")
+    return jobs
+
+
 def clear_scene() -> None:
     bpy.ops.object.select_all(action="SELECT")
     bpy.ops.object.delete(use_global=False)
@@ -101,11 +333,137 @@ def clear_scene() -> None:
                 datablock_collection.remove(datablock)
 
 
-def import_fbx(input_fbx: str) -> None:
+# Options passed to bpy.ops.import_scene.fbx; part of the rig cache key.
+FBX_IMPORT_OPTIONS: Dict[str, object] = {}
+
+
+def rig_cache_path(rig_cache_dir: str, input_fbx: str) -> str:
+    hasher = hashlib.sha256()
+    hasher.update(hash_file(input_fbx).encode("utf-8"))
+    hasher.update(json.dumps(FBX_IMPORT_OPTIONS, sort_keys=True).encode("utf-8"))
+    # Cached .blend files are not guaranteed to load in older Blender versions.
+    hasher.update(bpy.app.version_string.encode("utf-8"))
+    return os.path.join(rig_cache_dir, hasher.hexdigest() + ".blend")
+
+
+def write_rig_cache(cache_path: str, objects: List[bpy.types.Object]) -> None:
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    # Write beside the target and swap in, so parallel workers never read a half-written file.
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    bpy.data.libraries.write(temp_path, set(objects), path_remap="ABSOLUTE", fake_user=True)
+    os.replace(temp_path, cache_path)
+    log(f"Cached imported rig: {cache_path}")
+
+
+def append_rig_from_cache(cache_path: str) -> List[bpy.types.Object]:
+    with bpy.data.libraries.load(cache_path, link=False) as (data_from, data_to):
+        data_to.objects = list(data_from.objects)
+    objects = [obj for obj in data_to.objects if obj is not None]
+    for obj in objects:
+        # The cache is written with fake users so its IDs survive the write; do not carry them into the scene.
+        obj.use_fake_user = False
+        if obj.data is not None:
+            obj.data.use_fake_user = False
+        bpy.context.scene.collection.objects.link(obj)
+    return objects
+
+
+def armature_cache_path(cache_path: str) -> str:
+    return os.path.splitext(cache_path)[0] + ".armature.blend"
+
+
+def strip_to_armatures(objects: List[bpy.types.Object]) -> None:
+    """Delete non-armature objects and purge the meshes, materials and images only they used."""
+    removed = 0
+    for obj in objects:
+        if obj.type != "ARMATURE":
+            bpy.data.objects.remove(obj, do_unlink=True)
+            removed += 1
+    purged = bpy.data.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+    log(f"Armature-only: removed {removed} objects and purged {purged} unused data-blocks.")
+
+
+def import_fbx(input_fbx: str, rig_cache_dir: str = "", armature_only: bool = False) -> None:
     if not os.path.isfile(input_fbx):
         raise FileNotFoundError(f"Input FBX not found: {input_fbx}")
-    bpy.ops.import_scene.fbx(filepath=input_fbx)
-    log(f"Imported FBX: {input_fbx}")
+
+    started = time.perf_counter()
+    cache_path = rig_cache_path(rig_cache_dir, input_fbx) if rig_cache_dir else ""
+    armature_path = armature_cache_path(cache_path) if cache_path else ""
+    if armature_only and armature_path and os.path.isfile(armature_path):
+        objects = append_rig_from_cache(armature_path)
+        log(
+            f"Appended {len(objects)} armature objects from rig cache in "
+            f"{time.perf_counter() - started:.2f}s: {armature_path}"
+        )
+        return
+
+    if cache_path and os.path.isfile(cache_path):
+        objects = append_rig_from_cache(cache_path)
+        log(f"Appended {len(objects)} objects from rig cache: {cache_path}")
+    else:
+        existing = set(bpy.data.objects)
+        bpy.ops.import_scene.fbx(filepath=input_fbx, **FBX_IMPORT_OPTIONS)
+        objects = [obj for obj in bpy.data.objects if obj not in existing]
+        log(f"Imported FBX: {input_fbx}")
+        if cache_path:
+            write_rig_cache(cache_path, objects)
+
+    # Armature objects do not reference their child meshes, so this file holds the skeleton alone.
+    if armature_path and not os.path.isfile(armature_path):
+        write_rig_cache(armature_path, [obj for obj in objects if obj.type == "ARMATURE"])
+    if armature_only:
+        strip_to_armatures(objects)
+    log(f"Rig ready in {time.perf_counter() - started:.2f}s.")
+
+
+def remove_objects(objects: List[bpy.types.Object]) -> None:
+    """Delete ``objects`` and their object data once nothing else uses it.
+
+    No orphan purge: earlier jobs' actions have no users either and must survive for the clip library.
+    """
+    data = {obj.data for obj in objects if obj.data is not None}
+    for obj in objects:
+        bpy.data.objects.remove(obj, do_unlink=True)
+    unused = [datablock for datablock in data if datablock.users == 0]
+    if unused:
+        bpy.data.batch_remove(unused)
+
+
+def ensure_rig_meshes(args: argparse.Namespace, armature_obj: bpy.types.Object) -> None:
+    """Bring in the meshes skipped by --armature-only, bound to the armature already in the scene."""
+    if not args.armature_only or args.use_current_scene:
+        return
+    if any(obj.type == "MESH" and obj.parent == armature_obj for obj in bpy.context.scene.objects):
+        return
+
+    started = time.perf_counter()
+    input_fbx = os.path.abspath(args.input_fbx)
+    cache_path = "" if args.no_rig_cache else rig_cache_path(os.path.abspath(args.rig_cache_dir), input_fbx)
+    existing = set(bpy.data.objects)
+    if cache_path and os.path.isfile(cache_path):
+        objects = append_rig_from_cache(cache_path)
+    else:
+        bpy.ops.import_scene.fbx(filepath=input_fbx, **FBX_IMPORT_OPTIONS)
+        objects = [obj for obj in bpy.data.objects if obj not in existing]
+
+    # The meshes arrive with their own copy of the rig; point them at the live armature instead.
+    scene_armatures = {obj.name: obj for obj in existing if obj.type == "ARMATURE"}
+    duplicates = {}
+    for obj in objects:
+        if obj.type == "ARMATURE":
+            duplicates[obj] = scene_armatures.get(re.sub(r"\.\d{3}$", "", obj.name), armature_obj)
+    for obj in objects:
+        if obj.type == "ARMATURE":
+            continue
+        if obj.parent in duplicates:
+            obj.parent = duplicates[obj.parent]
+        for modifier in obj.modifiers:
+            if modifier.type == "ARMATURE" and modifier.object in duplicates:
+                modifier.object = duplicates[modifier.object]
+    meshes = sum(1 for obj in objects if obj.type == "MESH")
+    remove_objects(list(duplicates))
+    log(f"Loaded {meshes} rig meshes on demand in {time.perf_counter() - started:.2f}s.")
 
 
 def armature_score(obj: bpy.types.Object) -> int:
@@ -135,6 +493,54 @@ def set_active_object(obj: bpy.types.Object) -> None:
     bpy.context.view_layer.objects.active = obj
 
 
+def capture_pose(armature_obj: bpy.types.Object) -> Dict[str, Tuple]:
+    pose = {}
+    for pb in armature_obj.pose.bones:
+        pose[pb.name] = (
+            pb.rotation_mode,
+            pb.location.copy(),
+            pb.rotation_quaternion.copy(),
+            pb.rotation_euler.copy(),
+            pb.scale.copy(),
+        )
+    return pose
+
+
+def restore_pose(armature_obj: bpy.types.Object, pose: Dict[str, Tuple]) -> None:
+    for pb in armature_obj.pose.bones:
+        snapshot = pose.get(pb.name)
+        if snapshot is None:
+            continue
+        rotation_mode, loc, quat, euler, scale = snapshot
+        pb.rotation_mode = rotation_mode
+        pb.location = loc
+        pb.rotation_quaternion = quat
+        pb.rotation_euler = euler
+        pb.scale = scale
+
+
+def reset_scene_for_job(
+    armature_obj: bpy.types.Object, pose: Dict[str, Tuple], session_objects: Set[str]
+) -> None:
+    """Return the shared rig to its session-start state so the next job authors from scratch.
+
+    Objects a job added, i.e. rig meshes loaded on demand for its export, are removed again. The next job
+    then validates and samples without skinned meshes in the scene.
+    """
+    added = [obj for obj in bpy.context.scene.objects if obj.name not in session_objects]
+    if added:
+        remove_objects(added)
+        log(f"Unloaded {len(added)} objects added by the previous job.")
+    if armature_obj.animation_data is not None:
+        armature_obj.animation_data.action = None
+    restore_pose(armature_obj, pose)
+    markers = bpy.context.scene.timeline_markers
+    for marker_name in ("impact", "collapse", "limp"):
+        marker = markers.get(marker_name)
+        if marker is not None:
+            markers.remove(marker)
+
+
 def ensure_action(armature_obj: bpy.types.Object, clip_name: str, reset_existing: bool = True) -> bpy.types.Action:
     if armature_obj.animation_data is None:
         armature_obj.animation_data_create()
@@ -167,32 +573,6 @@ def add_timeline_marker(scene: bpy.types.Scene, name: str, frame: int) -> None:
     scene.timeline_markers.new(name=name, frame=frame)
 
 
-def find_pose_bone(pose_bones: Iterable[bpy.types.PoseBone], names: Iterable[str]) -> Optional[bpy.types.PoseBone]:
-    wanted = [n.lower() for n in names]
-    indexed = {pb.name.lower(): pb for pb in pose_bones}
-    for token in wanted:
-        if token in indexed:
-            return indexed[token]
-    for pb in pose_bones:
-        pb_name = pb.name.lower()
-        if any(token in pb_name for token in wanted):
-            return pb
-    return None
-
-
-def find_limb_bones(
-    pose_bones: Iterable[bpy.types.PoseBone], side_tokens: Iterable[str], base_tokens: Iterable[str]
-) -> List[bpy.types.PoseBone]:
-    matches: List[bpy.types.PoseBone] = []
-    side_tokens_l = [s.lower() for s in side_tokens]
-    base_tokens_l = [b.lower() for b in base_tokens]
-    for pb in pose_bones:
-        name = pb.name.lower()
-        if any(b in name for b in base_tokens_l) and any(s in name for s in side_tokens_l):
-            matches.append(pb)
-    return matches
-
-
 def add_rot_quat(pose_bone: bpy.types.PoseBone, rot_xyz_rad: Tuple[float, float, float]) -> None:
     pose_bone.rotation_mode = "QUATERNION"
     delta = Euler(rot_xyz_rad, "XYZ").to_quaternion()
@@ -204,76 +584,70 @@ def key_pose(
     frame: int,
     root_bone: Optional[bpy.types.PoseBone],
     lock_root_location: bool = True,
-) -> None:
-    for pb in armature_obj.pose.bones:
-        pb.keyframe_insert(data_path="rotation_quaternion", frame=frame)
-        pb.keyframe_insert(data_path="scale", frame=frame)
+    keys: Optional[PoseKeyBuffer] = None,
+) -> List[bpy.types.FCurve]:
+    """Key rotation/scale of every pose bone (and root location) at ``frame``.
+
+    With ``keys`` the pose is only buffered; the caller flushes once after all poses are captured.
+    Returns the F-curves written (empty while buffering).
+    """
+    buffer = keys or PoseKeyBuffer(armature_obj)
+    buffer.capture_pose("rotation_quaternion", frame)
+    buffer.capture_pose("scale", frame)
 
     if root_bone and lock_root_location:
-        root_bone.keyframe_insert(data_path="location", frame=frame)
+        buffer.capture_bone(root_bone, "location", frame)
+
+    if keys is None:
+        return buffer.flush()
+    return []
 
 
-def set_root_location_constant(root_bone: bpy.types.PoseBone, frame_values: Dict[int, Tuple[float, float, float]]) -> None:
+def set_root_location_constant(
+    root_bone: bpy.types.PoseBone,
+    frame_values: Dict[int, Tuple[float, float, float]],
+    keys: Optional[PoseKeyBuffer] = None,
+) -> None:
+    buffer = keys or PoseKeyBuffer(root_bone.id_data)
     for frame, value in frame_values.items():
-        bpy.context.scene.frame_set(frame)
-        root_bone.location = value
-        root_bone.keyframe_insert(data_path="location", frame=frame)
+        buffer.capture_bone(root_bone, "location", frame, value)
+    if keys is None:
+        buffer.flush()
 
 
-def apply_auto_block(armature_obj: bpy.types.Object, root_bone: Optional[bpy.types.PoseBone], f0: int, f1: int, f2: int, f3: int) -> None:
+def apply_auto_block(
+    armature_obj: bpy.types.Object,
+    root_bone: Optional[bpy.types.PoseBone],
+    f0: int,
+    f1: int,
+    f2: int,
+    f3: int,
+    roles: Dict[str, Optional[str]],
+) -> List[bpy.types.FCurve]:
     pbs = armature_obj.pose.bones
-    def pick(*names: str) -> Optional[bpy.types.PoseBone]:
-        for n in names:
-            pb = pbs.get(n)
-            if pb is not None:
-                return pb
-        return None
 
-    hips = root_bone or pick("Hips", "hips", "Pelvis", "pelvis")
-    lower_back = pick("LowerBack", "Spine", "spine")
-    spine = pick("Spine", "spine", "Spine1")
-    chest = pick("Spine1", "Chest", "chest")
-    neck = pick("Neck", "neck", "Neck1")
-    head = pick("Head", "head")
-
-    l_shoulder = pick("LeftShoulder", "Shoulder.L", "shoulder.L")
-    r_shoulder = pick("RightShoulder", "Shoulder.R", "shoulder.R")
-    l_arm = pick("LeftArm", "UpperArm.L", "upper_arm.L")
-    r_arm = pick("RightArm", "UpperArm.R", "upper_arm.R")
-    l_forearm = pick("LeftForeArm", "ForeArm.L", "forearm.L")
-    r_forearm = pick("RightForeArm", "ForeArm.R", "forearm.R")
-    l_thigh = pick("LeftUpLeg", "Thigh.L", "thigh.L")
-    r_thigh = pick("RightUpLeg", "Thigh.R", "thigh.R")
-    l_calf = pick("LeftLeg", "Shin.L", "shin.L")
-    r_calf = pick("RightLeg", "Shin.R", "shin.R")
-    l_foot = pick("LeftFoot", "Foot.L", "foot.L")
-    r_foot = pick("RightFoot", "Foot.R", "foot.R")
-
-    # Fallbacks for non-canonical rigs.
-    if l_arm is None:
-        candidates = find_limb_bones(pbs, ("l", ".l", "_l", "left"), ("upperarm", "arm"))
-        l_arm = candidates[0] if candidates else None
-    if r_arm is None:
-        candidates = find_limb_bones(pbs, ("r", ".r", "_r", "right"), ("upperarm", "arm"))
-        r_arm = candidates[0] if candidates else None
-    if l_forearm is None:
-        candidates = find_limb_bones(pbs, ("l", ".l", "_l", "left"), ("forearm", "lowerarm"))
-        l_forearm = candidates[0] if candidates else None
-    if r_forearm is None:
-        candidates = find_limb_bones(pbs, ("r", ".r", "_r", "right"), ("forearm", "lowerarm"))
-        r_forearm = candidates[0] if candidates else None
-    if l_thigh is None:
-        candidates = find_limb_bones(pbs, ("l", ".l", "_l", "left"), ("thigh", "upleg"))
-        l_thigh = candidates[0] if candidates else None
-    if r_thigh is None:
-        candidates = find_limb_bones(pbs, ("r", ".r", "_r", "right"), ("thigh", "upleg"))
-        r_thigh = candidates[0] if candidates else None
-    if l_calf is None:
-        candidates = find_limb_bones(pbs, ("l", ".l", "_l", "left"), ("calf", "shin", "lowerleg", "leg"))
-        l_calf = candidates[0] if candidates else None
-    if r_calf is None:
-        candidates = find_limb_bones(pbs, ("r", ".r", "_r", "right"), ("calf", "shin", "lowerleg", "leg"))
-        r_calf = candidates[0] if candidates else None
+    def role(name: str) -> Optional[bpy.types.PoseBone]:
+        return profile_pose_bone(armature_obj, roles, name)
+
+    hips = root_bone or role("hips")
+    lower_back = role("lower_back")
+    spine = role("spine")
+    chest = role("chest")
+    neck = role("neck")
+    head = role("head")
+
+    l_shoulder = role("l_shoulder")
+    r_shoulder = role("r_shoulder")
+    l_arm = role("l_arm")
+    r_arm = role("r_arm")
+    l_forearm = role("l_forearm")
+    r_forearm = role("r_forearm")
+    l_thigh = role("l_thigh")
+    r_thigh = role("r_thigh")
+    l_calf = role("l_calf")
+    r_calf = role("r_calf")
+    l_foot = role("l_foot")
+    r_foot = role("r_foot")
 
     base_pose = {}
     bpy.context.scene.frame_set(f0)
@@ -293,12 +667,14 @@ def apply_auto_block(armature_obj: bpy.types.Object, root_bone: Optional[bpy.typ
             pb.location = loc.copy()
             pb.scale = scale.copy()
 
-    bpy.context.scene.frame_set(f0)
+    # Every pose starts from reset_pose(), so keys are buffered and written once at the end
+    # instead of re-evaluating the scene between poses.
+    keys = PoseKeyBuffer(armature_obj)
+
     reset_pose()
-    key_pose(armature_obj, f0, hips, lock_root_location=True)
+    key_pose(armature_obj, f0, hips, lock_root_location=True, keys=keys)
 
     # Impact: quick readable hit reaction.
-    bpy.context.scene.frame_set(f1)
     reset_pose()
     if hips:
         add_rot_quat(hips, (math.radians(-14), math.radians(5), math.radians(0)))
@@ -326,10 +702,9 @@ def apply_auto_block(armature_obj: bpy.types.Object, root_bone: Optional[bpy.typ
     ):
         if pb:
             add_rot_quat(pb, rot)
-    key_pose(armature_obj, f1, hips, lock_root_location=True)
+    key_pose(armature_obj, f1, hips, lock_root_location=True, keys=keys)
 
     # Collapse: center of mass drops with knees folding.
-    bpy.context.scene.frame_set(f2)
     reset_pose()
     if hips:
         add_rot_quat(hips, (math.radians(34), math.radians(0), math.radians(16)))
@@ -357,10 +732,9 @@ def apply_auto_block(armature_obj: bpy.types.Object, root_bone: Optional[bpy.typ
     ):
         if pb:
             add_rot_quat(pb, rot)
-    key_pose(armature_obj, f2, hips, lock_root_location=True)
+    key_pose(armature_obj, f2, hips, lock_root_location=True, keys=keys)
 
     # Limp: asymmetrical low-energy terminal pose before ragdoll handoff.
-    bpy.context.scene.frame_set(f3)
     reset_pose()
     if hips:
         add_rot_quat(hips, (math.radians(48), math.radians(0), math.radians(24)))
@@ -394,136 +768,82 @@ def apply_auto_block(armature_obj: bpy.types.Object, root_bone: Optional[bpy.typ
     if hips:
         # Small vertical drop sells weight without horizontal skating.
         hips.location.z -= 0.08
-    key_pose(armature_obj, f3, hips, lock_root_location=True)
+    key_pose(armature_obj, f3, hips, lock_root_location=True, keys=keys)
 
     if hips:
         # Freeze root translation to avoid forward skating before ragdoll handoff.
-        bpy.context.scene.frame_set(f0)
-        base_loc = tuple(hips.location)
-        set_root_location_constant(hips, {f0: base_loc, f1: base_loc, f2: base_loc, f3: base_loc})
-
-    log("Applied auto-block keys for impact/collapse/limp.")
-
-
-def set_action_curve_defaults(action: bpy.types.Action) -> None:
-    for fcurve in iter_action_fcurves(action):
-        for key in fcurve.keyframe_points:
-            key.interpolation = "BEZIER"
-            key.handle_left_type = "AUTO_CLAMPED"
-            key.handle_right_type = "AUTO_CLAMPED"
+        base_loc = tuple(base_pose[hips.name][1])
+        set_root_location_constant(hips, {f0: base_loc, f1: base_loc, f2: base_loc, f3: base_loc}, keys=keys)
 
+    touched = keys.flush()
+    bpy.context.scene.frame_set(f0)
 
-def iter_action_fcurves(action: bpy.types.Action):
-    if hasattr(action, "fcurves"):
-        for fcurve in action.fcurves:
-            yield fcurve
-        return
+    log("Applied auto-block keys for impact/collapse/limp.")
+    return touched
 
-    # Blender 5 layered action API.
-    for layer in getattr(action, "layers", []):
-        for strip in getattr(layer, "strips", []):
-            for channel_bag in getattr(strip, "channelbags", []):
-                for fcurve in getattr(channel_bag, "fcurves", []):
-                    yield fcurve
 
+def set_action_curve_defaults(
+    action: bpy.types.Action,
+    fcurves: Optional[Iterable[bpy.types.FCurve]] = None,
+    frame_range: Optional[Tuple[float, float]] = None,
+) -> None:
+    """Apply BEZIER/AUTO_CLAMPED defaults to ``fcurves`` (default: every curve in ``action``).
 
-def bone_root_candidates() -> Tuple[str, ...]:
-    return (
-        "root",
-        "hips",
-        "pelvis",
-        "mixamorig:hips",
-        "b_root",
-        "b_hips",
-    )
+    Pass the curves that were just keyed, and optionally a frame range, so hand-polished keys keep their settings.
+    """
+    selected = iter_action_fcurves(action) if fcurves is None else fcurves
+    unique = {(fc.data_path, fc.array_index): fc for fc in selected}
+    changed = set_keyframe_defaults(unique.values(), "BEZIER", "AUTO_CLAMPED", frame_range)
+    log(f"Applied curve defaults to {changed} keys on {len(unique)} F-curves.")
 
 
-def resolve_root_bone(armature_obj: bpy.types.Object, explicit_name: str = "") -> Optional[bpy.types.PoseBone]:
+def resolve_root_bone(
+    armature_obj: bpy.types.Object, explicit_name: str = "", roles: Optional[Dict[str, Optional[str]]] = None
+) -> Optional[bpy.types.PoseBone]:
     pbs = armature_obj.pose.bones
     if explicit_name:
         pb = pbs.get(explicit_name)
         if pb is None:
             raise RuntimeError(f"Root bone '{explicit_name}' not found.")
         return pb
-    return find_pose_bone(pbs, bone_root_candidates())
-
-
-def sample_root_xy_drift(root_bone: bpy.types.PoseBone, frame_start: int, frame_end: int) -> float:
-    positions: List[Tuple[float, float]] = []
-    scene = bpy.context.scene
-    for frame in range(frame_start, frame_end + 1):
-        scene.frame_set(frame)
-        positions.append((root_bone.location.x, root_bone.location.y))
-    x0, y0 = positions[0]
-    max_dist = 0.0
-    for x, y in positions[1:]:
-        dx = x - x0
-        dy = y - y0
-        dist = math.sqrt(dx * dx + dy * dy)
-        max_dist = max(max_dist, dist)
-    return max_dist
+    if roles is None:
+        roles = load_rig_profile(armature_obj)
+    return profile_pose_bone(armature_obj, roles, "root")
 
 
 def validate_clip(
+    args: argparse.Namespace,
+    armature_obj: bpy.types.Object,
     action: bpy.types.Action,
     root_bone: Optional[bpy.types.PoseBone],
+    roles: Dict[str, Optional[str]],
     frame_start: int,
     frame_end: int,
-    fps: int,
-    drift_threshold: float,
-    min_duration_sec: float,
-    max_duration_sec: float,
 ) -> List[str]:
-    issues: List[str] = []
-    duration = (frame_end - frame_start) / float(fps)
-    if duration < min_duration_sec or duration > max_duration_sec:
-        issues.append(
-            f"Duration {duration:.3f}s is outside recommended range "
-            f"[{min_duration_sec:.3f}, {max_duration_sec:.3f}]."
-        )
-
-    curve_count = sum(1 for _ in iter_action_fcurves(action)) if action else 0
-    if action is None or curve_count == 0:
-        issues.append("Action has no fcurves; no animation data to export.")
+    ctx = ValidationContext(armature_obj, action, root_bone, frame_start, frame_end, args.fps, roles)
+    report = run_rules(rules_from_args(args), ctx, os.path.abspath(args.pose_cache) if args.pose_cache else "")
+    for line in report.summary_lines():
+        log(line)
+    if args.validation_report:
+        report.write_json(os.path.abspath(args.validation_report))
+    return report.issues
 
-    markers = bpy.context.scene.timeline_markers
-    for marker_name in ("impact", "collapse", "limp"):
-        if markers.get(marker_name) is None:
-            issues.append(f"Missing timeline marker: {marker_name}")
 
-    if root_bone is None:
-        issues.append("No root/pelvis bone resolved; root drift check skipped.")
-    else:
-        drift = sample_root_xy_drift(root_bone, frame_start, frame_end)
-        log(f"Root XY drift: {drift:.5f}")
-        if drift > drift_threshold:
-            issues.append(
-                f"Root XY drift {drift:.5f} exceeds threshold {drift_threshold:.5f}."
-            )
-
-    return issues
-
-
-def export_fbx(output_fbx: str, armature_obj: bpy.types.Object) -> None:
-    output_dir = os.path.dirname(output_fbx)
-    if output_dir:
-        os.makedirs(output_dir, exist_ok=True)
+def key_tolerances(args: argparse.Namespace) -> Optional[KeyTolerances]:
+    if not args.reduce_keys:
+        return None
+    return KeyTolerances(args.reduce_location_tolerance, args.reduce_rotation_tolerance, args.reduce_scale_tolerance)
 
-    set_active_object(armature_obj)
-    for obj in bpy.context.scene.objects:
-        if obj.type in {"MESH", "ARMATURE"}:
-            obj.select_set(True)
-        else:
-            obj.select_set(False)
 
+def write_fbx(output_fbx: str, all_bones: bool = True, with_mesh: bool = True, nla_strips: bool = False) -> None:
     bpy.ops.export_scene.fbx(
         filepath=output_fbx,
         use_selection=True,
-        object_types={"ARMATURE", "MESH"},
+        object_types={"ARMATURE", "MESH"} if with_mesh else {"ARMATURE"},
         add_leaf_bones=False,
         bake_anim=True,
-        bake_anim_use_all_bones=True,
-        bake_anim_use_nla_strips=False,
+        bake_anim_use_all_bones=all_bones,
+        bake_anim_use_nla_strips=nla_strips,
         bake_anim_use_all_actions=False,
         bake_anim_force_startend_keying=True,
         bake_anim_step=1.0,
@@ -534,7 +854,263 @@ def export_fbx(output_fbx: str, armature_obj: bpy.types.Object) -> None:
         axis_forward="-Z",
         axis_up="Y",
     )
-    log(f"Exported FBX: {output_fbx}")
+
+
+def export_fbx(
+    output_fbx: str,
+    armature_obj: bpy.types.Object,
+    tolerances: Optional[KeyTolerances] = None,
+    strip_static: bool = False,
+    with_mesh: bool = True,
+    nla_strips: bool = False,
+    drop_bones: Sequence[str] = (),
+    measure_savings: bool = False,
+) -> None:
+    output_dir = os.path.dirname(output_fbx)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    set_active_object(armature_obj)
+    exported_types = {"MESH", "ARMATURE"} if with_mesh else {"ARMATURE"}
+    for obj in bpy.context.scene.objects:
+        if obj.type in exported_types:
+            obj.select_set(True)
+        else:
+            obj.select_set(False)
+    kind = "FBX" if with_mesh else "animation-only FBX"
+
+    if tolerances is None and not strip_static and not drop_bones:
+        write_fbx(output_fbx, with_mesh=with_mesh, nla_strips=nla_strips)
+        log(f"Exported {kind}: {output_fbx}")
+        return
+
+    missing = missing_exporter_hooks()
+    if missing:
+        log(
+            f"WARNING: this Blender's FBX exporter lacks {', '.join(missing)}; "
+            "exporting without key reduction or bone LOD."
+        )
+        tolerances, drop_bones = None, ()
+
+    baseline_size = 0
+    if measure_savings:
+        # An extra full export, only written to measure what reduction/stripping saves.
+        baseline_fbx = f"{output_fbx}.{os.getpid()}.unreduced.fbx"
+        write_fbx(baseline_fbx, with_mesh=with_mesh, nla_strips=nla_strips)
+        baseline_size = os.path.getsize(baseline_fbx)
+        os.remove(baseline_fbx)
+
+    if strip_static or drop_bones:
+        # Unkeyed channels fall back to the bone's exported transform, which the exporter reads at the
+        # current frame; sitting inside the clip makes that the channel's constant value.
+        scene = bpy.context.scene
+        scene.frame_set(scene.frame_start)
+
+    # Without bake_anim_use_all_bones the exporter writes no curve for a channel that never changes;
+    # every bone is still exported, so the hierarchy Unity maps to Humanoid is unchanged.
+    if missing:
+        write_fbx(output_fbx, all_bones=not strip_static, with_mesh=with_mesh, nla_strips=nla_strips)
+    else:
+        with fbx_key_reduction(tolerances, fbx_bone_keys(armature_obj, drop_bones)) as stats:
+            write_fbx(output_fbx, all_bones=not strip_static, with_mesh=with_mesh, nla_strips=nla_strips)
+        if strip_static:
+            log(f"Static channel stripping: {stats.keyed_summary()}")
+        if drop_bones:
+            log(f"Bone LOD: {len(drop_bones)} bones unkeyed, {stats.dropped_summary()}")
+        if tolerances is not None:
+            log(
+                f"Key reduction (location {tolerances.location:g}, rotation {tolerances.rotation_deg:g} deg, "
+                f"scale {tolerances.scale:g}): {stats.summary()}"
+            )
+    reduced_size = os.path.getsize(output_fbx)
+    if baseline_size:
+        saved = 100.0 * (1.0 - reduced_size / float(baseline_size))
+        log(f"FBX size: {baseline_size} -> {reduced_size} bytes ({saved:.1f}% smaller)")
+    else:
+        log(f"FBX size: {reduced_size} bytes")
+    log(f"Exported {kind}: {output_fbx}")
+
+
+def export_clip(
+    args: argparse.Namespace,
+    output_fbx: str,
+    armature_obj: bpy.types.Object,
+    lod_profiles: Sequence[Tuple[str, Set[str]]] = (),
+) -> None:
+    """Export the active clip to ``output_fbx``, then once more per bone-LOD profile."""
+    tolerances = key_tolerances(args)
+    with_mesh = not args.animation_only
+    measure = args.measure_fbx_savings
+    export_fbx(output_fbx, armature_obj, tolerances, args.strip_static, with_mesh=with_mesh, measure_savings=measure)
+    bone_names = [bone.name for bone in armature_obj.data.bones]
+    for profile, kept in lod_profiles:
+        dropped = [name for name in bone_names if name not in kept]
+        log(f"Bone LOD '{profile}': {len(bone_names) - len(dropped)}/{len(bone_names)} bones keep their curves.")
+        export_fbx(
+            variant_output_path(output_fbx, profile),
+            armature_obj,
+            tolerances,
+            args.strip_static,
+            with_mesh=with_mesh,
+            drop_bones=dropped,
+            measure_savings=measure,
+        )
+
+
+def store_clip_metadata(
+    action: bpy.types.Action, frame_start: int, frame_end: int, fps: int, markers: Dict[str, int]
+) -> None:
+    """Keep the clip's range, fps and markers on the action itself so library export can rebuild each take.
+
+    Clip markers are added or moved by name; any other pose markers on the action are kept.
+    """
+    action.use_frame_range = True
+    action.frame_start = frame_start
+    action.frame_end = frame_end
+    action["bs_fps"] = fps
+    for name, frame in markers.items():
+        marker = action.pose_markers.get(name) or action.pose_markers.new(name)
+        marker.frame = frame
+
+
+def library_take(action: bpy.types.Action) -> Dict[str, object]:
+    frame_start, frame_end = (int(round(f)) for f in action.frame_range)
+    return {
+        "name": action.name,
+        "frame_start": frame_start,
+        "frame_end": frame_end,
+        "fps": action.get("bs_fps"),
+        # FBX takes start at 0, so markers are also given relative to the take.
+        "markers": {m.name: {"frame": m.frame, "take_frame": m.frame - frame_start} for m in action.pose_markers},
+    }
+
+
+def export_library(
+    args: argparse.Namespace, armature_obj: bpy.types.Object, action_names: List[str]
+) -> None:
+    """Bake ``action_names`` into one FBX, one take each, via temporary NLA strips (one per track)."""
+    if not action_names:
+        raise RuntimeError("No actions to export to the clip library.")
+    actions = []
+    for name in action_names:
+        action = bpy.data.actions.get(name)
+        if action is None:
+            raise RuntimeError(f"Library action '{name}' not found.")
+        if not any(True for _ in iter_action_fcurves(action)):
+            raise RuntimeError(f"Library action '{name}' has no fcurves.")
+        actions.append(action)
+
+    rates = {action.get("bs_fps") for action in actions} - {None}
+    if len(rates) > 1:
+        raise RuntimeError(f"Library actions use different fps {sorted(rates)}; FBX takes share one frame rate.")
+    if rates:
+        bpy.context.scene.render.fps = rates.pop()
+        bpy.context.scene.render.fps_base = 1.0
+
+    anim = armature_obj.animation_data or armature_obj.animation_data_create()
+    active_action = anim.action
+    muted = {track.name: track.mute for track in anim.nla_tracks}
+    for track in anim.nla_tracks:
+        track.mute = True
+
+    tracks = []
+    try:
+        anim.action = None
+        for action in actions:
+            track = anim.nla_tracks.new()
+            track.name = f"bs_take_{action.name}"
+            strip = track.strips.new(action.name, int(round(action.frame_range[0])), action)
+            # The exporter names each take after its strip.
+            strip.name = action.name
+            tracks.append(track)
+
+        with_mesh = not args.animation_only
+        if with_mesh:
+            ensure_rig_meshes(args, armature_obj)
+        library_fbx = os.path.abspath(args.library_fbx)
+        export_fbx(
+            library_fbx,
+            armature_obj,
+            key_tolerances(args),
+            args.strip_static,
+            with_mesh=with_mesh,
+            nla_strips=True,
+            measure_savings=args.measure_fbx_savings,
+        )
+    finally:
+        for track in tracks:
+            anim.nla_tracks.remove(track)
+        for track in anim.nla_tracks:
+            track.mute = muted.get(track.name, track.mute)
+        anim.action = active_action
+
+    takes = [library_take(action) for action in actions]
+    takes_path = os.path.splitext(library_fbx)[0] + ".takes.json"
+    with open(takes_path, "w", encoding="utf-8") as handle:
+        json.dump({"fbx": os.path.basename(library_fbx), "takes": takes}, handle, indent=2)
+    log(f"Clip library: {len(takes)} takes ({', '.join(t['name'] for t in takes)}); take list: {takes_path}")
+
+
+def remap_frame(frame: int, frame_start: int, source_fps: float, target_fps: float) -> int:
+    return frame_start + int(round((frame - frame_start) * target_fps / source_fps))
+
+
+def export_platform_variants(
+    args: argparse.Namespace,
+    armature_obj: bpy.types.Object,
+    action: bpy.types.Action,
+    root_bone: Optional[bpy.types.PoseBone],
+    roles: Dict[str, Optional[str]],
+    frame_start: int,
+    frame_end: int,
+    markers: Dict[str, int],
+    lod_profiles: Sequence[Tuple[str, Set[str]]] = (),
+) -> int:
+    """Resample the authored clip for each --platform-fps entry, validate it and export it. Returns an exit code."""
+    scene = bpy.context.scene
+    code = 0
+    for platform, fps in parse_platform_fps(args.platform_fps):
+        variant_args = argparse.Namespace(**vars(args))
+        variant_args.fps = fps
+        # The pose cache belongs to the authored sample rate; the variant samples its own pose.
+        variant_args.pose_cache = ""
+        if args.validation_report:
+            variant_args.validation_report = variant_output_path(args.validation_report, platform)
+
+        variant, variant_end = resample_action(
+            action, armature_obj, f"{action.name}_{platform}", frame_start, frame_end, args.fps, fps
+        )
+        variant_markers = {name: remap_frame(f, frame_start, args.fps, fps) for name, f in markers.items()}
+        store_clip_metadata(variant, frame_start, variant_end, fps, variant_markers)
+        log(
+            f"Platform {platform}: {fps} fps, frames {frame_start}-{variant_end}, markers "
+            + ", ".join(f"{name}={frame}" for name, frame in variant_markers.items())
+        )
+        try:
+            armature_obj.animation_data.action = variant
+            set_scene_timing(scene, frame_start, variant_end, fps)
+            for name, frame in variant_markers.items():
+                add_timeline_marker(scene, name, frame)
+
+            issues = validate_clip(variant_args, armature_obj, variant, root_bone, roles, frame_start, variant_end)
+            for issue in issues:
+                log(f"VALIDATION: [{platform}] {issue}")
+            if issues and not args.force_export:
+                log(f"Platform {platform}: validation failed; variant not exported.")
+                code = 2
+                continue
+            if not issues:
+                log(f"Platform {platform}: validation passed.")
+            export_clip(
+                args, variant_output_path(os.path.abspath(args.output_fbx), platform), armature_obj, lod_profiles
+            )
+        finally:
+            armature_obj.animation_data.action = action
+            set_scene_timing(scene, frame_start, frame_end, args.fps)
+            for name, frame in markers.items():
+                add_timeline_marker(scene, name, frame)
+            bpy.data.actions.remove(variant)
+    return code
 
 
 def save_blend(output_blend: str) -> None:
@@ -545,24 +1121,21 @@ def save_blend(output_blend: str) -> None:
     log(f"Saved blend: {output_blend}")
 
 
-def main() -> int:
-    args = parse_args()
-
-    output_fbx = os.path.abspath(args.output_fbx)
-    output_blend = os.path.abspath(args.output_blend) if args.output_blend else ""
-
+def prepare_scene(args: argparse.Namespace) -> None:
     if args.use_current_scene:
         log("Using current scene from opened blend.")
-    else:
-        if not args.input_fbx:
-            raise RuntimeError("--input-fbx is required unless --use-current-scene is set.")
-        input_fbx = os.path.abspath(args.input_fbx)
-        if not args.keep_scene:
-            clear_scene()
-        import_fbx(input_fbx)
+        return
+    if not args.input_fbx:
+        raise RuntimeError("--input-fbx is required unless --use-current-scene is set.")
+    input_fbx = os.path.abspath(args.input_fbx)
+    if not args.keep_scene:
+        clear_scene()
+    import_fbx(input_fbx, "" if args.no_rig_cache else os.path.abspath(args.rig_cache_dir), args.armature_only)
 
-    armature_obj = find_armature(args.armature_name)
-    log(f"Using armature: {armature_obj.name}")
+
+def run_job(args: argparse.Namespace, armature_obj: bpy.types.Object) -> int:
+    output_fbx = os.path.abspath(args.output_fbx) if args.output_fbx else ""
+    output_blend = os.path.abspath(args.output_blend) if args.output_blend else ""
 
     set_active_object(armature_obj)
     existing_curve_count = 0
@@ -584,40 +1157,49 @@ def main() -> int:
     add_timeline_marker(bpy.context.scene, "collapse", f_collapse)
     add_timeline_marker(bpy.context.scene, "limp", f_limp)
     log(f"Timeline markers: impact={f_impact}, collapse={f_collapse}, limp={f_limp}")
+    clip_markers = {"impact": f_impact, "collapse": f_collapse, "limp": f_limp}
+    if args.library_fbx:
+        # Only library takes need it; a plain clip run leaves the authored action's settings alone.
+        store_clip_metadata(action, frame_start, frame_end, args.fps, clip_markers)
 
-    root_bone = resolve_root_bone(armature_obj, args.root_bone)
+    roles = load_rig_profile(armature_obj, os.path.abspath(args.rig_profile_dir) if args.rig_profile_dir else "")
+    root_bone = resolve_root_bone(armature_obj, args.root_bone, roles)
     if root_bone:
         log(f"Using root bone: {root_bone.name}")
+    lod_profiles = resolve_profiles(
+        parse_profile_names(args.bone_lod),
+        [pb.name for pb in armature_obj.pose.bones],
+        roles,
+        os.path.abspath(args.bone_lod_profiles) if args.bone_lod_profiles else "",
+    )
 
+    authored_fcurves: List[bpy.types.FCurve] = []
     if args.auto_block:
-        apply_auto_block(armature_obj, root_bone, frame_start, f_impact, f_collapse, f_limp)
+        authored_fcurves = apply_auto_block(
+            armature_obj, root_bone, frame_start, f_impact, f_collapse, f_limp, roles
+        )
     else:
         if args.use_current_scene and existing_curve_count > 0:
             log("Keeping existing keyed action in current scene.")
         else:
             # Authoring baseline: provide guaranteed start/end keys without moving root translation.
             bpy.context.scene.frame_set(frame_start)
-            key_pose(armature_obj, frame_start, root_bone, lock_root_location=True)
+            authored_fcurves += key_pose(armature_obj, frame_start, root_bone, lock_root_location=True)
             bpy.context.scene.frame_set(frame_end)
-            key_pose(armature_obj, frame_end, root_bone, lock_root_location=True)
+            authored_fcurves += key_pose(armature_obj, frame_end, root_bone, lock_root_location=True)
             log("Inserted baseline start/end keys. Refine poses manually in Blender before final export.")
 
-    set_action_curve_defaults(action)
+    # Only curves keyed by this run get defaults; existing hand-polished keys are left alone.
+    set_action_curve_defaults(action, fcurves=authored_fcurves, frame_range=(frame_start, frame_end))
+
+    # Validation runs before any on-demand mesh load so pose sampling never evaluates skinned meshes.
+    issues = validate_clip(args, armature_obj, action, root_bone, roles, frame_start, frame_end)
 
     if output_blend:
+        # Previews render from the saved .blend, so it carries the meshes.
+        ensure_rig_meshes(args, armature_obj)
         save_blend(output_blend)
 
-    issues = validate_clip(
-        action=action,
-        root_bone=root_bone,
-        frame_start=frame_start,
-        frame_end=frame_end,
-        fps=args.fps,
-        drift_threshold=args.drift_threshold,
-        min_duration_sec=args.min_duration_sec,
-        max_duration_sec=args.max_duration_sec,
-    )
-
     if issues:
         for issue in issues:
             log(f"VALIDATION: {issue}")
@@ -627,10 +1209,86 @@ def main() -> int:
     else:
         log("Validation passed.")
 
-    export_fbx(output_fbx, armature_obj)
+    if not output_fbx:
+        log("No per-clip FBX requested; clip is exported with the library.")
+        return 0
+    if not args.animation_only:
+        ensure_rig_meshes(args, armature_obj)
+    export_clip(args, output_fbx, armature_obj, lod_profiles)
+    if args.platform_fps:
+        return export_platform_variants(
+            args, armature_obj, action, root_bone, roles, frame_start, frame_end, clip_markers, lod_profiles
+        )
     return 0
 
 
+def run_jobs(
+    jobs: List[argparse.Namespace], armature_obj: bpy.types.Object, succeeded: Optional[List[str]] = None
+) -> int:
+    """Run clip jobs in sequence on one rig. Returns 1 if any job errored, else 2 if any failed validation.
+
+    Clip names of jobs that exit 0 are appended to ``succeeded``.
+    """
+    session_pose = capture_pose(armature_obj)
+    session_objects = {obj.name for obj in bpy.context.scene.objects}
+    exit_codes: List[int] = []
+    for index, job in enumerate(jobs):
+        if index > 0:
+            reset_scene_for_job(armature_obj, session_pose, session_objects)
+        log(f"JOB {job.clip_name}: start ({index + 1}/{len(jobs)})")
+        try:
+            code = run_job(job, armature_obj)
+        except Exception as exc:  # pylint: disable=broad-except
+            log(f"ERROR: {exc}")
+            code = 1
+        log(f"JOB {job.clip_name}: exit={code}")
+        exit_codes.append(code)
+        if code == 0 and succeeded is not None:
+            succeeded.append(job.clip_name)
+
+    failed = sum(1 for code in exit_codes if code != 0)
+    log(f"Batch complete: {len(jobs) - failed}/{len(jobs)} jobs succeeded.")
+    if 1 in exit_codes:
+        return 1
+    return 2 if failed else 0
+
+
+def main() -> int:
+    args = parse_args()
+
+    jobs: List[argparse.Namespace] = []
+    if args.jobs:
+        jobs = load_job_manifest(args.jobs, args)
+        log(f"Loaded {len(jobs)} jobs from manifest: {os.path.abspath(args.jobs)}")
+    elif not args.output_fbx and not (args.library_fbx and args.library_actions):
+        raise RuntimeError("--output-fbx is required unless --jobs or --library-fbx with --library-actions is set.")
+
+    prepare_scene(args)
+
+    armature_obj = find_armature(args.armature_name)
+    log(f"Using armature: {armature_obj.name}")
+
+    succeeded: List[str] = []
+    if args.jobs:
+        code = run_jobs(jobs, armature_obj, succeeded)
+    elif args.output_fbx:
+        code = run_job(args, armature_obj)
+        if code == 0:
+            succeeded.append(args.clip_name)
+    else:
+        code = 0
+
+    if args.library_fbx:
+        names = [n.strip() for n in args.library_actions.split(",") if n.strip()] or succeeded
+        try:
+            export_library(args, armature_obj, names)
+        except Exception as exc:  # pylint: disable=broad-except
+            log(f"ERROR: {exc}")
+            # A clip that already failed keeps its exit code.
+            return code or 1
+    return code
+
+
 if __name__ == "__main__":
     try:
         exit_code = main()
@@ -8,7 +8,13 @@ param(
     [double]$MinDurationSec = 0.5,
     [double]$MaxDurationSec = 1.0,
     [double]$DriftThreshold = 0.03,
-    [string]$RootBone = ""
+    [double]$MaxAngularVelocity = 1440.0,
+    [double]$MaxAngularAccel = 90000.0,
+    [double]$FootSlideThreshold = 0.05,
+    [double]$FootContactHeight = 0.05,
+    [string]$RootBone = "",
+    [string]$PoseCache = "",
+    [string]$ValidationReport = ""
 )
 
 $ErrorActionPreference = "Stop"
@@ -28,11 +34,24 @@ $args = @(
     "--end-frame", "$EndFrame",
     "--min-duration-sec", "$MinDurationSec",
     "--max-duration-sec", "$MaxDurationSec",
-    "--drift-threshold", "$DriftThreshold"
+    "--drift-threshold", "$DriftThreshold",
+    "--max-angular-velocity", "$MaxAngularVelocity",
+    "--max-angular-accel", "$MaxAngularAccel",
+    "--foot-slide-threshold", "$FootSlideThreshold",
+    "--foot-contact-height", "$FootContactHeight"
 )
 
 if ($Action) { $args += @("--action", $Action) }
 if ($RootBone) { $args += @("--root-bone", $RootBone) }
+if ($PoseCache) {
+    $resolvedPoseCache = [System.IO.Path]::GetFullPath((Join-Path (Get-Location).Path $PoseCache))
+    $args += @("--pose-cache", $resolvedPoseCache)
+}
+
+if ($ValidationReport) {
+    $resolvedValidationReport = [System.IO.Path]::GetFullPath((Join-Path (Get-Location).Path $ValidationReport))
+    $args += @("--validation-report", $resolvedValidationReport)
+}
 
 & $blenderWrapper -BlenderArgs $args
 exit $LASTEXITCODE
@@ -1,9 +1,15 @@
 import argparse
+import os
 import sys
-from typing import List, Optional, Tuple
+from typing import Dict, Optional
 
 import bpy
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bs_build_cache import default_cache_root  # noqa: E402
+from bs_rig_profile import load_rig_profile, profile_pose_bone  # noqa: E402
+from bs_validation_rules import ValidationContext, rules_from_args, run_rules  # noqa: E402
+
 
 def log(message: str) -> None:
     print(f"[bs_death_validate] {message}")
@@ -22,7 +28,22 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--min-duration-sec", type=float, default=0.5)
     parser.add_argument("--max-duration-sec", type=float, default=1.0)
     parser.add_argument("--drift-threshold", type=float, default=0.03)
+    parser.add_argument("--max-angular-velocity", type=float, default=1440.0, help="Degrees per second.")
+    parser.add_argument("--max-angular-accel", type=float, default=90000.0, help="Degrees per second squared.")
+    parser.add_argument("--foot-slide-threshold", type=float, default=0.05)
+    parser.add_argument("--foot-contact-height", type=float, default=0.05)
     parser.add_argument("--root-bone", default="", help="Root/pelvis bone.")
+    parser.add_argument(
+        "--rig-profile-dir",
+        default=os.path.join(default_cache_root(), "rig_profiles"),
+        help="Folder for persisted bone-role profiles shared with bs_death_pipeline. Empty disables persistence.",
+    )
+    parser.add_argument(
+        "--pose-cache",
+        default="",
+        help="Optional .npz pose cache; reused when it matches the clip, otherwise sampled and written.",
+    )
+    parser.add_argument("--validation-report", default="", help="Optional JSON path for the per-rule validation report.")
     return parser.parse_args(argv)
 
 
@@ -34,51 +55,14 @@ def find_armature() -> bpy.types.Object:
     return arms[0]
 
 
-def find_root_bone(armature: bpy.types.Object, explicit_name: str) -> Optional[bpy.types.PoseBone]:
+def find_root_bone(
+    armature: bpy.types.Object, explicit_name: str, roles: Dict[str, Optional[str]]
+) -> Optional[bpy.types.PoseBone]:
     pbs = armature.pose.bones
     if explicit_name:
         return pbs.get(explicit_name)
-    for token in ("root", "hips", "pelvis", "mixamorig:hips"):
-        for pb in pbs:
-            if token in pb.name.lower():
-                return pb
-    return None
-
-
-def sample_root_xy_drift(root_bone: bpy.types.PoseBone, frame_start: int, frame_end: int) -> float:
-    scene = bpy.context.scene
-    scene.frame_set(frame_start)
-    x0 = root_bone.location.x
-    y0 = root_bone.location.y
-    max_dist = 0.0
-    for frame in range(frame_start + 1, frame_end + 1):
-        scene.frame_set(frame)
-        dx = root_bone.location.x - x0
-        dy = root_bone.location.y - y0
-        dist = (dx * dx + dy * dy) ** 0.5
-        max_dist = max(max_dist, dist)
-    return max_dist
-
-
-def validate_markers(expected: Tuple[str, ...]) -> List[str]:
-    issues: List[str] = []
-    markers = bpy.context.scene.timeline_markers
-    for name in expected:
-        if markers.get(name) is None:
-            issues.append(f"Missing marker '{name}'")
-    return issues
-
-
-def iter_action_fcurves(action: bpy.types.Action):
-    if hasattr(action, "fcurves"):
-        for fcurve in action.fcurves:
-            yield fcurve
-        return
-    for layer in getattr(action, "layers", []):
-        for strip in getattr(layer, "strips", []):
-            for channel_bag in getattr(strip, "channelbags", []):
-                for fcurve in getattr(channel_bag, "fcurves", []):
-                    yield fcurve
+    # Same rig profile as bs_death_pipeline, so both scripts always agree on the root bone.
+    return profile_pose_bone(armature, roles, "root")
 
 
 def main() -> int:
@@ -93,31 +77,17 @@ def main() -> int:
     elif arm.animation_data:
         action = arm.animation_data.action
 
-    issues: List[str] = []
-    duration = (args.end_frame - args.start_frame) / float(args.fps)
-    if duration < args.min_duration_sec or duration > args.max_duration_sec:
-        issues.append(
-            f"Duration {duration:.3f}s outside recommended "
-            f"[{args.min_duration_sec:.3f}, {args.max_duration_sec:.3f}]."
-        )
-
-    if action is None:
-        issues.append("No active action found.")
-    elif sum(1 for _ in iter_action_fcurves(action)) == 0:
-        issues.append("Action has no fcurves.")
-
-    issues.extend(validate_markers(("impact", "collapse", "limp")))
-
-    root = find_root_bone(arm, args.root_bone)
-    if root is None:
-        issues.append("No root bone for drift check.")
-    else:
-        drift = sample_root_xy_drift(root, args.start_frame, args.end_frame)
-        log(f"Root XY drift: {drift:.5f}")
-        if drift > args.drift_threshold:
-            issues.append(
-                f"Root XY drift {drift:.5f} exceeds threshold {args.drift_threshold:.5f}."
-            )
+    profile_dir = os.path.abspath(args.rig_profile_dir) if args.rig_profile_dir else ""
+    roles = load_rig_profile(arm, profile_dir)
+    root = find_root_bone(arm, args.root_bone, roles)
+
+    ctx = ValidationContext(arm, action, root, args.start_frame, args.end_frame, args.fps, roles)
+    report = run_rules(rules_from_args(args), ctx, os.path.abspath(args.pose_cache) if args.pose_cache else "")
+    for line in report.summary_lines():
+        log(line)
+    if args.validation_report:
+        report.write_json(os.path.abspath(args.validation_report))
+    issues = report.issues
 
     scene.frame_set(args.start_frame)
     if issues:
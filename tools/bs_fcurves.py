@@ -0,0 +1,342 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import bpy
+import numpy as np
+
+
+def iter_action_fcurves(action: bpy.types.Action):
+    if hasattr(action, "fcurves"):
+        for fcurve in action.fcurves:
+            yield fcurve
+        return
+
+    # Blender 5 layered action API.
+    for layer in getattr(action, "layers", []):
+        for strip in getattr(layer, "strips", []):
+            for channel_bag in getattr(strip, "channelbags", []):
+                for fcurve in getattr(channel_bag, "fcurves", []):
+                    yield fcurve
+
+
+def pose_bone_data_path(bone_name: str, prop: str) -> str:
+    return f'pose.bones["{bpy.utils.escape_identifier(bone_name)}"].{prop}'
+
+
+def find_fcurves(action: bpy.types.Action, data_path: str) -> Dict[int, bpy.types.FCurve]:
+    return {fc.array_index: fc for fc in iter_action_fcurves(action) if fc.data_path == data_path}
+
+
+def ensure_fcurve(
+    action: bpy.types.Action, datablock: bpy.types.ID, data_path: str, index: int, group_name: str
+) -> bpy.types.FCurve:
+    if hasattr(action, "fcurve_ensure_for_datablock"):
+        # Layered actions (Blender 4.4+/5): creates the slot channelbag for the datablock as needed.
+        return action.fcurve_ensure_for_datablock(datablock, data_path, index=index, group_name=group_name)
+    fcurve = action.fcurves.find(data_path, index=index)
+    if fcurve is None:
+        fcurve = action.fcurves.new(data_path, index=index, action_group=group_name)
+    return fcurve
+
+
+def write_keyframes(fcurve: bpy.types.FCurve, frames: np.ndarray, values: np.ndarray) -> None:
+    """Insert or overwrite keys at ``frames`` with one ``keyframe_points.add`` and one ``foreach_set``.
+
+    Keys already on the curve at other frames are kept untouched, including their interpolation and handles.
+    """
+    points = fcurve.keyframe_points
+    co = np.empty(len(points) * 2, dtype=np.float32)
+    points.foreach_get("co", co)
+    co = co.reshape(-1, 2)
+
+    frames = np.asarray(frames, dtype=np.float32)
+    values = np.asarray(values, dtype=np.float32)
+    existing_index = {float(x): i for i, x in enumerate(co[:, 0])}
+    new_rows = []
+    for frame, value in zip(frames.tolist(), values.tolist()):
+        row = existing_index.get(frame)
+        if row is None:
+            new_rows.append((frame, value))
+        else:
+            co[row, 1] = value
+
+    if new_rows:
+        points.add(len(new_rows))
+        co = np.concatenate((co, np.array(new_rows, dtype=np.float32)))
+    points.foreach_set("co", co.ravel())
+    fcurve.update()
+
+
+class PoseKeyBuffer:
+    """Gathers pose-bone channel values per frame and writes them to the active action in bulk.
+
+    Whole-pose captures read every bone with a single ``foreach_get``; ``flush`` then writes each
+    F-curve with ``write_keyframes`` instead of one ``keyframe_insert`` per bone, channel and frame.
+    """
+
+    def __init__(self, armature_obj: bpy.types.Object):
+        self.armature_obj = armature_obj
+        self._channels: Dict[Tuple[str, str], Dict[float, np.ndarray]] = {}
+
+    def capture_pose(self, prop: str, frame: float) -> None:
+        pose_bones = self.armature_obj.pose.bones
+        if len(pose_bones) == 0:
+            return
+        size = len(getattr(pose_bones[0], prop))
+        values = np.empty(len(pose_bones) * size, dtype=np.float32)
+        pose_bones.foreach_get(prop, values)
+        values = values.reshape(-1, size)
+        for pb, row in zip(pose_bones, values):
+            self._channels.setdefault((pb.name, prop), {})[float(frame)] = row
+
+    def capture_bone(self, pose_bone: bpy.types.PoseBone, prop: str, frame: float, value=None) -> None:
+        row = np.array(getattr(pose_bone, prop) if value is None else value, dtype=np.float32)
+        self._channels.setdefault((pose_bone.name, prop), {})[float(frame)] = row
+
+    def flush(self) -> List[bpy.types.FCurve]:
+        """Write buffered keys to the armature's active action and return the F-curves that were touched."""
+        obj = self.armature_obj
+        if obj.animation_data is None or obj.animation_data.action is None:
+            raise RuntimeError(f"Armature '{obj.name}' has no active action to key.")
+        action = obj.animation_data.action
+
+        touched: List[bpy.types.FCurve] = []
+        for (bone_name, prop), frame_values in self._channels.items():
+            frames = np.array(sorted(frame_values), dtype=np.float32)
+            values = np.stack([frame_values[f] for f in frames.tolist()])
+            data_path = pose_bone_data_path(bone_name, prop)
+            for index in range(values.shape[1]):
+                fcurve = ensure_fcurve(action, obj, data_path, index, bone_name)
+                write_keyframes(fcurve, frames, values[:, index])
+                touched.append(fcurve)
+        self._channels.clear()
+        return touched
+
+
+def keyframe_enum_value(prop: str, identifier: str) -> int:
+    """Integer value of a Keyframe enum item, as used by ``foreach_get``/``foreach_set``."""
+    return bpy.types.Keyframe.bl_rna.properties[prop].enum_items[identifier].value
+
+
+def set_keyframe_defaults(
+    fcurves: Iterable[bpy.types.FCurve],
+    interpolation: str = "BEZIER",
+    handle_type: str = "AUTO_CLAMPED",
+    frame_range: Optional[Tuple[float, float]] = None,
+) -> int:
+    """Set interpolation and both handle types with one ``foreach_set`` per property per F-curve.
+
+    ``frame_range`` (inclusive) limits the change to keys inside it; keys outside keep their settings.
+    Returns the number of keys changed.
+    """
+    interpolation_value = keyframe_enum_value("interpolation", interpolation)
+    handle_value = keyframe_enum_value("handle_left_type", handle_type)
+    changed = 0
+    for fcurve in fcurves:
+        points = fcurve.keyframe_points
+        count = len(points)
+        if count == 0:
+            continue
+
+        if frame_range is None:
+            mask = None
+        else:
+            co = np.empty(count * 2, dtype=np.float32)
+            points.foreach_get("co", co)
+            frames = co[0::2]
+            mask = (frames >= frame_range[0]) & (frames <= frame_range[1])
+            if not mask.any():
+                continue
+
+        for prop, value in (
+            ("interpolation", interpolation_value),
+            ("handle_left_type", handle_value),
+            ("handle_right_type", handle_value),
+        ):
+            if mask is None:
+                values = np.full(count, value, dtype=np.int32)
+            else:
+                values = np.empty(count, dtype=np.int32)
+                points.foreach_get(prop, values)
+                values[mask] = value
+            points.foreach_set(prop, values)
+
+        fcurve.update()
+        changed += count if mask is None else int(mask.sum())
+    return changed
+
+
+def evaluate_fcurve_range(fcurve: bpy.types.FCurve, frame_start: int, frame_end: int) -> np.ndarray:
+    return evaluate_fcurve_frames(fcurve, np.arange(frame_start, frame_end + 1))
+
+
+def evaluate_fcurve_frames(fcurve: bpy.types.FCurve, frames: np.ndarray) -> np.ndarray:
+    """Evaluate at arbitrary (also fractional) frames without touching the scene."""
+    return np.fromiter((fcurve.evaluate(float(f)) for f in frames), dtype=np.float64, count=len(frames))
+
+
+def resample_action(
+    action: bpy.types.Action,
+    datablock: bpy.types.ID,
+    name: str,
+    frame_start: int,
+    frame_end: int,
+    source_fps: float,
+    target_fps: float,
+) -> Tuple[bpy.types.Action, int]:
+    """Copy ``action`` as ``name`` with one linear key per frame at ``target_fps``.
+
+    Frame ``frame_start`` stays put; target frame ``k`` samples the source at the same time in seconds.
+    Returns the new action and its end frame.
+    """
+    count = int(round((frame_end - frame_start) * target_fps / source_fps))
+    target_frames = frame_start + np.arange(count + 1)
+    source_frames = np.minimum(frame_start + np.arange(count + 1) * (source_fps / target_fps), frame_end)
+
+    existing = bpy.data.actions.get(name)
+    if existing is not None:
+        bpy.data.actions.remove(existing)
+    resampled = bpy.data.actions.new(name=name)
+    curves = []
+    # Layered actions only create channelbags for the datablock they are assigned to.
+    anim_data = datablock.animation_data_create()
+    original = anim_data.action
+    anim_data.action = resampled
+    try:
+        for fcurve in iter_action_fcurves(action):
+            group_name = fcurve.group.name if fcurve.group else ""
+            target = ensure_fcurve(resampled, datablock, fcurve.data_path, fcurve.array_index, group_name)
+            write_keyframes(target, target_frames, evaluate_fcurve_frames(fcurve, source_frames))
+            curves.append(target)
+    finally:
+        anim_data.action = original
+    set_keyframe_defaults(curves, interpolation="LINEAR")
+    return resampled, frame_start + count
+
+
+def direct_evaluation_blockers(obj: bpy.types.Object, data_path: str) -> List[str]:
+    """Reasons the active action's F-curves alone do not reproduce ``data_path`` at evaluation time.
+
+    Constraints are not listed: they change the evaluated bone matrix, not the local channel values.
+    """
+    anim = obj.animation_data
+    if anim is None or anim.action is None:
+        return ["no active action"]
+
+    blockers: List[str] = []
+    if any(d.data_path == data_path and not d.mute for d in anim.drivers):
+        blockers.append("driver")
+    if any(not track.mute for track in anim.nla_tracks):
+        blockers.append("NLA tracks")
+    if anim.action_influence < 1.0 or anim.action_blend_type != "REPLACE":
+        blockers.append("action blending")
+    if any(fc.mute for fc in find_fcurves(anim.action, data_path).values()):
+        blockers.append("muted F-curve")
+    return blockers
+
+
+def sample_pose_bone_property(
+    pose_bone: bpy.types.PoseBone, prop: str, frame_start: int, frame_end: int
+) -> np.ndarray:
+    """Sample a pose bone vector property (e.g. ``location``) over a frame range as a (frames, size) array.
+
+    Evaluates the action F-curves directly; channels without a curve hold their current value.
+    Falls back to ``scene.frame_set`` per frame only when drivers, NLA or blending would make that wrong.
+    """
+    obj = pose_bone.id_data
+    data_path = pose_bone_data_path(pose_bone.name, prop)
+    static_value = np.array(getattr(pose_bone, prop), dtype=np.float64)
+    frame_count = frame_end - frame_start + 1
+
+    if not direct_evaluation_blockers(obj, data_path):
+        fcurves = find_fcurves(obj.animation_data.action, data_path)
+        samples = np.tile(static_value, (frame_count, 1))
+        for index, fcurve in fcurves.items():
+            if index < samples.shape[1]:
+                samples[:, index] = evaluate_fcurve_range(fcurve, frame_start, frame_end)
+        return samples
+
+    scene = bpy.context.scene
+    samples = np.empty((frame_count, static_value.size), dtype=np.float64)
+    for row, frame in enumerate(range(frame_start, frame_end + 1)):
+        scene.frame_set(frame)
+        samples[row] = getattr(pose_bone, prop)
+    return samples
+
+
+# Object-level channels that move the whole armature; keyed in the same action they animate matrix_world.
+OBJECT_TRANSFORM_PROPS = frozenset(
+    prefix + prop
+    for prefix in ("", "delta_")
+    for prop in ("location", "rotation_euler", "rotation_quaternion", "rotation_axis_angle", "scale")
+)
+
+
+def pose_evaluation_blockers(armature_obj: bpy.types.Object) -> List[str]:
+    """Reasons the action's bone F-curves plus rest-pose forward kinematics do not reproduce the evaluated pose.
+
+    Empty when only the active action moves the bones, so ``evaluate_pose_channels`` can replace a scene sweep.
+    """
+    blockers: List[str] = []
+    anim = armature_obj.animation_data
+    if anim is not None:
+        if any(not d.mute for d in anim.drivers):
+            blockers.append("drivers")
+        if any(not track.mute for track in anim.nla_tracks):
+            blockers.append("NLA tracks")
+        if anim.action_influence < 1.0 or anim.action_blend_type != "REPLACE":
+            blockers.append("action blending")
+        if anim.action is not None and any(
+            fc.data_path in OBJECT_TRANSFORM_PROPS and not fc.mute for fc in iter_action_fcurves(anim.action)
+        ):
+            blockers.append("object transform animation")
+    if armature_obj.parent is not None or any(c.enabled for c in armature_obj.constraints):
+        blockers.append("object parent or constraints")
+    if armature_obj.data.pose_position != "POSE":
+        blockers.append("rest position")
+    if any(c.enabled and c.influence > 0.0 for pb in armature_obj.pose.bones for c in pb.constraints):
+        blockers.append("bone constraints")
+    if any(
+        not bone.use_inherit_rotation or bone.inherit_scale != "FULL" or not bone.use_local_location
+        for bone in armature_obj.data.bones
+    ):
+        blockers.append("bone inheritance")
+    return blockers
+
+
+def evaluate_pose_channels(
+    armature_obj: bpy.types.Object, props: Iterable[str], frame_start: int, frame_end: int
+) -> Dict[str, np.ndarray]:
+    """(frames, bones, n) local values of each pose bone channel in ``props``, read off the active action.
+
+    Every F-curve is evaluated over the range without touching the scene; unkeyed channels hold their
+    current value.
+    """
+    pose_bones = armature_obj.pose.bones
+    frames = np.arange(frame_start, frame_end + 1)
+    channels: Dict[str, np.ndarray] = {}
+    targets: Dict[str, Tuple[str, int]] = {}
+    for prop in props:
+        size = bpy.types.PoseBone.bl_rna.properties[prop].array_length
+        current = np.empty(len(pose_bones) * size, dtype=np.float32)
+        pose_bones.foreach_get(prop, current)
+        channels[prop] = np.tile(current.reshape(1, -1, size), (len(frames), 1, 1))
+        for column, pb in enumerate(pose_bones):
+            targets[pose_bone_data_path(pb.name, prop)] = (prop, column)
+
+    anim = armature_obj.animation_data
+    if anim is not None and anim.action is not None:
+        for fcurve in iter_action_fcurves(anim.action):
+            target = targets.get(fcurve.data_path)
+            if target is None or fcurve.mute:
+                continue
+            prop, column = target
+            if fcurve.array_index < channels[prop].shape[2]:
+                channels[prop][:, column, fcurve.array_index] = evaluate_fcurve_frames(fcurve, frames)
+    return channels
+
+
+def max_xy_drift(locations: np.ndarray) -> float:
+    if len(locations) < 2:
+        return 0.0
+    delta = locations[1:, :2] - locations[0, :2]
+    return float(np.max(np.hypot(delta[:, 0], delta[:, 1])))
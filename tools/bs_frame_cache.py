@@ -0,0 +1,143 @@
+"""Per-clip preview frame cache keyed by evaluated pose and camera.
+
+Every frame is stored as ``<hash>.png``, where the hash covers that frame's sampled pose and a settings key
+(camera projection, resolution, render mode, mesh data). A re-render only draws frames whose hash has no
+image yet; ``frames.json`` records the last frame -> hash mapping, and images no frame uses any more are
+pruned so the folder stays the size of one clip.
+
+Images are written to a per-process temp name and renamed into place, so a reader never sees a partial PNG.
+``framing.json`` pins the bounds the camera is framed on, so small pose edits do not move the camera (and
+with it every frame's key).
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+
+from bs_pose_cache import PoseSamples
+
+FRAME_CACHE_VERSION = 2
+MANIFEST_NAME = "frames.json"
+FRAMING_NAME = "framing.json"
+# Pinned framing bounds are padded by this fraction of the clip's largest extent on every side.
+FRAMING_PADDING = 0.1
+# Temp images older than this are left over from a crashed render and get pruned.
+STALE_TEMP_SEC = 3600.0
+
+
+def temp_path(path: str) -> str:
+    """Per-process temp name beside ``path``; write there, then ``os.replace`` it onto ``path``."""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{os.getpid()}.tmp{ext}"
+
+
+def write_json_atomic(path: str, data: object) -> None:
+    temp = temp_path(path)
+    with open(temp, "w", encoding="utf-8") as handle:
+        json.dump(data, handle, indent=2)
+    os.replace(temp, path)
+
+
+def settings_key(*parts: object) -> str:
+    """Hash of everything frame-independent that changes how a frame looks."""
+    hasher = hashlib.sha256(f"frame_cache:{FRAME_CACHE_VERSION}\n".encode("utf-8"))
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            hasher.update(np.ascontiguousarray(part, dtype=np.float32).tobytes())
+        else:
+            hasher.update(repr(part).encode("utf-8"))
+        hasher.update(b"\n")
+    return hasher.hexdigest()
+
+
+def frame_hashes(samples: PoseSamples, key: str) -> Dict[int, str]:
+    """frame -> hash of the evaluated pose at that frame, salted with ``key``.
+
+    World-space heads and tails carry constraints, IK and drivers; the local rotation channels add bone
+    roll, which moves the skinned mesh without moving a head or tail.
+    """
+    pose = (samples.heads, samples.tails, samples.channels["rotation_quaternion"], samples.channels["rotation_euler"])
+    hashes: Dict[int, str] = {}
+    for row, frame in enumerate(samples.frames.tolist()):
+        hasher = hashlib.sha256(key.encode("utf-8"))
+        hasher.update("\n".join(samples.bone_names).encode("utf-8"))
+        for values in pose:
+            hasher.update(np.ascontiguousarray(values[row], dtype=np.float32).tobytes())
+        hashes[frame] = hasher.hexdigest()
+    return hashes
+
+
+class FrameCache:
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path(self, frame_hash: str) -> str:
+        return os.path.join(self.cache_dir, frame_hash + ".png")
+
+    def has(self, frame_hash: str) -> bool:
+        return os.path.isfile(self.path(frame_hash))
+
+    def missing(self, hashes: Dict[int, str]) -> Dict[int, str]:
+        """Frames that need drawing; frames sharing a hash are drawn once."""
+        todo: Dict[int, str] = {}
+        for frame, frame_hash in hashes.items():
+            if not self.has(frame_hash) and frame_hash not in todo.values():
+                todo[frame] = frame_hash
+        return todo
+
+    def pinned_bounds(self, min_b: np.ndarray, max_b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Bounds to frame the camera on for a clip spanning ``min_b``..``max_b``.
+
+        The stored bounds are kept while they still contain the clip and are not much larger than it;
+        otherwise the clip's bounds plus ``FRAMING_PADDING`` are stored and returned.
+        """
+        min_b = np.asarray(min_b, dtype=np.float64)
+        max_b = np.asarray(max_b, dtype=np.float64)
+        extent = max(float((max_b - min_b).max()), 1e-6)
+        framing_path = os.path.join(self.cache_dir, FRAMING_NAME)
+        if os.path.isfile(framing_path):
+            with open(framing_path, "r", encoding="utf-8") as handle:
+                stored = json.load(handle)
+            if stored.get("version") == FRAME_CACHE_VERSION:
+                pinned_min = np.array(stored["min"], dtype=np.float64)
+                pinned_max = np.array(stored["max"], dtype=np.float64)
+                fits = bool(np.all(pinned_min <= min_b) and np.all(pinned_max >= max_b))
+                if fits and float((pinned_max - pinned_min).max()) <= extent * (1.0 + 4.0 * FRAMING_PADDING):
+                    return pinned_min, pinned_max
+        pad = extent * FRAMING_PADDING
+        pinned_min, pinned_max = min_b - pad, max_b + pad
+        write_json_atomic(
+            framing_path, {"version": FRAME_CACHE_VERSION, "min": pinned_min.tolist(), "max": pinned_max.tolist()}
+        )
+        return pinned_min, pinned_max
+
+    def commit(self, hashes: Dict[int, str]) -> int:
+        """Record ``hashes`` as the clip's frames and delete images no frame uses. Returns the pruned count."""
+        write_json_atomic(
+            os.path.join(self.cache_dir, MANIFEST_NAME), {"version": FRAME_CACHE_VERSION, "frames": hashes}
+        )
+        return self.prune(hashes.values())
+
+    def prune(self, keep: Iterable[str]) -> int:
+        keep_names = {frame_hash + ".png" for frame_hash in keep}
+        stale_before = time.time() - STALE_TEMP_SEC
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if not name.endswith(".png") or name in keep_names:
+                continue
+            try:
+                # Temp images may belong to a chunk worker still rendering; only crash leftovers go.
+                if ".tmp." in name and os.path.getmtime(path) > stale_before:
+                    continue
+                os.remove(path)
+            except FileNotFoundError:
+                # Renamed or pruned by a parallel chunk worker in the meantime.
+                continue
+            removed += 1
+        return removed
@@ -0,0 +1,100 @@
+"""Bulk scene reads for the inspection scripts and their JSON reports.
+
+Vertex and bone positions come out of Blender with one ``foreach_get`` per object into NumPy arrays,
+so centres and bounds of a full-resolution character cost a few array ops instead of a Python loop
+over every vertex.
+"""
+
+import json
+import os
+from typing import Dict, List, Optional
+
+import bpy
+import numpy as np
+
+
+def transform_points(points: np.ndarray, matrix) -> np.ndarray:
+    """Transform (n, 3) points by one 4x4 matrix."""
+    m = np.array(matrix, dtype=np.float64)
+    return points @ m[:3, :3].T + m[:3, 3]
+
+
+def mesh_world_points(obj: bpy.types.Object) -> np.ndarray:
+    """(n, 3) world-space vertex positions of a mesh object's own (unevaluated) mesh."""
+    vertices = obj.data.vertices
+    co = np.empty(len(vertices) * 3, dtype=np.float32)
+    vertices.foreach_get("co", co)
+    return transform_points(co.reshape(-1, 3).astype(np.float64), obj.matrix_world)
+
+
+def armature_world_points(obj: bpy.types.Object) -> np.ndarray:
+    """(2 * bones, 3) world-space pose bone heads and tails at the current frame."""
+    pose_bones = obj.pose.bones
+    heads = np.empty(len(pose_bones) * 3, dtype=np.float32)
+    tails = np.empty(len(pose_bones) * 3, dtype=np.float32)
+    pose_bones.foreach_get("head", heads)
+    pose_bones.foreach_get("tail", tails)
+    points = np.concatenate((heads, tails)).reshape(-1, 3).astype(np.float64)
+    return transform_points(points, obj.matrix_world)
+
+
+def object_points(obj: bpy.types.Object) -> Optional[np.ndarray]:
+    if obj.type == "MESH" and obj.data and len(obj.data.vertices) > 0:
+        return mesh_world_points(obj)
+    if obj.type == "ARMATURE" and obj.pose and len(obj.pose.bones) > 0:
+        return armature_world_points(obj)
+    return None
+
+
+def bounds_dict(points: np.ndarray) -> Dict[str, List[float]]:
+    """Centre (mean of the points) and axis-aligned min/max of (n, 3) points."""
+    points = np.asarray(points, dtype=np.float64)
+    return {
+        "center": points.mean(axis=0).round(6).tolist(),
+        "min": points.min(axis=0).round(6).tolist(),
+        "max": points.max(axis=0).round(6).tolist(),
+    }
+
+
+def object_report(obj: bpy.types.Object) -> Dict[str, object]:
+    """Name, type, visibility, transform, and centre/bounds from vertices or bones (origin otherwise)."""
+    report: Dict[str, object] = {
+        "name": obj.name,
+        "type": obj.type,
+        "hide_render": obj.hide_render,
+        "hide_viewport": obj.hide_viewport,
+        "location": [round(v, 6) for v in obj.location],
+        "scale": [round(v, 6) for v in obj.scale],
+    }
+    points = object_points(obj)
+    if points is None:
+        report["center"] = [round(v, 6) for v in obj.matrix_world.translation]
+    else:
+        report.update(bounds_dict(points))
+        report["point_count"] = len(points)
+    return report
+
+
+def scene_report(scene: bpy.types.Scene) -> Dict[str, object]:
+    return {
+        "name": scene.name,
+        "frame_start": scene.frame_start,
+        "frame_end": scene.frame_end,
+        "fps": scene.render.fps,
+        "fps_base": scene.render.fps_base,
+        "resolution": [scene.render.resolution_x, scene.render.resolution_y],
+        "engine": scene.render.engine,
+        "camera": scene.camera.name if scene.camera else None,
+        "markers": {m.name: m.frame for m in scene.timeline_markers},
+    }
+
+
+def write_json_report(report: Dict[str, object], path: str) -> None:
+    """Write ``report`` to the file ``path``; stdout also carries Blender's own log, so it is never used."""
+    path = os.path.abspath(path)
+    output_dir = os.path.dirname(path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"JSON_REPORT={path}")
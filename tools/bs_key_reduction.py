@@ -0,0 +1,208 @@
+"""Error-bounded keyframe reduction for the FBX exporter's baked animation curves.
+
+The stock exporter samples every frame and only drops plateaus. ``fbx_key_reduction`` wraps its
+per-curve-node ``simplify`` step and keeps the fewest frames for which interpolating between kept
+keys stays inside a per-channel tolerance: distance for translation, angle for rotation. It can also
+drop every key of chosen bones (bone-LOD profiles), leaving them at their exported transform.
+"""
+
+from contextlib import contextmanager
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from bs_rotations import euler_to_quaternions, quaternion_angles_deg
+
+# FBX curve node group name -> tolerance key.
+CHANNEL_GROUPS: Dict[str, str] = {
+    "Lcl Translation": "location",
+    "Lcl Rotation": "rotation",
+    "Lcl Scaling": "scale",
+}
+
+# Private exporter internals the simplify hook reads and writes.
+NODE_ATTRIBUTES = ("fbx_group", "elem_keys", "_frame_times_array", "_frame_values_array", "_frame_write_mask_array")
+
+
+class KeyTolerances:
+    def __init__(self, location: float, rotation_deg: float, scale: float):
+        self.location = location
+        self.rotation_deg = rotation_deg
+        self.scale = scale
+
+
+class ReductionStats:
+    def __init__(self):
+        self.keys_before: Dict[str, int] = {name: 0 for name in CHANNEL_GROUPS.values()}
+        self.keys_after: Dict[str, int] = {name: 0 for name in CHANNEL_GROUPS.values()}
+        # Transform curve nodes seen by the exporter, and how many of them write any keys at all.
+        self.nodes_total: Dict[str, int] = {name: 0 for name in CHANNEL_GROUPS.values()}
+        self.nodes_keyed: Dict[str, int] = {name: 0 for name in CHANNEL_GROUPS.values()}
+        self.nodes_dropped: Dict[str, int] = {name: 0 for name in CHANNEL_GROUPS.values()}
+
+    @property
+    def total_before(self) -> int:
+        return sum(self.keys_before.values())
+
+    @property
+    def total_after(self) -> int:
+        return sum(self.keys_after.values())
+
+    def summary(self) -> str:
+        channels = ", ".join(
+            f"{name} {self.keys_before[name]}->{self.keys_after[name]}" for name in self.keys_before
+        )
+        return f"{self.total_before} -> {self.total_after} keys ({channels})"
+
+    def keyed_summary(self) -> str:
+        channels = ", ".join(
+            f"{name} {self.nodes_keyed[name]}/{self.nodes_total[name]}" for name in self.nodes_total
+        )
+        return f"{sum(self.nodes_keyed.values())}/{sum(self.nodes_total.values())} channels keyed ({channels})"
+
+    def dropped_summary(self) -> str:
+        channels = ", ".join(f"{name} {count}" for name, count in self.nodes_dropped.items())
+        return f"{sum(self.nodes_dropped.values())} animated channels dropped ({channels})"
+
+
+def reduce_frames(count: int, tolerance: float, segment_error: Callable[[int, int], np.ndarray]) -> np.ndarray:
+    """Douglas-Peucker over frame indices. ``segment_error(i, j)`` returns the error of frames i+1..j-1
+    when interpolated between keys i and j. Returns a keep mask with both ends kept."""
+    keep = np.zeros(count, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        errors = segment_error(first, last)
+        worst = int(np.argmax(errors))
+        if errors[worst] > tolerance:
+            split = first + 1 + worst
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return keep
+
+
+def interpolate(values: np.ndarray, times: np.ndarray, first: int, last: int) -> np.ndarray:
+    """(components, frames) linear interpolation of ``values`` between columns first and last."""
+    weights = (times[first + 1 : last] - times[first]) / float(times[last] - times[first])
+    return values[:, first, None] + (values[:, last] - values[:, first])[:, None] * weights
+
+
+def channel_keep_mask(channel: str, values: np.ndarray, times: np.ndarray, tolerances: KeyTolerances) -> np.ndarray:
+    count = values.shape[1]
+    if channel == "rotation":
+        # FBX rotations are XYZ euler degrees; compare orientations, not components.
+        quats = euler_to_quaternions(np.radians(values.T), "XYZ")
+
+        def segment_error(first: int, last: int) -> np.ndarray:
+            approx = euler_to_quaternions(np.radians(interpolate(values, times, first, last).T), "XYZ")
+            return quaternion_angles_deg(approx, quats[first + 1 : last])
+
+        return reduce_frames(count, tolerances.rotation_deg, segment_error)
+
+    if channel == "location":
+        # With FBX_SCALE_ALL the unit scale lives in the FBX header, so translations are Blender units.
+        def segment_error(first: int, last: int) -> np.ndarray:
+            delta = interpolate(values, times, first, last) - values[:, first + 1 : last]
+            return np.linalg.norm(delta, axis=0)
+
+        return reduce_frames(count, tolerances.location, segment_error)
+
+    def segment_error(first: int, last: int) -> np.ndarray:
+        return np.abs(interpolate(values, times, first, last) - values[:, first + 1 : last]).max(axis=0)
+
+    return reduce_frames(count, tolerances.scale, segment_error)
+
+
+def baked_key_count(node) -> int:
+    """Keys the exporter baked for ``node``; call before ``simplify`` clears its write mask."""
+    masks = node._frame_write_mask_array  # pylint: disable=protected-access
+    return 0 if masks is None else int(masks.sum())
+
+
+def reduce_curve_node(
+    node,
+    tolerances: Optional[KeyTolerances],
+    stats: ReductionStats,
+    dropped: FrozenSet[str] = frozenset(),
+    baked_keys: int = 0,
+) -> None:
+    """Replace the write mask of a transform curve node's keyed curves with an error-bounded one.
+
+    Nodes of elements in ``dropped`` lose all keys. ``baked_keys`` is the node's key count before the
+    exporter's own simplification (see ``baked_key_count``).
+    """
+    channel = CHANNEL_GROUPS.get(node.fbx_group[0])
+    masks = node._frame_write_mask_array  # pylint: disable=protected-access
+    if channel is None or masks is None:
+        return
+    keyed = masks.any(axis=1)
+    stats.nodes_total[channel] += 1
+    stats.keys_before[channel] += baked_keys
+    if not keyed.any():
+        return
+    if node.elem_keys[0] in dropped:
+        masks[:] = False
+        stats.nodes_dropped[channel] += 1
+        return
+    stats.nodes_keyed[channel] += 1
+    if tolerances is None or masks.shape[1] < 3:
+        stats.keys_after[channel] += int(masks[keyed].sum())
+        return
+    values = node._frame_values_array.astype(np.float64)  # pylint: disable=protected-access
+    times = node._frame_times_array.astype(np.float64)  # pylint: disable=protected-access
+    keep = channel_keep_mask(channel, values, times, tolerances)
+    masks[keyed] = keep
+    stats.keys_after[channel] += int(masks[keyed].sum())
+
+
+def fbx_bone_keys(armature_obj, bone_names: Iterable[str]) -> FrozenSet[str]:
+    """The exporter's element keys for ``bone_names``, as seen in ``node.elem_keys``."""
+    from io_scene_fbx import fbx_utils
+
+    bones = armature_obj.data.bones
+    return frozenset(fbx_utils.get_blenderID_key((armature_obj, bones[name])) for name in bone_names)
+
+
+def missing_exporter_hooks() -> List[str]:
+    """Names of the FBX exporter internals used by ``fbx_key_reduction``/``fbx_bone_keys`` that are missing."""
+    from io_scene_fbx import fbx_utils
+
+    missing = [name for name in ("AnimationCurveNodeWrapper", "get_blenderID_key") if not hasattr(fbx_utils, name)]
+    wrapper = getattr(fbx_utils, "AnimationCurveNodeWrapper", None)
+    if wrapper is not None:
+        slots = set(getattr(wrapper, "__slots__", ()))
+        missing += [f"AnimationCurveNodeWrapper.{name}" for name in NODE_ATTRIBUTES if name not in slots]
+        if not callable(getattr(wrapper, "simplify", None)):
+            missing.append("AnimationCurveNodeWrapper.simplify")
+    return missing
+
+
+@contextmanager
+def fbx_key_reduction(
+    tolerances: Optional[KeyTolerances], dropped: FrozenSet[str] = frozenset()
+) -> Iterator[ReductionStats]:
+    """Apply error-bounded reduction to every FBX export run inside the block.
+
+    With ``tolerances`` None the exporter's keys are left as they are and only counted. ``dropped``
+    holds element keys (see ``fbx_bone_keys``) whose curves are not written at all.
+    """
+    from io_scene_fbx import fbx_utils
+
+    wrapper = fbx_utils.AnimationCurveNodeWrapper
+    original = wrapper.simplify
+    stats = ReductionStats()
+
+    def simplify(node, fac, step, force_keep=False):
+        baked_keys = baked_key_count(node)
+        original(node, fac, step, force_keep)
+        reduce_curve_node(node, tolerances, stats, dropped, baked_keys)
+
+    wrapper.simplify = simplify
+    try:
+        yield stats
+    finally:
+        wrapper.simplify = original
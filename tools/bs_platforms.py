@@ -0,0 +1,39 @@
+"""Per-platform export variants. Pure Python, shared by bs_death_pipeline.py and bs_death_batch.py.
+
+A spec such as ``nomad=30,pcvr=60`` names each variant and its sample rate. Variant files sit beside
+the clip's own outputs with the platform appended: ``exports/Death_A.fbx`` -> ``exports/Death_A_nomad.fbx``.
+"""
+
+import os
+import re
+from typing import List, Tuple
+
+VARIANT_NAME = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+def parse_platform_fps(spec: str) -> List[Tuple[str, int]]:
+    variants: List[Tuple[str, int]] = []
+    for item in (part.strip() for part in (spec or "").split(",")):
+        if not item:
+            continue
+        if "=" not in item:
+            raise RuntimeError(f"Platform variant '{item}' must be name=fps, e.g. nomad=30.")
+        name, fps_text = (value.strip() for value in item.split("=", 1))
+        if not VARIANT_NAME.match(name):
+            raise RuntimeError(f"Platform name '{name}' may only use letters, digits, '_' and '-'.")
+        try:
+            fps = int(fps_text)
+        except ValueError:
+            raise RuntimeError(f"Platform '{name}' fps '{fps_text}' is not an integer.") from None
+        if fps <= 0:
+            raise RuntimeError(f"Platform '{name}' fps must be positive.")
+        if name in (n for n, _ in variants):
+            raise RuntimeError(f"Platform '{name}' is listed twice.")
+        variants.append((name, fps))
+    return variants
+
+
+def variant_output_path(path: str, variant: str) -> str:
+    """Platform and bone-LOD outputs: ``exports/Death_A.fbx`` -> ``exports/Death_A_<variant>.fbx``."""
+    root, ext = os.path.splitext(path)
+    return f"{root}_{variant}{ext}"
@@ -0,0 +1,363 @@
+import hashlib
+import os
+from typing import Dict, List, Optional, Tuple
+
+import bpy
+import numpy as np
+
+from bs_fcurves import evaluate_pose_channels, iter_action_fcurves, pose_evaluation_blockers
+from bs_rotations import axis_angle_to_quaternions, euler_to_quaternions, quaternion_matrices
+
+CACHE_VERSION = 2
+
+# Local pose channels sampled for every bone, with their component counts.
+LOCAL_CHANNELS: Tuple[Tuple[str, int], ...] = (
+    ("location", 3),
+    ("rotation_quaternion", 4),
+    ("rotation_euler", 3),
+    ("scale", 3),
+)
+
+
+def log(message: str) -> None:
+    print(f"[bs_pose_cache] {message}", flush=True)
+
+
+def action_fingerprint(action: Optional[bpy.types.Action]) -> str:
+    """Hash of every key and handle in ``action``; changes whenever the authored animation does."""
+    hasher = hashlib.sha256()
+    if action is None:
+        return hasher.hexdigest()
+    hasher.update(action.name.encode("utf-8"))
+    for fcurve in iter_action_fcurves(action):
+        hasher.update(f"{fcurve.data_path}[{fcurve.array_index}]".encode("utf-8"))
+        points = fcurve.keyframe_points
+        for prop in ("co", "handle_left", "handle_right"):
+            values = np.empty(len(points) * 2, dtype=np.float32)
+            points.foreach_get(prop, values)
+            hasher.update(values.tobytes())
+        interpolation = np.empty(len(points), dtype=np.int32)
+        points.foreach_get("interpolation", interpolation)
+        hasher.update(interpolation.tobytes())
+    return hasher.hexdigest()
+
+
+def pose_fingerprint(armature_obj: bpy.types.Object) -> str:
+    """Hash of everything the sampled pose depends on, besides the frame range.
+
+    Covers the active action's keys, the rest pose (bone hierarchy, rest matrices, lengths, inheritance),
+    rotation modes, the object's world matrix, constraints, drivers and NLA tracks.
+    """
+    hasher = hashlib.sha256()
+    anim = armature_obj.animation_data
+    hasher.update(action_fingerprint(anim.action if anim else None).encode("utf-8"))
+
+    bones = armature_obj.data.bones
+    rest = np.empty(len(bones) * 16, dtype=np.float32)
+    bones.foreach_get("matrix_local", rest)
+    lengths = np.empty(len(bones), dtype=np.float32)
+    bones.foreach_get("length", lengths)
+    hasher.update(rest.tobytes())
+    hasher.update(lengths.tobytes())
+    # matrix_basis is current even before the depsgraph updates matrix_world.
+    hasher.update(np.array(armature_obj.matrix_basis, dtype=np.float32).tobytes())
+    hasher.update(np.array(armature_obj.matrix_world, dtype=np.float32).tobytes())
+
+    state = [armature_obj.data.pose_position, repr(armature_obj.parent.name if armature_obj.parent else None)]
+    for bone in bones:
+        state.append(
+            f"{bone.name}<{bone.parent.name if bone.parent else ''} connect={bone.use_connect} "
+            f"rot={bone.use_inherit_rotation} scale={bone.inherit_scale} local={bone.use_local_location}"
+        )
+    state.append("modes " + ",".join(pb.rotation_mode for pb in armature_obj.pose.bones))
+    owners = [("", armature_obj.constraints)] + [(pb.name, pb.constraints) for pb in armature_obj.pose.bones]
+    for owner, constraints in owners:
+        for c in constraints:
+            target = getattr(c, "target", None)
+            state.append(
+                f"constraint {owner}:{c.name} {c.type} enabled={c.enabled} influence={c.influence:.6g} "
+                f"target={target.name if target else ''}:{getattr(c, 'subtarget', '')}"
+            )
+    if anim is not None:
+        state.append(f"blend {anim.action_blend_type} {anim.action_influence:.6g}")
+        for driver in anim.drivers:
+            variables = ";".join(
+                f"{v.name}={t.id.name if t.id else ''}:{t.data_path}:{t.bone_target}:{t.transform_type}"
+                for v in driver.driver.variables
+                for t in v.targets
+            )
+            state.append(
+                f"driver {driver.data_path}[{driver.array_index}] mute={driver.mute} "
+                f"{driver.driver.type} {driver.driver.expression} {variables}"
+            )
+        for track in anim.nla_tracks:
+            strips = ";".join(
+                f"{action_fingerprint(st.action)}:{st.frame_start:.6g}-{st.frame_end:.6g}:{st.influence:.6g}"
+                f":{st.mute}:{st.blend_type}"
+                for st in track.strips
+            )
+            state.append(f"nla {track.name} mute={track.mute} {strips}")
+    hasher.update("\n".join(state).encode("utf-8"))
+    return hasher.hexdigest()
+
+
+class PoseSamples:
+    """Evaluated pose of one armature over a frame range, held in compact NumPy arrays.
+
+    ``channels[prop]`` is (frames, bones, n) local values; ``heads``/``tails`` are world-space
+    (frames, bones, 3) and ``matrices`` the armature object's world matrix per frame.
+    """
+
+    def __init__(
+        self,
+        armature_name: str,
+        fingerprint: str,
+        bone_names: List[str],
+        frames: np.ndarray,
+        channels: Dict[str, np.ndarray],
+        heads: np.ndarray,
+        tails: np.ndarray,
+        matrices: np.ndarray,
+    ):
+        self.armature_name = armature_name
+        self.fingerprint = fingerprint
+        self.bone_names = bone_names
+        self.frames = frames
+        self.channels = channels
+        self.heads = heads
+        self.tails = tails
+        self.matrices = matrices
+        self._bone_index = {name: i for i, name in enumerate(bone_names)}
+
+    @property
+    def frame_start(self) -> int:
+        return int(self.frames[0])
+
+    @property
+    def frame_end(self) -> int:
+        return int(self.frames[-1])
+
+    def bone_index(self, bone_name: str) -> int:
+        return self._bone_index[bone_name]
+
+    def has_bone(self, bone_name: str) -> bool:
+        return bone_name in self._bone_index
+
+    def frame_row(self, frame: int) -> int:
+        return int(np.clip(frame - self.frame_start, 0, len(self.frames) - 1))
+
+    def channel(self, prop: str, bone_name: str) -> np.ndarray:
+        """(frames, n) values of one bone's local channel."""
+        return self.channels[prop][:, self.bone_index(bone_name)]
+
+    def bounds(self, frame: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """World-space min/max over bone heads and tails, at one frame or over the whole range."""
+        if frame is None:
+            points = np.concatenate((self.heads, self.tails), axis=1).reshape(-1, 3)
+        else:
+            row = self.frame_row(frame)
+            points = np.concatenate((self.heads[row], self.tails[row]))
+        return points.min(axis=0), points.max(axis=0)
+
+    def matches(self, armature_obj: bpy.types.Object, frame_start: int, frame_end: int) -> bool:
+        return (
+            self.armature_name == armature_obj.name
+            and self.frame_start == frame_start
+            and self.frame_end == frame_end
+            and self.bone_names == [pb.name for pb in armature_obj.pose.bones]
+            and self.fingerprint == pose_fingerprint(armature_obj)
+        )
+
+    def save(self, path: str) -> None:
+        output_dir = os.path.dirname(path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        arrays = {f"channel_{prop}": values for prop, values in self.channels.items()}
+        temp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(
+            temp_path,
+            version=np.array(CACHE_VERSION),
+            armature_name=np.array(self.armature_name),
+            fingerprint=np.array(self.fingerprint),
+            bone_names=np.array(self.bone_names),
+            frames=self.frames,
+            heads=self.heads,
+            tails=self.tails,
+            matrices=self.matrices,
+            **arrays,
+        )
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["PoseSamples"]:
+        if not os.path.isfile(path):
+            return None
+        with np.load(path) as data:
+            if int(data["version"]) != CACHE_VERSION:
+                return None
+            channels = {prop: data[f"channel_{prop}"] for prop, _size in LOCAL_CHANNELS}
+            return cls(
+                armature_name=str(data["armature_name"]),
+                fingerprint=str(data["fingerprint"]),
+                bone_names=[str(n) for n in data["bone_names"]],
+                frames=data["frames"],
+                channels=channels,
+                heads=data["heads"],
+                tails=data["tails"],
+                matrices=data["matrices"],
+            )
+
+
+def to_world(points: np.ndarray, matrices: np.ndarray) -> np.ndarray:
+    """Transform (frames, bones, 3) armature-space points by per-frame (frames, 4, 4) matrices."""
+    return np.einsum("fij,fbj->fbi", matrices[:, :3, :3], points) + matrices[:, None, :3, 3]
+
+
+def basis_matrices(channels: Dict[str, np.ndarray], rotation_modes: List[str]) -> np.ndarray:
+    """(frames, bones, 4, 4) local pose matrices (location @ rotation @ scale) from sampled channels."""
+    frames, bones = channels["location"].shape[:2]
+    quats = np.array(channels["rotation_quaternion"], dtype=np.float64)
+    modes = np.array(rotation_modes)
+    for order in set(rotation_modes) - {"QUATERNION", "AXIS_ANGLE"}:
+        columns = modes == order
+        quats[:, columns] = euler_to_quaternions(channels["rotation_euler"][:, columns].astype(np.float64), order)
+    axis_angle = modes == "AXIS_ANGLE"
+    if axis_angle.any():
+        quats[:, axis_angle] = axis_angle_to_quaternions(channels["rotation_axis_angle"][:, axis_angle].astype(np.float64))
+
+    basis = np.zeros((frames, bones, 4, 4), dtype=np.float64)
+    basis[..., :3, :3] = quaternion_matrices(quats) * channels["scale"][:, :, None, :]
+    basis[..., :3, 3] = channels["location"]
+    basis[..., 3, 3] = 1.0
+    return basis
+
+
+def evaluate_pose(armature_obj: bpy.types.Object, frame_start: int, frame_end: int) -> PoseSamples:
+    """Pose from the action's F-curves and rest-pose forward kinematics, without stepping the scene.
+
+    Only valid when ``pose_evaluation_blockers`` finds nothing; ``sample_pose`` picks this or a sweep.
+    """
+    pose_bones = armature_obj.pose.bones
+    bone_names = [pb.name for pb in pose_bones]
+    frames = np.arange(frame_start, frame_end + 1, dtype=np.int32)
+    modes = [pb.rotation_mode for pb in pose_bones]
+    props = [prop for prop, _size in LOCAL_CHANNELS]
+    if "AXIS_ANGLE" in modes:
+        props.append("rotation_axis_angle")
+    channels = evaluate_pose_channels(armature_obj, props, frame_start, frame_end)
+
+    basis = basis_matrices(channels, modes)
+    index = {name: i for i, name in enumerate(bone_names)}
+    pose_matrices = np.empty_like(basis)
+    # Parents first, so every bone composes onto its parent's finished pose matrix.
+    for i in sorted(range(len(pose_bones)), key=lambda i: len(pose_bones[i].parent_recursive)):
+        bone = pose_bones[i].bone
+        rest = np.array(bone.matrix_local, dtype=np.float64)
+        if bone.use_connect:
+            # Connected bones ignore their location channel.
+            basis[:, i, :3, 3] = 0.0
+        if bone.parent is None:
+            pose_matrices[:, i] = rest @ basis[:, i]
+        else:
+            parent_rest = np.array(bone.parent.matrix_local, dtype=np.float64)
+            offset = np.linalg.inv(parent_rest) @ rest
+            pose_matrices[:, i] = pose_matrices[:, index[bone.parent.name]] @ offset @ basis[:, i]
+
+    lengths = np.array([pb.bone.length for pb in pose_bones], dtype=np.float64)
+    heads = pose_matrices[..., :3, 3]
+    tails = heads + pose_matrices[..., :3, 1] * lengths[None, :, None]
+    # Without parent, constraints or object keys (see the blockers) the world matrix is the basis matrix,
+    # which, unlike matrix_world, does not wait for a depsgraph update.
+    matrices = np.tile(np.array(armature_obj.matrix_basis, dtype=np.float32), (len(frames), 1, 1))
+
+    return PoseSamples(
+        armature_name=armature_obj.name,
+        fingerprint=pose_fingerprint(armature_obj),
+        bone_names=bone_names,
+        frames=frames,
+        channels={prop: channels[prop] for prop, _size in LOCAL_CHANNELS},
+        heads=to_world(heads, matrices).astype(np.float32),
+        tails=to_world(tails, matrices).astype(np.float32),
+        matrices=matrices,
+    )
+
+
+def sample_pose(armature_obj: bpy.types.Object, frame_start: int, frame_end: int) -> PoseSamples:
+    """Evaluate the pose from F-curves when only the action moves the bones; otherwise sweep the scene."""
+    blockers = pose_evaluation_blockers(armature_obj)
+    if not blockers:
+        return evaluate_pose(armature_obj, frame_start, frame_end)
+    log(f"Sweeping the scene for '{armature_obj.name}' ({', '.join(blockers)}).")
+    return sweep_pose(armature_obj, frame_start, frame_end)
+
+
+def deformed_meshes(armature_obj: bpy.types.Object) -> List[bpy.types.Object]:
+    """Scene meshes skinned to ``armature_obj`` that no bone constraint targets; the pose never depends on them."""
+    targets = {
+        getattr(c, "target", None) for pb in armature_obj.pose.bones for c in pb.constraints
+    } | {getattr(c, "target", None) for c in armature_obj.constraints}
+    return [
+        obj
+        for obj in bpy.context.scene.objects
+        if obj.type == "MESH"
+        and obj not in targets
+        and any(m.type == "ARMATURE" and m.object == armature_obj for m in obj.modifiers)
+    ]
+
+
+def sweep_pose(armature_obj: bpy.types.Object, frame_start: int, frame_end: int) -> PoseSamples:
+    """Step the scene once over the range and read every bone with one ``foreach_get`` per channel.
+
+    Meshes skinned to the armature are disabled in the viewport meanwhile, so the depsgraph skips them.
+    """
+    scene = bpy.context.scene
+    original_frame = scene.frame_current
+    hidden = [obj for obj in deformed_meshes(armature_obj) if not obj.hide_viewport]
+    pose_bones = armature_obj.pose.bones
+    bone_count = len(pose_bones)
+    frames = np.arange(frame_start, frame_end + 1, dtype=np.int32)
+
+    channels = {prop: np.empty((len(frames), bone_count, size), dtype=np.float32) for prop, size in LOCAL_CHANNELS}
+    heads = np.empty((len(frames), bone_count, 3), dtype=np.float32)
+    tails = np.empty((len(frames), bone_count, 3), dtype=np.float32)
+    matrices = np.empty((len(frames), 4, 4), dtype=np.float32)
+
+    for obj in hidden:
+        obj.hide_viewport = True
+    try:
+        for row, frame in enumerate(frames.tolist()):
+            scene.frame_set(frame)
+            for prop, values in channels.items():
+                pose_bones.foreach_get(prop, values[row].reshape(-1))
+            pose_bones.foreach_get("head", heads[row].reshape(-1))
+            pose_bones.foreach_get("tail", tails[row].reshape(-1))
+            matrices[row] = np.array(armature_obj.matrix_world, dtype=np.float32)
+    finally:
+        for obj in hidden:
+            obj.hide_viewport = False
+        scene.frame_set(original_frame)
+
+    return PoseSamples(
+        armature_name=armature_obj.name,
+        fingerprint=pose_fingerprint(armature_obj),
+        bone_names=[pb.name for pb in pose_bones],
+        frames=frames,
+        channels=channels,
+        heads=to_world(heads, matrices),
+        tails=to_world(tails, matrices),
+        matrices=matrices,
+    )
+
+
+def get_pose_samples(
+    armature_obj: bpy.types.Object, frame_start: int, frame_end: int, cache_path: str = ""
+) -> PoseSamples:
+    """Load ``cache_path`` when it still matches the armature, action and range; otherwise sample and save."""
+    if cache_path:
+        cached = PoseSamples.load(cache_path)
+        if cached is not None and cached.matches(armature_obj, frame_start, frame_end):
+            return cached
+    samples = sample_pose(armature_obj, frame_start, frame_end)
+    if cache_path:
+        samples.save(cache_path)
+    return samples
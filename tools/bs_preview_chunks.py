@@ -0,0 +1,192 @@
+"""Render one preview across several headless Blender workers, one contiguous frame chunk each.
+
+Pure Python (no bpy): run it with a regular interpreter, e.g.
+
+    python tools/bs_preview_chunks.py --blend work/Death_Male_A.blend --output-mp4 renders/Death_Male_A_preview.mp4 --workers 4
+
+The clip is sampled once up front into a pose cache that every worker loads. Each worker frames the camera
+on the full clip range, so framing matches a serial render, and outputs only its chunk. PNG chunks land in
+the shared frame pattern; MP4 chunks are joined in order with ffmpeg's concat demuxer without re-encoding.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from bs_death_batch import resolve_blender
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PREVIEW_SCRIPT = os.path.join(SCRIPT_DIR, "render_death_preview.py")
+RANGE_PREFIX = "PREVIEW_RANGE "
+
+
+def log(message: str) -> None:
+    print(f"[bs_preview_chunks] {message}", flush=True)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Render a death clip preview in parallel frame chunks.")
+    parser.add_argument("--blend", required=True, help="Saved clip .blend to preview.")
+    parser.add_argument("--output-mp4", default="", help="Final MP4; chunks are encoded separately and joined.")
+    parser.add_argument("--output-pattern", default="", help="PNG frame pattern, e.g. renders/tmp/frame_####.")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--start-frame", type=int, default=-1, help="Defaults to the .blend's scene range.")
+    parser.add_argument("--end-frame", type=int, default=-1)
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--resolution-x", type=int, default=1280)
+    parser.add_argument("--resolution-y", type=int, default=720)
+    parser.add_argument("--pose-cache", default="", help="Pose cache to share; defaults to one in the temp folder.")
+    parser.add_argument("--framing", choices=("bones", "mesh"), default="bones")
+    parser.add_argument("--frame-cache", default="")
+    parser.add_argument("--skeleton", action="store_true")
+    parser.add_argument("--bone-width", type=int, default=3)
+    parser.add_argument("--ffmpeg", default="ffmpeg")
+    parser.add_argument("--blender", default="", help="Blender executable; defaults to BLENDER_EXE or the known path.")
+    parser.add_argument("--temp-dir", default="", help="Parent folder for chunk files and worker logs.")
+    parser.add_argument("--keep-temp", action="store_true", help="Keep chunk files and worker logs.")
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=1800.0,
+        help="Seconds each Blender run (the sampling pass and every chunk worker) may take before it is killed.",
+    )
+    args = parser.parse_args()
+    if bool(args.output_mp4) == bool(args.output_pattern):
+        parser.error("Pass exactly one of --output-pattern or --output-mp4.")
+    return args
+
+
+def sample_clip(args: argparse.Namespace, blender: str, blend: str, pose_cache: str) -> Tuple[int, int]:
+    """Write the clip's pose cache in one Blender run and return its frame range."""
+    command = [blender, "-b", blend, "--python", PREVIEW_SCRIPT, "--", "--sample-only", "--pose-cache", pose_cache]
+    command += ["--start-frame", str(args.start_frame), "--end-frame", str(args.end_frame)]
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=args.timeout, check=False)
+    except subprocess.TimeoutExpired as exc:
+        raise RuntimeError(f"Sampling {blend} timed out after {args.timeout:g}s.") from exc
+    for line in completed.stdout.splitlines():
+        if line.startswith(RANGE_PREFIX):
+            start, end = line[len(RANGE_PREFIX) :].split()
+            return int(start), int(end)
+    raise RuntimeError(f"Could not sample {blend} (blender exit {completed.returncode}):\n{completed.stdout[-2000:]}")
+
+
+def split_range(frame_start: int, frame_end: int, workers: int) -> List[Tuple[int, int]]:
+    """Contiguous chunks of near-equal size covering frame_start..frame_end."""
+    count = frame_end - frame_start + 1
+    workers = max(1, min(workers, count))
+    bounds = [frame_start + (count * i) // workers for i in range(workers + 1)]
+    return [(bounds[i], bounds[i + 1] - 1) for i in range(workers)]
+
+
+def worker_command(
+    args: argparse.Namespace,
+    blender: str,
+    frame_range: Tuple[int, int],
+    chunk: Tuple[int, int],
+    output: str,
+    pose_cache: str,
+) -> List[str]:
+    command = [blender, "-b", os.path.abspath(args.blend), "--python", PREVIEW_SCRIPT, "--"]
+    command += ["--output-mp4" if args.output_mp4 else "--output-pattern", output]
+    command += ["--start-frame", str(frame_range[0]), "--end-frame", str(frame_range[1])]
+    command += ["--chunk-start", str(chunk[0]), "--chunk-end", str(chunk[1])]
+    command += ["--fps", str(args.fps), "--resolution-x", str(args.resolution_x), "--resolution-y", str(args.resolution_y)]
+    command += ["--ffmpeg", args.ffmpeg, "--bone-width", str(args.bone_width), "--framing", args.framing]
+    command += ["--pose-cache", pose_cache]
+    if args.frame_cache:
+        command += ["--frame-cache", os.path.abspath(args.frame_cache)]
+    if args.skeleton:
+        command.append("--skeleton")
+    return command
+
+
+def run_worker(command: List[str], log_path: str, timeout: float) -> Optional[int]:
+    with open(log_path, "w", encoding="utf-8", errors="replace") as log_handle:
+        try:
+            return subprocess.run(
+                command, stdout=log_handle, stderr=subprocess.STDOUT, timeout=timeout, check=False
+            ).returncode
+        except subprocess.TimeoutExpired:
+            log_handle.write(f"ERROR: worker killed after {timeout:g}s timeout\n")
+            return None
+        except OSError as exc:
+            log_handle.write(f"ERROR: failed to start worker: {exc}\n")
+            return None
+
+
+def concat_mp4(ffmpeg: str, chunks: List[str], output_mp4: str, temp_root: str) -> None:
+    list_path = os.path.join(temp_root, "chunks.txt")
+    with open(list_path, "w", encoding="utf-8") as handle:
+        for path in chunks:
+            escaped = path.replace("\\", "/").replace("'", "'\\''")
+            handle.write(f"file '{escaped}'\n")
+    command = [ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", list_path]
+    command += ["-c", "copy", output_mp4]
+    completed = subprocess.run(command, check=False)
+    if completed.returncode != 0:
+        raise RuntimeError(f"ffmpeg concat failed with exit code {completed.returncode}: {output_mp4}")
+
+
+def main() -> int:
+    args = parse_args()
+    blender = resolve_blender(args.blender)
+    blend = os.path.abspath(args.blend)
+    output = os.path.abspath(args.output_mp4 or args.output_pattern)
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    temp_root = tempfile.mkdtemp(prefix="bs_preview_chunks_", dir=args.temp_dir or None)
+
+    # One sampling pass; every worker then loads the pose from this cache instead of sampling again.
+    pose_cache = os.path.abspath(args.pose_cache) if args.pose_cache else os.path.join(temp_root, "pose.npz")
+    started = time.monotonic()
+    frame_range = sample_clip(args, blender, blend, pose_cache)
+    chunks = split_range(frame_range[0], frame_range[1], args.workers)
+    log(
+        f"Frames {frame_range[0]}-{frame_range[1]} sampled in {time.monotonic() - started:.1f}s; "
+        f"{len(chunks)} chunks (temp: {temp_root})"
+    )
+
+    outputs = []
+    commands = []
+    for index, chunk in enumerate(chunks):
+        # MP4 chunks are separate files; PNG frames of every chunk share the final pattern.
+        chunk_output = os.path.join(temp_root, f"chunk_{index:02d}.mp4") if args.output_mp4 else output
+        outputs.append(chunk_output)
+        commands.append(worker_command(args, blender, frame_range, chunk, chunk_output, pose_cache))
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+        futures = [
+            pool.submit(run_worker, command, os.path.join(temp_root, f"worker_{index:02d}.log"), args.timeout)
+            for index, command in enumerate(commands)
+        ]
+        exit_codes = [future.result() for future in futures]
+    log(f"Workers finished in {time.monotonic() - started:.1f}s: exit codes {exit_codes}")
+
+    failed = [index for index, code in enumerate(exit_codes) if code != 0]
+    if failed:
+        for index in failed:
+            log(f"ERROR: chunk {chunks[index][0]}-{chunks[index][1]} failed; see {temp_root}/worker_{index:02d}.log")
+        return 1
+
+    if args.output_mp4:
+        concat_mp4(args.ffmpeg, outputs, output, temp_root)
+    log(f"Output: {output}")
+    if not args.keep_temp:
+        shutil.rmtree(temp_root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        exit_code = main()
+    except Exception as exc:  # pylint: disable=broad-except
+        log(f"ERROR: {exc}")
+        exit_code = 1
+    sys.exit(exit_code)
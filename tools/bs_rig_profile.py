@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+PROFILE_VERSION = 1
+
+LEFT_TOKENS = ("l", ".l", "_l", "left")
+RIGHT_TOKENS = ("r", ".r", "_r", "right")
+
+# Exact bone names tried in order for each semantic role (canonical Mixamo/B&S names first).
+ROLE_NAMES: Dict[str, Tuple[str, ...]] = {
+    "hips": ("Hips", "hips", "Pelvis", "pelvis"),
+    "lower_back": ("LowerBack", "Spine", "spine"),
+    "spine": ("Spine", "spine", "Spine1"),
+    "chest": ("Spine1", "Chest", "chest"),
+    "neck": ("Neck", "neck", "Neck1"),
+    "head": ("Head", "head"),
+    "l_shoulder": ("LeftShoulder", "Shoulder.L", "shoulder.L"),
+    "r_shoulder": ("RightShoulder", "Shoulder.R", "shoulder.R"),
+    "l_arm": ("LeftArm", "UpperArm.L", "upper_arm.L"),
+    "r_arm": ("RightArm", "UpperArm.R", "upper_arm.R"),
+    "l_forearm": ("LeftForeArm", "ForeArm.L", "forearm.L"),
+    "r_forearm": ("RightForeArm", "ForeArm.R", "forearm.R"),
+    "l_thigh": ("LeftUpLeg", "Thigh.L", "thigh.L"),
+    "r_thigh": ("RightUpLeg", "Thigh.R", "thigh.R"),
+    "l_calf": ("LeftLeg", "Shin.L", "shin.L"),
+    "r_calf": ("RightLeg", "Shin.R", "shin.R"),
+    "l_foot": ("LeftFoot", "Foot.L", "foot.L"),
+    "r_foot": ("RightFoot", "Foot.R", "foot.R"),
+}
+
+# Name-part tokens for detail bones that carry little motion in a short clip, checked in this order.
+# They match whole parts of a bone name (see ``name_parts``), so "ring" hits HandRing1 but not Clavicle_Spring.
+DETAIL_TOKENS: Dict[str, Tuple[str, ...]] = {
+    "twist": ("twist", "roll"),
+    "finger": ("thumb", "index", "middle", "ring", "pinky", "finger", "fingers"),
+    "face": (
+        "jaw", "eye", "eyes", "eyelid", "eyebrow", "brow", "lid", "lip", "lips", "cheek", "tongue", "teeth",
+        "nose", "mouth", "face",
+    ),
+}
+
+# Splits a bone name into lowercase parts on separators, digits and camel-case humps.
+NAME_PART_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+")
+
+# Substring fallbacks for non-canonical rigs: (side tokens, base tokens).
+LIMB_FALLBACKS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "l_arm": (LEFT_TOKENS, ("upperarm", "arm")),
+    "r_arm": (RIGHT_TOKENS, ("upperarm", "arm")),
+    "l_forearm": (LEFT_TOKENS, ("forearm", "lowerarm")),
+    "r_forearm": (RIGHT_TOKENS, ("forearm", "lowerarm")),
+    "l_thigh": (LEFT_TOKENS, ("thigh", "upleg")),
+    "r_thigh": (RIGHT_TOKENS, ("thigh", "upleg")),
+    "l_calf": (LEFT_TOKENS, ("calf", "shin", "lowerleg", "leg")),
+    "r_calf": (RIGHT_TOKENS, ("calf", "shin", "lowerleg", "leg")),
+}
+
+
+def bone_root_candidates() -> Tuple[str, ...]:
+    return (
+        "root",
+        "hips",
+        "pelvis",
+        "mixamorig:hips",
+        "b_root",
+        "b_hips",
+    )
+
+
+def find_bone_name(bone_names: Sequence[str], tokens: Iterable[str]) -> Optional[str]:
+    """Case-insensitive exact match in token order, then the first bone containing any token."""
+    wanted = [t.lower() for t in tokens]
+    indexed = {name.lower(): name for name in bone_names}
+    for token in wanted:
+        if token in indexed:
+            return indexed[token]
+    for name in bone_names:
+        name_l = name.lower()
+        if any(token in name_l for token in wanted):
+            return name
+    return None
+
+
+def find_bone_names(bone_names: Sequence[str], tokens: Iterable[str]) -> List[str]:
+    """Every bone whose lowercased name contains any token, in bone order."""
+    tokens_l = [t.lower() for t in tokens]
+    return [name for name in bone_names if any(t in name.lower() for t in tokens_l)]
+
+
+def name_parts(name: str) -> Set[str]:
+    """Lowercase parts of a bone name: "mixamorig:LeftHandRing1" -> {"mixamorig", "left", "hand", "ring"}."""
+    return {part.lower() for part in NAME_PART_PATTERN.findall(name)}
+
+
+def find_part_bone_names(bone_names: Sequence[str], tokens: Iterable[str]) -> List[str]:
+    """Every bone with a name part equal to any token, in bone order."""
+    tokens_l = {t.lower() for t in tokens}
+    return [name for name in bone_names if name_parts(name) & tokens_l]
+
+
+def find_limb_bone_names(
+    bone_names: Sequence[str], side_tokens: Iterable[str], base_tokens: Iterable[str]
+) -> List[str]:
+    side_tokens_l = [s.lower() for s in side_tokens]
+    return [name for name in find_bone_names(bone_names, base_tokens) if any(s in name.lower() for s in side_tokens_l)]
+
+
+def resolve_roles(bone_names: Sequence[str]) -> Dict[str, Optional[str]]:
+    """Map every semantic role (root, hips, spine chain, limbs, feet, head) to a bone name or None."""
+    present = set(bone_names)
+    roles: Dict[str, Optional[str]] = {"root": find_bone_name(bone_names, bone_root_candidates())}
+    for role, names in ROLE_NAMES.items():
+        roles[role] = next((n for n in names if n in present), None)
+
+    for role, (side_tokens, base_tokens) in LIMB_FALLBACKS.items():
+        if roles[role] is None:
+            matches = find_limb_bone_names(bone_names, side_tokens, base_tokens)
+            roles[role] = matches[0] if matches else None
+    return roles
+
+
+def classify_bones(bone_names: Sequence[str], roles: Dict[str, Optional[str]]) -> Dict[str, str]:
+    """Map every bone to ``body`` or a detail class from DETAIL_TOKENS. Role bones are always ``body``."""
+    role_bones = {name for name in roles.values() if name}
+    classes = {name: "body" for name in bone_names}
+    for detail, tokens in reversed(list(DETAIL_TOKENS.items())):
+        for name in find_part_bone_names(bone_names, tokens):
+            if name not in role_bones:
+                classes[name] = detail
+    return classes
+
+
+def bone_names_hash(bone_names: Sequence[str]) -> str:
+    hasher = hashlib.sha256(f"rig_profile:{PROFILE_VERSION}\n".encode("utf-8"))
+    hasher.update("\n".join(bone_names).encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def load_rig_profile(armature_obj, profile_dir: str = "") -> Dict[str, Optional[str]]:
+    """Return the role map for ``armature_obj``, reusing ``<profile_dir>/<bone hash>.json`` when present.
+
+    The hash covers the ordered bone names, so any rig with the same skeleton shares one profile.
+    """
+    bone_names = [pb.name for pb in armature_obj.pose.bones]
+    profile_hash = bone_names_hash(bone_names)
+    profile_path = os.path.join(profile_dir, profile_hash + ".json") if profile_dir else ""
+
+    if profile_path and os.path.isfile(profile_path):
+        with open(profile_path, "r", encoding="utf-8") as handle:
+            profile = json.load(handle)
+        if profile.get("version") == PROFILE_VERSION:
+            return profile["roles"]
+
+    roles = resolve_roles(bone_names)
+    if profile_path:
+        os.makedirs(profile_dir, exist_ok=True)
+        temp_path = f"{profile_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(
+                {
+                    "version": PROFILE_VERSION,
+                    "bone_hash": profile_hash,
+                    "armature": armature_obj.name,
+                    "bone_count": len(bone_names),
+                    "roles": roles,
+                },
+                handle,
+                indent=2,
+            )
+        os.replace(temp_path, profile_path)
+    return roles
+
+
+def profile_pose_bone(armature_obj, roles: Dict[str, Optional[str]], role: str):
+    name = roles.get(role)
+    return armature_obj.pose.bones.get(name) if name else None
@@ -0,0 +1,70 @@
+"""NumPy quaternion helpers shared by validation and key reduction (no bpy)."""
+
+import numpy as np
+
+
+def axis_quaternions(angles: np.ndarray, axis: int) -> np.ndarray:
+    """(..., 4) quaternions for rotations of ``angles`` radians about X/Y/Z (``axis`` 0/1/2)."""
+    quats = np.zeros(angles.shape + (4,), dtype=np.float64)
+    quats[..., 0] = np.cos(angles * 0.5)
+    quats[..., axis + 1] = np.sin(angles * 0.5)
+    return quats
+
+
+def quaternion_multiply(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    w1, x1, y1, z1 = np.moveaxis(a, -1, 0)
+    w2, x2, y2, z2 = np.moveaxis(b, -1, 0)
+    return np.stack(
+        (
+            w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+            w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+            w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+            w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
+        ),
+        axis=-1,
+    )
+
+
+def euler_to_quaternions(eulers: np.ndarray, order: str) -> np.ndarray:
+    """Convert (..., 3) Blender eulers in rotation mode ``order`` (e.g. "XYZ": X applied first)."""
+    result = None
+    for axis_name in order:
+        axis = "XYZ".index(axis_name)
+        step = axis_quaternions(eulers[..., axis], axis)
+        result = step if result is None else quaternion_multiply(step, result)
+    return result
+
+
+def axis_angle_to_quaternions(axis_angles: np.ndarray) -> np.ndarray:
+    """Convert (..., 4) Blender axis-angle values (angle, x, y, z) to quaternions; a zero axis gives identity."""
+    angles = axis_angles[..., 0]
+    lengths = np.linalg.norm(axis_angles[..., 1:], axis=-1)
+    valid = lengths > 1e-9
+    axes = axis_angles[..., 1:] / np.where(valid, lengths, 1.0)[..., None]
+    quats = np.zeros(axis_angles.shape, dtype=np.float64)
+    quats[..., 0] = np.where(valid, np.cos(angles * 0.5), 1.0)
+    quats[..., 1:] = np.where(valid[..., None], axes * np.sin(angles * 0.5)[..., None], 0.0)
+    return quats
+
+
+def quaternion_matrices(quats: np.ndarray) -> np.ndarray:
+    """(..., 3, 3) rotation matrices of (..., 4) quaternions, normalized first."""
+    norms = np.linalg.norm(quats, axis=-1, keepdims=True)
+    w, x, y, z = np.moveaxis(quats / np.where(norms > 1e-9, norms, 1.0), -1, 0)
+    return np.stack(
+        (
+            np.stack((1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)), axis=-1),
+            np.stack((2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)), axis=-1),
+            np.stack((2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)), axis=-1),
+        ),
+        axis=-2,
+    )
+
+
+def quaternion_angles_deg(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Angle in degrees between unit quaternions ``a`` and ``b`` (..., 4).
+
+    |a . b| ignores the double cover, so hemisphere flips do not read as 360 degree turns.
+    """
+    dots = np.abs(np.sum(a * b, axis=-1))
+    return np.degrees(2.0 * np.arccos(np.clip(dots, 0.0, 1.0)))
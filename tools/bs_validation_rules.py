@@ -0,0 +1,388 @@
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import bpy
+import numpy as np
+
+from bs_fcurves import iter_action_fcurves, max_xy_drift, sample_pose_bone_property
+from bs_pose_cache import PoseSamples, get_pose_samples
+from bs_rotations import euler_to_quaternions, quaternion_angles_deg
+
+# Data a rule can declare in ``needs``; run_rules gathers each one at most once.
+NEED_CURVES = "curves"
+NEED_MARKERS = "markers"
+NEED_ROOT_LOCATION = "root_location"
+NEED_POSE = "pose"
+NEED_ROTATIONS = "rotations"
+
+FOOT_ROLES = ("l_foot", "r_foot")
+
+CLIP_MARKERS = ("impact", "collapse", "limp")
+
+
+class ValidationContext:
+    """Clip under validation plus the shared data gathered for the rules."""
+
+    def __init__(
+        self,
+        armature_obj: bpy.types.Object,
+        action: Optional[bpy.types.Action],
+        root_bone: Optional[bpy.types.PoseBone],
+        frame_start: int,
+        frame_end: int,
+        fps: int,
+        roles: Optional[Dict[str, Optional[str]]] = None,
+    ):
+        self.armature_obj = armature_obj
+        self.action = action
+        self.root_bone = root_bone
+        self.frame_start = frame_start
+        self.frame_end = frame_end
+        self.fps = fps
+        self.roles = roles or {}
+        self.curve_count = 0
+        self.markers: Dict[str, int] = {}
+        self.root_locations: Optional[np.ndarray] = None
+        self.samples: Optional[PoseSamples] = None
+        # (frames, bones, 4) unit quaternions of every bone's local rotation, whatever its rotation mode.
+        self.rotations: Optional[np.ndarray] = None
+        self.quaternion_bones: Optional[np.ndarray] = None
+
+
+class RuleResult:
+    def __init__(self, name: str, issues: List[str], metrics: Dict[str, float], elapsed_ms: float):
+        self.name = name
+        self.issues = issues
+        self.metrics = metrics
+        self.elapsed_ms = elapsed_ms
+
+    @property
+    def passed(self) -> bool:
+        return not self.issues
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "rule": self.name,
+            "passed": self.passed,
+            "issues": self.issues,
+            "metrics": self.metrics,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+        }
+
+
+class Rule(ABC):
+    """A validation check. ``needs`` names the shared data it reads from the context."""
+
+    name = "rule"
+    needs: Tuple[str, ...] = ()
+
+    @abstractmethod
+    def check(self, ctx: ValidationContext) -> Tuple[List[str], Dict[str, float]]:
+        """Return the issues found and the metrics measured."""
+
+
+class DurationRule(Rule):
+    name = "duration"
+
+    def __init__(self, min_duration_sec: float, max_duration_sec: float):
+        self.min_duration_sec = min_duration_sec
+        self.max_duration_sec = max_duration_sec
+
+    def check(self, ctx: ValidationContext) -> Tuple[List[str], Dict[str, float]]:
+        duration = (ctx.frame_end - ctx.frame_start) / float(ctx.fps)
+        issues = []
+        if duration < self.min_duration_sec or duration > self.max_duration_sec:
+            issues.append(
+                f"Duration {duration:.3f}s is outside recommended range "
+                f"[{self.min_duration_sec:.3f}, {self.max_duration_sec:.3f}]."
+            )
+        return issues, {"duration_sec": duration}
+
+
+class CurvesRule(Rule):
+    name = "fcurves"
+    needs = (NEED_CURVES,)
+
+    def check(self, ctx: ValidationContext) -> Tuple[List[str], Dict[str, float]]:
+        if ctx.action is None:
+            return ["No active action found."], {"fcurves": 0}
+        if ctx.curve_count == 0:
+            return ["Action has no fcurves; no animation data to export."], {"fcurves": 0}
+        return [], {"fcurves": ctx.curve_count}
+
+
+class MarkersRule(Rule):
+    name = "markers"
+    needs = (NEED_MARKERS,)
+
+    def __init__(self, expected: Sequence[str] = CLIP_MARKERS):
+        self.expected = tuple(expected)
+
+    def check(self, ctx: ValidationContext) -> Tuple[List[str], Dict[str, float]]:
+        missing = [name for name in self.expected if name not in ctx.markers]
+        return [f"Missing timeline marker: {name}" for name in missing], {"missing": len(missing)}
+
+
+class RootDriftRule(Rule):
+    name = "root_drift"
+    needs = (NEED_ROOT_LOCATION,)
+
+    def __init__(self, drift_threshold: float):
+        self.drift_threshold = drift_threshold
+
+    def check(self, ctx: ValidationContext) -> Tuple[List[str], Dict[str, float]]:
+        if ctx.root_locations is None:
+            return ["No root/pelvis bone resolved; root drift check skipped."], {}
+        drift = max_xy_drift(ctx.root_locations)
+        issues = []
+        if drift > self.drift_threshold:
+            issues.append(f"Root XY drift {drift:.5f} exceeds threshold {self.drift_threshold:.5f}.")
+        return issues, {"root_xy_drift": drift}
+
+
+def worst_index(values: np.ndarray) -> Tuple[int, int]:
+    """(frame row, bone column) of the largest entry of a (frames, bones) array."""
+    row, column = np.unravel_index(int(np.argmax(values)), values.shape)
+    return int(row), int(column)
+
+
+class AngularSpeedRule(Rule):
+    """Per-bone angular velocity and acceleration from consecutive-frame quaternion angles."""
+
+    name = "angular_speed"
+    needs = (NEED_ROTATIONS,)
+
+    def __init__(self, max_velocity_deg: float, max_accel_deg: float):
+        self.max_velocity_deg = max_velocity_deg
+        self.max_accel_deg = max_accel_deg
+
+    def check(self, ctx: ValidationContext) -> Tuple[List[str], Dict[str, float]]:
+        rotations = ctx.rotations
+        if rotations is None or len(rotations) < 2:
+            return [], {}
+        velocity = quaternion_angles_deg(rotations[1:], rotations[:-1]) * ctx.fps
+        accel = np.abs(np.diff(velocity, axis=0)) * ctx.fps
+
+        issues: List[str] = []
+        metrics: Dict[str, float] = {"max_velocity_deg_s": float(velocity.max(initial=0.0))}
+        names = ctx.samples.bone_names
+        start = ctx.samples.frame_start
+        if velocity.size and metrics["max_velocity_deg_s"] > self.max_velocity_deg:
+            row, column = worst_index(velocity)
+            spikes = int(np.count_nonzero(velocity > self.max_velocity_deg))
+            issues.append(
+                f"Angular velocity {velocity[row, column]:.1f} deg/s on '{names[column]}' at frame {start + row + 1} "
+                f"exceeds {self.max_velocity_deg:.1f} deg/s ({spikes} bone-frames over)."
+            )
+        if accel.size:
+            metrics["max_accel_deg_s2"] = float(accel.max())
+            if metrics["max_accel_deg_s2"] > self.max_accel_deg:
+                row, column = worst_index(accel)
+                spikes = int(np.count_nonzero(accel > self.max_accel_deg))
+                issues.append(
+                    f"Angular acceleration {accel[row, column]:.0f} deg/s^2 on '{names[column]}' at frame "
+                    f"{start + row + 1} exceeds {self.max_accel_deg:.0f} deg/s^2 ({spikes} bone-frames over)."
+                )
+        return issues, metrics
+
+
+class QuaternionFlipRule(Rule):
+    """Sign flips between consecutive samples of quaternion-mode bones (keys on opposite hemispheres)."""
+
+    name = "quaternion_flips"
+    needs = (NEED_ROTATIONS,)
+
+    def check(self, ctx: ValidationContext) -> Tuple[List[str], Dict[str, float]]:
+        if ctx.samples is None or ctx.quaternion_bones is None or not ctx.quaternion_bones.any():
+            return [], {"flips": 0}
+        raw = ctx.samples.channels["rotation_quaternion"][:, ctx.quaternion_bones]
+        flips = np.einsum("fbi,fbi->fb", raw[1:], raw[:-1]) < 0.0
+        count = int(np.count_nonzero(flips))
+        if not count:
+            return [], {"flips": 0}
+        names = [n for n, q in zip(ctx.samples.bone_names, ctx.quaternion_bones.tolist()) if q]
+        flipped = sorted({names[c] for c in np.nonzero(flips)[1].tolist()})
+        first = ctx.samples.frame_start + int(np.nonzero(flips.any(axis=1))[0][0]) + 1
+        return [
+            f"Quaternion sign flip on {len(flipped)} bone(s) ({', '.join(flipped[:5])}"
+            f"{', ...' if len(flipped) > 5 else ''}), first at frame {first}."
+        ], {"flips": count}
+
+
+class FootSlideRule(Rule):
+    """World-space XY travel of each foot while it is within ``contact_height`` of the clip's lowest foot."""
+
+    name = "foot_slide"
+    needs = (NEED_POSE,)
+
+    def __init__(self, slide_threshold: float, contact_height: float):
+        self.slide_threshold = slide_threshold
+        self.contact_height = contact_height
+
+    def check(self, ctx: ValidationContext) -> Tuple[List[str], Dict[str, float]]:
+        samples = ctx.samples
+        feet = [ctx.roles.get(role) for role in FOOT_ROLES]
+        feet = [name for name in feet if name and samples is not None and samples.has_bone(name)]
+        if not feet or len(samples.frames) < 2:
+            return [], {"feet": 0}
+
+        positions = samples.heads[:, [samples.bone_index(name) for name in feet]]
+        floor = float(positions[:, :, 2].min())
+        contact = positions[:, :, 2] <= floor + self.contact_height
+        planted = contact[1:] & contact[:-1]
+        steps = np.linalg.norm(np.diff(positions[:, :, :2], axis=0), axis=2)
+
+        issues: List[str] = []
+        worst = 0.0
+        for column, name in enumerate(feet):
+            # Each contiguous contact run gets its own id; bincount sums the XY steps per run.
+            run_ids = np.cumsum(~planted[:, column])
+            slides = np.bincount(run_ids[planted[:, column]], weights=steps[planted[:, column], column])
+            slide = float(slides.max(initial=0.0))
+            worst = max(worst, slide)
+            if slide > self.slide_threshold:
+                issues.append(f"Foot '{name}' slides {slide:.5f} while planted (threshold {self.slide_threshold:.5f}).")
+        return issues, {"feet": len(feet), "max_foot_slide": worst}
+
+
+def default_rules(
+    min_duration_sec: float,
+    max_duration_sec: float,
+    drift_threshold: float,
+    max_angular_velocity: float = 1440.0,
+    max_angular_accel: float = 90000.0,
+    foot_slide_threshold: float = 0.05,
+    foot_contact_height: float = 0.05,
+) -> List[Rule]:
+    return [
+        DurationRule(min_duration_sec, max_duration_sec),
+        CurvesRule(),
+        MarkersRule(),
+        RootDriftRule(drift_threshold),
+        AngularSpeedRule(max_angular_velocity, max_angular_accel),
+        QuaternionFlipRule(),
+        FootSlideRule(foot_slide_threshold, foot_contact_height),
+    ]
+
+
+def rules_from_args(args) -> List[Rule]:
+    """Rule set for the CLI options shared by bs_death_pipeline.py and bs_death_validate.py."""
+    return default_rules(
+        args.min_duration_sec,
+        args.max_duration_sec,
+        args.drift_threshold,
+        args.max_angular_velocity,
+        args.max_angular_accel,
+        args.foot_slide_threshold,
+        args.foot_contact_height,
+    )
+
+
+class ValidationReport:
+    def __init__(self, results: List[RuleResult], gather_ms: Dict[str, float]):
+        self.results = results
+        self.gather_ms = gather_ms
+
+    @property
+    def issues(self) -> List[str]:
+        return [issue for result in self.results for issue in result.issues]
+
+    def summary_lines(self) -> Iterable[str]:
+        gathered = ", ".join(f"{need}={ms:.2f}ms" for need, ms in self.gather_ms.items()) or "none"
+        yield f"Gathered: {gathered}"
+        for result in self.results:
+            metrics = " ".join(f"{k}={v:.5g}" for k, v in result.metrics.items())
+            status = "pass" if result.passed else "FAIL"
+            yield f"Rule {result.name}: {status} ({result.elapsed_ms:.2f}ms) {metrics}".rstrip()
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "passed": not self.issues,
+            "issues": self.issues,
+            "gather_ms": {k: round(v, 3) for k, v in self.gather_ms.items()},
+            "rules": [result.to_dict() for result in self.results],
+        }
+
+    def write_json(self, path: str) -> None:
+        output_dir = os.path.dirname(path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.to_dict(), handle, indent=2)
+
+
+def elapsed_ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000.0
+
+
+def local_rotations(samples: PoseSamples, rotation_modes: Sequence[str]) -> np.ndarray:
+    """(frames, bones, 4) unit quaternions; bones in euler modes are converted group-wise, axis-angle stays identity."""
+    rotations = np.zeros(samples.channels["rotation_quaternion"].shape, dtype=np.float64)
+    rotations[..., 0] = 1.0
+    modes = np.array(rotation_modes)
+    quaternion_bones = modes == "QUATERNION"
+    rotations[:, quaternion_bones] = samples.channels["rotation_quaternion"][:, quaternion_bones]
+    for order in set(rotation_modes) - {"QUATERNION", "AXIS_ANGLE"}:
+        columns = modes == order
+        rotations[:, columns] = euler_to_quaternions(samples.channels["rotation_euler"][:, columns], order)
+    norms = np.linalg.norm(rotations, axis=2, keepdims=True)
+    return rotations / np.where(norms > 1e-9, norms, 1.0)
+
+
+def gather(ctx: ValidationContext, needs: Iterable[str], pose_cache: str = "") -> Dict[str, float]:
+    """Fill the context with every requested kind of data, each in a single pass. Returns timings in ms."""
+    needs = set(needs)
+    timings: Dict[str, float] = {}
+
+    if NEED_CURVES in needs and ctx.action is not None:
+        started = time.perf_counter()
+        ctx.curve_count = sum(1 for _ in iter_action_fcurves(ctx.action))
+        timings[NEED_CURVES] = elapsed_ms(started)
+
+    if NEED_MARKERS in needs:
+        started = time.perf_counter()
+        ctx.markers = {m.name: m.frame for m in bpy.context.scene.timeline_markers}
+        timings[NEED_MARKERS] = elapsed_ms(started)
+
+    # A pose cache path means later stages want the samples, so sampling is worth doing even if no rule needs it.
+    # Samples come from the F-curves unless drivers, NLA or constraints force a scene sweep (see sample_pose).
+    if NEED_ROTATIONS in needs:
+        needs.add(NEED_POSE)
+
+    if NEED_POSE in needs or pose_cache:
+        started = time.perf_counter()
+        ctx.samples = get_pose_samples(ctx.armature_obj, ctx.frame_start, ctx.frame_end, pose_cache)
+        timings[NEED_POSE] = elapsed_ms(started)
+
+    if NEED_ROTATIONS in needs:
+        started = time.perf_counter()
+        pose_bones = ctx.armature_obj.pose.bones
+        modes = [pose_bones[name].rotation_mode for name in ctx.samples.bone_names]
+        ctx.quaternion_bones = np.array([mode == "QUATERNION" for mode in modes], dtype=bool)
+        ctx.rotations = local_rotations(ctx.samples, modes)
+        timings[NEED_ROTATIONS] = elapsed_ms(started)
+
+    if NEED_ROOT_LOCATION in needs and ctx.root_bone is not None:
+        started = time.perf_counter()
+        root_name = ctx.root_bone.name
+        if ctx.samples is not None and ctx.samples.has_bone(root_name):
+            ctx.root_locations = ctx.samples.channel("location", root_name)
+        else:
+            # Frame-free F-curve evaluation; no timeline sweep unless drivers/NLA require it.
+            ctx.root_locations = sample_pose_bone_property(ctx.root_bone, "location", ctx.frame_start, ctx.frame_end)
+        timings[NEED_ROOT_LOCATION] = elapsed_ms(started)
+    return timings
+
+
+def run_rules(rules: Sequence[Rule], ctx: ValidationContext, pose_cache: str = "") -> ValidationReport:
+    """Gather the union of the rules' data needs once, then run every rule over the shared arrays."""
+    gather_ms = gather(ctx, {need for rule in rules for need in rule.needs}, pose_cache)
+    results: List[RuleResult] = []
+    for rule in rules:
+        started = time.perf_counter()
+        issues, metrics = rule.check(ctx)
+        results.append(RuleResult(rule.name, issues, metrics, elapsed_ms(started)))
+    return ValidationReport(results, gather_ms)
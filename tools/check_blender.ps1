@@ -1,5 +1,6 @@
 param(
-    [string]$BlendPath = ".\Untitled.blend"
+    [string]$BlendPath = ".\Untitled.blend",
+    [string]$JsonReport = ""
 )
 
 $ErrorActionPreference = "Stop"
@@ -19,5 +20,10 @@ Write-Host "== Blender version =="
 if ($LASTEXITCODE -ne 0) { exit $LASTEXITCODE }
 
 Write-Host "== Scene metadata =="
-& $blenderWrapper -BlenderArgs @("-b", $absoluteBlendPath, "--python", $sceneInfoScript)
+$sceneInfoArgs = @("-b", $absoluteBlendPath, "--python", $sceneInfoScript)
+if ($JsonReport) {
+    $resolvedJsonReport = [System.IO.Path]::GetFullPath((Join-Path (Get-Location).Path $JsonReport))
+    $sceneInfoArgs += @("--", "--json", $resolvedJsonReport)
+}
+& $blenderWrapper -BlenderArgs $sceneInfoArgs
 exit $LASTEXITCODE
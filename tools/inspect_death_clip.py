@@ -1,18 +1,45 @@
+import argparse
+import os
+import sys
+
 import bpy
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bs_inspect import bounds_dict, scene_report, write_json_report  # noqa: E402
+from bs_pose_cache import get_pose_samples  # noqa: E402
+from bs_validation_rules import local_rotations  # noqa: E402
+
+argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+parser = argparse.ArgumentParser(description="Print a summary of the active death clip.")
+parser.add_argument("--frames", default="1,12,31,49", help="Comma-separated frames to print bone rotations for.")
+parser.add_argument("--pose-cache", default="", help="Optional .npz pose cache shared with the pipeline.")
+parser.add_argument("--json", default="", help="Also write a JSON report to this file.")
+args = parser.parse_args(argv)
 
 scene = bpy.context.scene
+report = {"scene": scene_report(scene), "armature": None, "action": None}
+
+
+def finish(exit_code):
+    if args.json:
+        write_json_report(report, args.json)
+    raise SystemExit(exit_code)
+
+
 armatures = [o for o in scene.objects if o.type == "ARMATURE"]
 if not armatures:
     print("NO_ARMATURE")
-    raise SystemExit(1)
+    finish(1)
 
 armatures.sort(key=lambda o: len(o.data.bones) if o.data else 0, reverse=True)
 arm = armatures[0]
 print(f"ARMATURE={arm.name}")
+report["armature"] = arm.name
 
 if arm.animation_data is None or arm.animation_data.action is None:
     print("NO_ACTIVE_ACTION")
-    raise SystemExit(0)
+    finish(0)
 
 action = arm.animation_data.action
 print(f"ACTION={action.name}")
@@ -20,16 +47,56 @@ print(f"ACTION_RANGE={tuple(action.frame_range)}")
 print(f"SCENE_RANGE={scene.frame_start}-{scene.frame_end}")
 print(f"FPS={scene.render.fps}/{scene.render.fps_base}")
 print("MARKERS=" + ",".join(f"{m.name}:{m.frame}" for m in scene.timeline_markers))
+report["action"] = action.name
+report["action_range"] = [float(v) for v in action.frame_range]
+
+# One evaluation of the scene range (or a matching cache) serves every frame below.
+samples = get_pose_samples(arm, scene.frame_start, scene.frame_end, os.path.abspath(args.pose_cache) if args.pose_cache else "")
+report["bones"] = list(samples.bone_names)
+report["clip_bounds"] = bounds_dict(np.concatenate((samples.heads, samples.tails), axis=1).reshape(-1, 3))
+report["frames"] = {}
+modes = [arm.pose.bones[name].rotation_mode for name in samples.bone_names]
+# Unit quaternions for every bone whatever its mode; axis-angle is not sampled and reads as identity.
+quaternions = local_rotations(samples, modes)
+bones = [name for name in ("Hips", "Spine", "Head", "LeftUpLeg", "RightUpLeg") if samples.has_bone(name)]
+
 
-bones = ["Hips", "Spine", "Head", "LeftUpLeg", "RightUpLeg"]
-for frame in (1, 12, 31, 49):
-    scene.frame_set(frame)
+def bone_rotation(row, column):
+    """The bone's rotation in its own rotation_mode: quaternion (w, x, y, z), euler XYZ, or None for axis-angle."""
+    mode = modes[column]
+    if mode == "QUATERNION":
+        values = samples.channels["rotation_quaternion"][row, column]
+    elif mode == "AXIS_ANGLE":
+        return None
+    else:
+        values = samples.channels["rotation_euler"][row, column]
+    return values.astype(np.float64).round(6).tolist()
+
+
+for frame in (int(f) for f in args.frames.split(",") if f.strip()):
+    if frame < samples.frame_start or frame > samples.frame_end:
+        print(f"F{frame} OUT_OF_RANGE")
+        report["frames"][str(frame)] = None
+        continue
+    row = samples.frame_row(frame)
     values = []
     for name in bones:
-        pb = arm.pose.bones.get(name)
-        if pb is None:
-            continue
-        values.append(
-            f"{name}=({pb.rotation_euler.x:.3f},{pb.rotation_euler.y:.3f},{pb.rotation_euler.z:.3f})"
-        )
+        column = samples.bone_index(name)
+        rotation = bone_rotation(row, column)
+        text = "n/a" if rotation is None else "(" + ",".join(f"{v:.3f}" for v in rotation) + ")"
+        values.append(f"{name}={modes[column]}{text}")
     print(f"F{frame} " + " ".join(values))
+    report["frames"][str(frame)] = {
+        "rotations": {
+            name: {
+                "mode": modes[column],
+                "value": bone_rotation(row, column),
+                "quaternion": None if modes[column] == "AXIS_ANGLE" else quaternions[row, column].round(6).tolist(),
+            }
+            for column, name in enumerate(samples.bone_names)
+        },
+        "bounds": bounds_dict(np.concatenate((samples.heads[row], samples.tails[row]))),
+    }
+
+if args.json:
+    write_json_report(report, args.json)
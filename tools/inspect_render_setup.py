@@ -1,5 +1,16 @@
+import argparse
+import os
+import sys
+
 import bpy
-from mathutils import Vector
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bs_inspect import object_report, scene_report, write_json_report  # noqa: E402
+
+argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+parser = argparse.ArgumentParser(description="Print the render setup and object placement of the active scene.")
+parser.add_argument("--json", default="", help="Also write a JSON report to this file.")
+args = parser.parse_args(argv)
 
 scene = bpy.context.scene
 
@@ -11,23 +22,18 @@ print(f"ENGINE={scene.render.engine}")
 print(f"CAMERA={scene.camera.name if scene.camera else 'None'}")
 
 
-def object_world_center(obj):
-    if obj.type == "MESH" and obj.data and len(obj.data.vertices) > 0:
-        verts = [obj.matrix_world @ v.co for v in obj.data.vertices]
-        center = Vector((0.0, 0.0, 0.0))
-        for v in verts:
-            center += v
-        return center / len(verts)
-    return obj.matrix_world.translation
-
-
-for obj in scene.objects:
-    if obj.type in {"ARMATURE", "MESH", "CAMERA", "LIGHT"}:
-        center = object_world_center(obj)
-        print(
-            f"OBJ={obj.name} TYPE={obj.type} "
-            f"hide_render={obj.hide_render} hide_view={obj.hide_viewport} "
-            f"loc=({obj.location.x:.3f},{obj.location.y:.3f},{obj.location.z:.3f}) "
-            f"center=({center.x:.3f},{center.y:.3f},{center.z:.3f}) "
-            f"scale=({obj.scale.x:.3f},{obj.scale.y:.3f},{obj.scale.z:.3f})"
-        )
+def fmt(values):
+    return "(" + ",".join(f"{v:.3f}" for v in values) + ")"
+
+
+# Mesh centres are vertex means and armature centres bone head/tail means, read in bulk per object.
+objects = [object_report(obj) for obj in scene.objects if obj.type in {"ARMATURE", "MESH", "CAMERA", "LIGHT"}]
+for info in objects:
+    print(
+        f"OBJ={info['name']} TYPE={info['type']} "
+        f"hide_render={info['hide_render']} hide_view={info['hide_viewport']} "
+        f"loc={fmt(info['location'])} center={fmt(info['center'])} scale={fmt(info['scale'])}"
+    )
+
+if args.json:
+    write_json_report({"scene": scene_report(scene), "objects": objects}, args.json)
@@ -2,48 +2,105 @@ param(
     [Parameter(Mandatory = $true)]
     [string]$BlendPath,
 
-    [Parameter(Mandatory = $true)]
-    [string]$OutputMp4,
+    [string]$OutputMp4 = "",
 
     [int]$StartFrame = -1,
     [int]$EndFrame = -1,
     [int]$Fps = 60,
     [int]$ResolutionX = 1280,
-    [int]$ResolutionY = 720
+    [int]$ResolutionY = 720,
+    [string]$PoseCache = "",
+    [switch]$Skeleton,
+    [switch]$PngFrames,
+    [string]$FrameCache = "",
+    [int]$Workers = 1,
+    [double]$WorkerTimeoutSec = 1800,
+    [string]$ContactSheet = "",
+    [int]$ContactInbetweens = 0,
+    [int]$ContactColumns = 4,
+    [ValidateSet("bones", "mesh")]
+    [string]$Framing = "bones"
 )
 
 $ErrorActionPreference = "Stop"
 
+if (-not $OutputMp4 -and -not $ContactSheet) {
+    throw "OutputMp4 is required unless -ContactSheet is set."
+}
+
 $scriptDir = Split-Path -Parent $MyInvocation.MyCommand.Path
 $blenderWrapper = Join-Path $scriptDir "blender.ps1"
 $previewScript = Join-Path $scriptDir "render_death_preview.py"
+$chunkScript = Join-Path $scriptDir "bs_preview_chunks.py"
 
 $resolvedBlend = (Resolve-Path $BlendPath).Path
+if ($ContactSheet) {
+    $OutputMp4 = $ContactSheet
+}
 $resolvedOutput = [System.IO.Path]::GetFullPath((Join-Path (Get-Location).Path $OutputMp4))
 $outputDir = Split-Path -Parent $resolvedOutput
 $baseName = [System.IO.Path]::GetFileNameWithoutExtension($resolvedOutput)
 $tmpFramesDir = Join-Path $outputDir ($baseName + "_frames")
 $tmpPattern = Join-Path $tmpFramesDir "frame_####"
 
-if (-not (Test-Path $tmpFramesDir)) {
-    New-Item -ItemType Directory -Path $tmpFramesDir -Force | Out-Null
-}
-
-$args = @(
-    "-b", $resolvedBlend,
-    "--python", $previewScript,
-    "--",
-    "--output-pattern", $tmpPattern,
+# Options shared by render_death_preview.py and the parallel chunk driver.
+$previewArgs = @(
     "--fps", "$Fps",
     "--resolution-x", "$ResolutionX",
-    "--resolution-y", "$ResolutionY"
+    "--resolution-y", "$ResolutionY",
+    "--framing", $Framing
 )
 
-if ($StartFrame -ge 0) { $args += @("--start-frame", "$StartFrame") }
-if ($EndFrame -ge 0) { $args += @("--end-frame", "$EndFrame") }
+if ($StartFrame -ge 0) { $previewArgs += @("--start-frame", "$StartFrame") }
+if ($EndFrame -ge 0) { $previewArgs += @("--end-frame", "$EndFrame") }
+if ($PoseCache) {
+    $resolvedPoseCache = [System.IO.Path]::GetFullPath((Join-Path (Get-Location).Path $PoseCache))
+    $previewArgs += @("--pose-cache", $resolvedPoseCache)
+}
+if ($Skeleton) { $previewArgs += "--skeleton" }
+if ($FrameCache) {
+    $resolvedFrameCache = [System.IO.Path]::GetFullPath((Join-Path (Get-Location).Path $FrameCache))
+    $previewArgs += @("--frame-cache", $resolvedFrameCache)
+}
+
+if ($ContactSheet) {
+    # Only the start frame and the impact/collapse/limp markers are rendered, in one process.
+    if (-not (Test-Path $outputDir)) {
+        New-Item -ItemType Directory -Path $outputDir -Force | Out-Null
+    }
+    $previewArgs += @(
+        "--contact-sheet", $resolvedOutput,
+        "--contact-inbetweens", "$ContactInbetweens",
+        "--contact-columns", "$ContactColumns"
+    )
+    $args = @("-b", $resolvedBlend, "--python", $previewScript, "--") + $previewArgs
+    & $blenderWrapper -BlenderArgs $args
+    exit $LASTEXITCODE
+}
 
-& $blenderWrapper -BlenderArgs $args
+if ($PngFrames) {
+    if (-not (Test-Path $tmpFramesDir)) {
+        New-Item -ItemType Directory -Path $tmpFramesDir -Force | Out-Null
+    }
+    $previewArgs += @("--output-pattern", $tmpPattern)
+} else {
+    # Frames go straight into the encoder; no image sequence is written.
+    if (-not (Test-Path $outputDir)) {
+        New-Item -ItemType Directory -Path $outputDir -Force | Out-Null
+    }
+    $previewArgs += @("--output-mp4", $resolvedOutput)
+}
+
+if ($Workers -gt 1) {
+    # Chunks render in separate background Blender processes and are stitched in frame order.
+    $driverArgs = @($chunkScript, "--blend", $resolvedBlend, "--workers", "$Workers", "--timeout", "$WorkerTimeoutSec") + $previewArgs
+    & python @driverArgs
+} else {
+    $args = @("-b", $resolvedBlend, "--python", $previewScript, "--") + $previewArgs
+    & $blenderWrapper -BlenderArgs $args
+}
 if ($LASTEXITCODE -ne 0) { exit $LASTEXITCODE }
+if (-not $PngFrames) { exit 0 }
 
 $ffmpegInput = Join-Path $tmpFramesDir "frame_%04d.png"
 ffmpeg -y -framerate $Fps -i $ffmpegInput -c:v libx264 -pix_fmt yuv420p $resolvedOutput | Out-Null
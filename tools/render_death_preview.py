@@ -1,10 +1,18 @@
 import argparse
 import os
+import shutil
+import subprocess
 import sys
+import tempfile
 from math import tan
 from mathutils import Vector
 
 import bpy
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bs_frame_cache import FrameCache, frame_hashes, settings_key, temp_path  # noqa: E402
+from bs_pose_cache import get_pose_samples  # noqa: E402
 
 
 def parse_args():
@@ -15,15 +23,74 @@ def parse_args():
     parser = argparse.ArgumentParser(description="Render a framed MP4 preview for a death clip.")
     parser.add_argument(
         "--output-pattern",
-        required=True,
+        default="",
         help="Output image pattern path, e.g. .\\renders\\tmp\\frame_####",
     )
+    parser.add_argument(
+        "--output-mp4",
+        default="",
+        help="Encode straight to this MP4 instead of writing PNG frames: Blender's FFMPEG output, "
+        "or with --skeleton raw frames piped into ffmpeg.",
+    )
+    parser.add_argument(
+        "--contact-sheet",
+        default="",
+        help="Render only the start frame and the impact/collapse/limp markers (plus --contact-inbetweens) "
+        "and tile them into this PNG.",
+    )
+    parser.add_argument(
+        "--contact-inbetweens", type=int, default=0, help="Extra evenly spaced frames between consecutive key frames."
+    )
+    parser.add_argument("--contact-columns", type=int, default=4, help="Contact sheet tiles per row.")
+    parser.add_argument("--ffmpeg", default="ffmpeg", help="ffmpeg executable for --skeleton with --output-mp4.")
     parser.add_argument("--start-frame", type=int, default=-1)
     parser.add_argument("--end-frame", type=int, default=-1)
+    parser.add_argument(
+        "--chunk-start",
+        type=int,
+        default=-1,
+        help="Only output frames from here on. Framing and pose sampling still use the full clip range.",
+    )
+    parser.add_argument("--chunk-end", type=int, default=-1, help="Only output frames up to here.")
     parser.add_argument("--fps", type=int, default=60)
     parser.add_argument("--resolution-x", type=int, default=1280)
     parser.add_argument("--resolution-y", type=int, default=720)
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--pose-cache",
+        default="",
+        help="Optional .npz pose cache shared with the pipeline; armature framing reads bone positions from it.",
+    )
+    parser.add_argument(
+        "--framing",
+        choices=("bones", "mesh"),
+        default="bones",
+        help="bones: frame the bone head/tail extents over the whole clip (default). "
+        "mesh: frame the meshes' bounding boxes at the current frame.",
+    )
+    parser.add_argument(
+        "--skeleton",
+        action="store_true",
+        help="Draw a stick figure from sampled bone heads/tails with NumPy instead of rendering; needs no GPU.",
+    )
+    parser.add_argument("--bone-width", type=int, default=3, help="Stick-figure line width in pixels.")
+    parser.add_argument(
+        "--frame-cache",
+        default="",
+        help="Per-clip frame cache folder; only frames whose pose or camera changed are drawn again.",
+    )
+    parser.add_argument(
+        "--sample-only",
+        action="store_true",
+        help="Sample the clip into --pose-cache, print its PREVIEW_RANGE and exit without rendering "
+        "(used by bs_preview_chunks.py before it starts workers).",
+    )
+    args = parser.parse_args(argv)
+    if args.sample_only:
+        if not args.pose_cache:
+            parser.error("--sample-only needs --pose-cache.")
+    elif sum(bool(o) for o in (args.output_pattern, args.output_mp4, args.contact_sheet)) != 1:
+        parser.error("Pass exactly one of --output-pattern, --output-mp4 or --contact-sheet.")
+    return args
 
 
 def find_targets(scene):
@@ -32,18 +99,22 @@ def find_targets(scene):
     return meshes, armatures
 
 
-def world_bounds(objects):
-    points = []
+def object_bounds(objects):
+    """World-space min/max over the ``bound_box`` corners of ``objects`` at the current frame."""
+    if not objects:
+        return Vector((0.0, 0.0, 0.0)), Vector((1.0, 1.0, 2.0))
+    corners = []
     for obj in objects:
-        for corner in obj.bound_box:
-            points.append(obj.matrix_world @ Vector(corner))
+        matrix = np.array(obj.matrix_world, dtype=np.float64)
+        corners.append(np.array(obj.bound_box, dtype=np.float64) @ matrix[:3, :3].T + matrix[:3, 3])
+    points = np.concatenate(corners)
+    return Vector(points.min(axis=0).tolist()), Vector(points.max(axis=0).tolist())
 
-    if not points:
-        return Vector((0.0, 0.0, 0.0)), Vector((1.0, 1.0, 2.0))
 
-    min_v = Vector((min(p.x for p in points), min(p.y for p in points), min(p.z for p in points)))
-    max_v = Vector((max(p.x for p in points), max(p.y for p in points), max(p.z for p in points)))
-    return min_v, max_v
+def clip_bounds(samples):
+    """World-space min/max over every bone head and tail on every sampled frame."""
+    min_b, max_b = samples.bounds()
+    return Vector(min_b.tolist()), Vector(max_b.tolist())
 
 
 def ensure_camera(scene):
@@ -78,7 +149,7 @@ def frame_camera_to_bounds(cam, min_v, max_v):
     cam.rotation_euler = (center - cam.location).to_track_quat("-Z", "Y").to_euler()
 
 
-def configure_preview_render(scene, output_pattern, fps, rx, ry, start_frame, end_frame):
+def configure_preview_render(scene, output_path, fps, rx, ry, start_frame, end_frame, video=False):
     scene.render.engine = "BLENDER_WORKBENCH"
     scene.render.resolution_x = rx
     scene.render.resolution_y = ry
@@ -91,41 +162,392 @@ def configure_preview_render(scene, output_pattern, fps, rx, ry, start_frame, en
     if end_frame >= 0:
         scene.frame_end = end_frame
 
-    scene.render.image_settings.file_format = "PNG"
-    scene.render.filepath = output_pattern
+    settings = scene.render.image_settings
+    if video:
+        if hasattr(settings, "media_type"):
+            # Blender 5 lists FFMPEG only under the video media type.
+            settings.media_type = "VIDEO"
+        settings.file_format = "FFMPEG"
+        scene.render.ffmpeg.format = "MPEG4"
+        scene.render.ffmpeg.codec = "H264"
+        scene.render.ffmpeg.constant_rate_factor = "MEDIUM"
+    else:
+        settings.file_format = "PNG"
+    scene.render.filepath = output_path
+
+
+# Stick-figure colours (display RGBA): near bones are drawn brighter than far ones.
+SKELETON_BACKGROUND = (0.02, 0.02, 0.025, 1.0)
+SKELETON_NEAR = np.array((1.0, 0.62, 0.18, 1.0), dtype=np.float32)
+SKELETON_FAR = np.array((0.25, 0.12, 0.04, 1.0), dtype=np.float32)
+SKELETON_JOINT = np.array((0.9, 0.9, 0.9, 1.0), dtype=np.float32)
+
+
+def camera_matrix(cam, rx, ry):
+    """World -> clip space for ``cam`` at the given resolution, as a (4, 4) array."""
+    bpy.context.view_layer.update()
+    projection = cam.calc_matrix_camera(bpy.context.evaluated_depsgraph_get(), x=rx, y=ry)
+    return np.array(projection, dtype=np.float64) @ np.array(cam.matrix_world.inverted(), dtype=np.float64)
+
+
+def project_points(points, matrix, rx, ry):
+    """(n, 3) world points -> (n, 2) pixel coordinates (origin top-left) and (n,) view depth."""
+    clip = np.c_[points, np.ones(len(points))] @ matrix.T
+    w = clip[:, 3]
+    pixels = np.empty((len(points), 2))
+    pixels[:, 0] = (clip[:, 0] / w * 0.5 + 0.5) * rx
+    pixels[:, 1] = (0.5 - clip[:, 1] / w * 0.5) * ry
+    return pixels, w
+
+
+def disk_offsets(radius):
+    r = max(0, int(radius))
+    dy, dx = np.mgrid[-r : r + 1, -r : r + 1]
+    inside = dx * dx + dy * dy <= max(r * r, 0.5)
+    return np.stack((dx[inside], dy[inside]), axis=1)
+
+
+def stamp(image, points, offsets, colors):
+    """Paint a disk of ``colors`` (n, 4) at each (n, 2) pixel point; later points overwrite earlier ones."""
+    if not len(points):
+        return
+    height, width = image.shape[:2]
+    pixels = np.rint(points).astype(np.int64)[:, None, :] + offsets[None, :, :]
+    colors = np.broadcast_to(colors[:, None, :], pixels.shape[:2] + (4,))
+    pixels = pixels.reshape(-1, 2)
+    colors = colors.reshape(-1, 4)
+    inside = (pixels[:, 0] >= 0) & (pixels[:, 0] < width) & (pixels[:, 1] >= 0) & (pixels[:, 1] < height)
+    image[pixels[inside, 1], pixels[inside, 0]] = colors[inside]
+
+
+def draw_segments(image, starts, ends, colors, offsets):
+    """Rasterize (n, 2) -> (n, 2) pixel segments by stamping disks every pixel along each one."""
+    lengths = np.ceil(np.linalg.norm(ends - starts, axis=1)).astype(np.int64) + 1
+    segment = np.repeat(np.arange(len(starts)), lengths)
+    first = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    t = (np.arange(lengths.sum()) - first) / np.maximum(lengths[segment] - 1, 1)
+    points = starts[segment] + (ends - starts)[segment] * t[:, None]
+    stamp(image, points, offsets, colors[segment])
+
+
+def draw_skeleton(image, heads, tails, matrix, bone_width):
+    """Draw one frame of (bones, 3) world heads/tails, far bones first."""
+    height, width = image.shape[:2]
+    image[:] = SKELETON_BACKGROUND
+    count = len(heads)
+    pixels, depth = project_points(np.concatenate((heads, tails)), matrix, width, height)
+    visible = (depth[:count] > 0) & (depth[count:] > 0)
+    seg_depth = (depth[:count] + depth[count:]) * 0.5
+    order = [i for i in np.argsort(-seg_depth) if visible[i]]
+    if not order:
+        return
+    near, far = seg_depth[order].min(), seg_depth[order].max()
+    shade = (far - seg_depth[order]) / (far - near) if far > near else np.ones(len(order))
+    colors = SKELETON_FAR + (SKELETON_NEAR - SKELETON_FAR) * shade[:, None].astype(np.float32)
+    draw_segments(image, pixels[order], pixels[np.add(order, count)], colors, disk_offsets(bone_width / 2.0))
+    joints = pixels[order]
+    stamp(image, joints, disk_offsets(bone_width), np.broadcast_to(SKELETON_JOINT, (len(joints), 4)))
+
+
+class PngFrameWriter:
+    """Saves each frame as a PNG at ``frame_path(frame)``, renamed into place once complete."""
+
+    def __init__(self, frame_path, rx, ry):
+        self.frame_path = frame_path
+        self.image = bpy.data.images.new("SkeletonPreview", width=rx, height=ry, alpha=False)
+        self.image.file_format = "PNG"
+
+    def write(self, frame, pixels):
+        # Blender images store rows bottom-up.
+        self.image.pixels.foreach_set(pixels[::-1].ravel())
+        path = self.frame_path(frame)
+        self.image.filepath_raw = temp_path(path)
+        self.image.save()
+        os.replace(self.image.filepath_raw, path)
+
+    def close(self):
+        bpy.data.images.remove(self.image)
+
+
+class FfmpegFrameWriter:
+    """Streams frames into an ffmpeg process; nothing touches the disk but the MP4.
+
+    Takes raw RGBA pixels through ``write``, or with ``png_input`` PNG files through ``write_file``.
+    """
+
+    def __init__(self, ffmpeg, output_mp4, rx, ry, fps, png_input=False):
+        command = [ffmpeg, "-y", "-loglevel", "error"]
+        if png_input:
+            command += ["-f", "image2pipe", "-c:v", "png", "-framerate", str(fps), "-i", "-"]
+        else:
+            command += ["-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{rx}x{ry}", "-framerate", str(fps), "-i", "-"]
+        command += ["-c:v", "libx264", "-pix_fmt", "yuv420p", output_mp4]
+        self.output_mp4 = output_mp4
+        try:
+            self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        except OSError as exc:
+            raise RuntimeError(f"Could not start ffmpeg '{ffmpeg}': {exc}") from exc
+
+    def write(self, frame, pixels):
+        self.process.stdin.write(np.clip(pixels * 255.0 + 0.5, 0, 255).astype(np.uint8).tobytes())
+
+    def write_file(self, path):
+        with open(path, "rb") as handle:
+            shutil.copyfileobj(handle, self.process.stdin)
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed with exit code {self.process.returncode}: {self.output_mp4}")
+
+
+def render_skeleton_frames(writer, cam, samples, rx, ry, bone_width, frames=None):
+    """Draw the frames of ``samples`` (all, or just ``frames``) as stick figures and hand them to ``writer``."""
+    matrix = camera_matrix(cam, rx, ry)
+    image = np.empty((ry, rx, 4), dtype=np.float32)
+    try:
+        for row, frame in enumerate(samples.frames.tolist()):
+            if frames is not None and frame not in frames:
+                continue
+            draw_skeleton(image, samples.heads[row], samples.tails[row], matrix, bone_width)
+            writer.write(frame, image)
+    finally:
+        writer.close()
+
+
+def render_still_frames(scene, paths):
+    """Render each frame -> PNG path in ``paths`` with the scene's engine, one still at a time.
+
+    Each still is written under a temp name and renamed, so an interrupted render leaves no partial PNG.
+    """
+    original = scene.render.filepath
+    try:
+        for frame, path in sorted(paths.items()):
+            scene.frame_set(frame)
+            scene.render.filepath = temp_path(path)
+            bpy.ops.render.render(write_still=True)
+            os.replace(scene.render.filepath, path)
+    finally:
+        scene.render.filepath = original
+
+
+def mesh_fingerprint(meshes):
+    """Object names, transforms and vertex positions of the rendered meshes, for the frame cache key."""
+    parts = []
+    for obj in sorted(meshes, key=lambda o: o.name):
+        co = np.empty(len(obj.data.vertices) * 3, dtype=np.float32)
+        obj.data.vertices.foreach_get("co", co)
+        parts += [obj.name, np.array(obj.matrix_world, dtype=np.float32), co]
+    return parts
+
+
+def render_cached(args, scene, cam, samples, meshes, output_path):
+    """Draw only frames missing from the frame cache, then build the output from cached frames."""
+    rx, ry = args.resolution_x, args.resolution_y
+    if args.skeleton:
+        key = settings_key("skeleton", rx, ry, args.bone_width, camera_matrix(cam, rx, ry))
+    else:
+        key = settings_key(scene.render.engine, rx, ry, camera_matrix(cam, rx, ry), *mesh_fingerprint(meshes))
+    # Hashes cover the whole clip so parallel chunk workers all commit the same manifest.
+    hashes = frame_hashes(samples, key)
+    wanted = {f: h for f, h in hashes.items() if scene.frame_start <= f <= scene.frame_end}
+    cache = FrameCache(os.path.abspath(args.frame_cache))
+    todo = cache.missing(wanted)
+
+    if todo and args.skeleton:
+        writer = PngFrameWriter(lambda frame: cache.path(todo[frame]), rx, ry)
+        render_skeleton_frames(writer, cam, samples, rx, ry, args.bone_width, frames=set(todo))
+    elif todo:
+        render_still_frames(scene, {frame: cache.path(frame_hash) for frame, frame_hash in todo.items()})
+
+    if args.output_mp4:
+        writer = FfmpegFrameWriter(args.ffmpeg, output_path, rx, ry, args.fps, png_input=True)
+        try:
+            for frame in sorted(wanted):
+                writer.write_file(cache.path(wanted[frame]))
+        finally:
+            writer.close()
+    else:
+        for frame in sorted(wanted):
+            shutil.copyfile(cache.path(wanted[frame]), scene.render.frame_path(frame=frame))
+
+    pruned = cache.commit(hashes)
+    print(
+        f"FRAME_CACHE rendered={len(todo)} reused={len(wanted) - len(todo)} pruned={pruned} "
+        f"dir={cache.cache_dir}"
+    )
+
+
+# Markers the pipeline adds with add_timeline_marker, in clip order.
+CONTACT_MARKERS = ("impact", "collapse", "limp")
+CONTACT_BACKGROUND = (0.12, 0.12, 0.13, 1.0)
+# Strip along the top of key-frame tiles; in-between tiles have none.
+CONTACT_KEY_STRIP = np.array((1.0, 0.62, 0.18, 1.0), dtype=np.float32)
+
+
+def contact_frames(scene, frame_start, inbetweens):
+    """(frame, label) for the start frame, each pipeline marker present, and in-betweens between them."""
+    keys = [(frame_start, "start")]
+    for name in CONTACT_MARKERS:
+        marker = scene.timeline_markers.get(name)
+        if marker is None:
+            print(f"CONTACT_SHEET missing marker: {name}")
+        else:
+            keys.append((marker.frame, name))
+    keys.sort()
+
+    frames = []
+    for (frame, label), following in zip(keys, keys[1:] + [None]):
+        frames.append((frame, label))
+        if following is None:
+            continue
+        span = following[0] - frame
+        for k in range(1, inbetweens + 1):
+            frames.append((frame + int(round(span * k / float(inbetweens + 1))), ""))
+    # Markers can share a frame and short spans round in-betweens together; keep the first of each.
+    seen = set()
+    return [(f, label) for f, label in frames if not (f in seen or seen.add(f))]
+
+
+def load_png_pixels(path):
+    """(height, width, 4) float pixels of a PNG, rows top-down."""
+    image = bpy.data.images.load(path)
+    try:
+        width, height = image.size
+        pixels = np.empty(width * height * 4, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+        return pixels.reshape(height, width, 4)[::-1]
+    finally:
+        bpy.data.images.remove(image)
+
+
+def tile_contact_sheet(tiles, key_tiles, columns):
+    """Lay equally sized tiles out row by row; ``key_tiles`` flags which tiles get the key-frame strip."""
+    height, width = tiles[0].shape[:2]
+    columns = max(1, min(columns, len(tiles)))
+    rows = (len(tiles) + columns - 1) // columns
+    sheet = np.empty((rows * height, columns * width, 4), dtype=np.float32)
+    sheet[:] = CONTACT_BACKGROUND
+    strip = max(2, height // 60)
+    for index, (tile, is_key) in enumerate(zip(tiles, key_tiles)):
+        top, left = (index // columns) * height, (index % columns) * width
+        sheet[top : top + height, left : left + width] = tile
+        if is_key:
+            sheet[top : top + strip, left : left + width] = CONTACT_KEY_STRIP
+    return sheet
+
+
+def render_contact_sheet(args, scene, cam, samples, output_path):
+    rx, ry = args.resolution_x, args.resolution_y
+    frames = contact_frames(scene, scene.frame_start, max(0, args.contact_inbetweens))
+    if args.skeleton:
+        matrix = camera_matrix(cam, rx, ry)
+        tiles = []
+        for frame, _label in frames:
+            tile = np.empty((ry, rx, 4), dtype=np.float32)
+            row = samples.frame_row(frame)
+            draw_skeleton(tile, samples.heads[row], samples.tails[row], matrix, args.bone_width)
+            tiles.append(tile)
+    else:
+        temp_dir = tempfile.mkdtemp(prefix="contact_sheet_")
+        try:
+            paths = {frame: os.path.join(temp_dir, f"{frame:04d}.png") for frame, _label in frames}
+            render_still_frames(scene, paths)
+            tiles = [load_png_pixels(paths[frame]) for frame, _label in frames]
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    sheet = tile_contact_sheet(tiles, [bool(label) for _frame, label in frames], args.contact_columns)
+    writer = PngFrameWriter(lambda _frame: output_path, sheet.shape[1], sheet.shape[0])
+    try:
+        writer.write(scene.frame_start, sheet)
+    finally:
+        writer.close()
+    print(
+        "CONTACT_SHEET frames="
+        + ",".join(f"{frame}:{label}" if label else str(frame) for frame, label in frames)
+        + f" output={output_path}"
+    )
 
 
 def main():
     args = parse_args()
     scene = bpy.context.scene
 
-    output_pattern = os.path.abspath(args.output_pattern)
-    os.makedirs(os.path.dirname(output_pattern), exist_ok=True)
-
+    frame_start = args.start_frame if args.start_frame >= 0 else scene.frame_start
+    frame_end = args.end_frame if args.end_frame >= 0 else scene.frame_end
     meshes, armatures = find_targets(scene)
+    armature = max(armatures, key=lambda a: len(a.data.bones) if a.data else 0) if armatures else None
+    if args.sample_only:
+        if armature is not None:
+            get_pose_samples(armature, frame_start, frame_end, os.path.abspath(args.pose_cache))
+        print(f"PREVIEW_RANGE {frame_start} {frame_end}")
+        return
+
+    output_path = os.path.abspath(args.output_mp4 or args.output_pattern or args.contact_sheet)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    if args.skeleton:
+        # The stick figure is all that is drawn, so frame the skeleton rather than the mesh.
+        meshes = []
+        if not armatures:
+            raise RuntimeError("Skeleton preview needs an armature.")
     targets = meshes if meshes else armatures
     if not targets:
         raise RuntimeError("No mesh/armature objects found for preview framing.")
 
-    min_v, max_v = world_bounds(targets)
+    if args.frame_cache and not armatures:
+        raise RuntimeError("The frame cache keys frames by armature pose; no armature found.")
+
+    # Bone framing needs the pose over the whole clip, which the other stages reuse.
+    samples = None
+    if armature is not None and (args.framing == "bones" or args.pose_cache or args.skeleton or args.frame_cache):
+        pose_cache = os.path.abspath(args.pose_cache) if args.pose_cache else ""
+        samples = get_pose_samples(armature, frame_start, frame_end, pose_cache)
+
+    if samples is not None and (args.framing == "bones" or not meshes):
+        min_v, max_v = clip_bounds(samples)
+    else:
+        min_v, max_v = object_bounds(targets)
+    if args.frame_cache:
+        # The camera is part of every frame's key; pinned bounds keep it still across small pose edits.
+        min_b, max_b = FrameCache(os.path.abspath(args.frame_cache)).pinned_bounds(min_v, max_v)
+        min_v, max_v = Vector(min_b.tolist()), Vector(max_b.tolist())
     cam = ensure_camera(scene)
     frame_camera_to_bounds(cam, min_v, max_v)
 
     configure_preview_render(
         scene=scene,
-        output_pattern=output_pattern,
+        output_path=output_path,
         fps=args.fps,
         rx=args.resolution_x,
         ry=args.resolution_y,
-        start_frame=args.start_frame,
-        end_frame=args.end_frame,
+        start_frame=args.chunk_start if args.chunk_start >= 0 else args.start_frame,
+        end_frame=args.chunk_end if args.chunk_end >= 0 else args.end_frame,
+        # Cached frames are PNG stills; the MP4 is encoded from them afterwards.
+        video=bool(args.output_mp4) and not args.frame_cache,
     )
 
     print(
         f"PREVIEW frame_range={scene.frame_start}-{scene.frame_end} "
         f"camera={cam.name} cam_loc=({cam.location.x:.4f},{cam.location.y:.4f},{cam.location.z:.4f}) "
-        f"output_pattern={output_pattern}"
+        f"output={output_path}"
     )
+    if args.contact_sheet:
+        render_contact_sheet(args, scene, cam, samples, output_path)
+        return
+    if args.frame_cache:
+        render_cached(args, scene, cam, samples, meshes, output_path)
+        return
+    if args.skeleton:
+        rx, ry = args.resolution_x, args.resolution_y
+        if args.output_mp4:
+            writer = FfmpegFrameWriter(args.ffmpeg, output_path, rx, ry, args.fps)
+        else:
+            writer = PngFrameWriter(lambda frame: scene.render.frame_path(frame=frame), rx, ry)
+        frames = set(range(scene.frame_start, scene.frame_end + 1))
+        render_skeleton_frames(writer, cam, samples, rx, ry, args.bone_width, frames=frames)
+        return
     bpy.ops.render.render(animation=True)
 
 
@@ -1,9 +1,18 @@
+import argparse
+import os
+import sys
+
 import bpy
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bs_inspect import bounds_dict, mesh_world_points, scene_report, write_json_report  # noqa: E402
 
 
 def describe_scene(scene):
     cameras = [obj.name for obj in scene.objects if obj.type == "CAMERA"]
-    armatures = [obj.name for obj in scene.objects if obj.type == "ARMATURE"]
+    armatures = [obj for obj in scene.objects if obj.type == "ARMATURE"]
+    meshes = [obj for obj in scene.objects if obj.type == "MESH" and obj.data and len(obj.data.vertices) > 0]
     actions = [action.name for action in bpy.data.actions]
 
     print(f"scene={scene.name}")
@@ -15,12 +24,38 @@ def describe_scene(scene):
         print(f"cameras={','.join(cameras)}")
     print(f"armature_count={len(armatures)}")
     if armatures:
-        print(f"armatures={','.join(armatures)}")
+        print(f"armatures={','.join(obj.name for obj in armatures)}")
     print(f"action_count={len(actions)}")
     if actions:
         print(f"actions={','.join(actions)}")
 
+    vertex_count = sum(len(obj.data.vertices) for obj in meshes)
+    print(f"vertex_count={vertex_count}")
+    mesh_bounds = bounds_dict(np.concatenate([mesh_world_points(obj) for obj in meshes])) if meshes else None
+    if mesh_bounds:
+        print(f"mesh_bounds={mesh_bounds['min']}..{mesh_bounds['max']}")
+
+    report = scene_report(scene)
+    report.update(
+        {
+            "object_count": len(scene.objects),
+            "cameras": cameras,
+            "armatures": {obj.name: len(obj.data.bones) for obj in armatures},
+            "actions": actions,
+            "vertex_count": vertex_count,
+            "mesh_bounds": mesh_bounds,
+        }
+    )
+    return report
+
+
+argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+parser = argparse.ArgumentParser(description="Print scene metadata of the opened .blend.")
+parser.add_argument("--json", default="", help="Also write a JSON report to this file.")
+args = parser.parse_args(argv)
 
 active_scene = bpy.context.scene
 print(f"active_scene={active_scene.name}")
-describe_scene(active_scene)
+scene_data = describe_scene(active_scene)
+if args.json:
+    write_json_report({"active_scene": active_scene.name, "scene": scene_data}, args.json)